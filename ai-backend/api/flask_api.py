@@ -1,12 +1,17 @@
+import os
 import sys
 import json
+import hmac
+import math
+import contextlib
 from pathlib import Path
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, g
 from flask_cors import CORS
 from datetime import datetime
 import re
 import threading
 import time
+import uuid
 from functools import lru_cache
 
 # Add the chatbot directory to Python path
@@ -16,6 +21,9 @@ sys.path.append(str(chatbot_dir))
 try:
     # Import directly from hunter_ai module (not chatbot.hunter_ai)
     from hunter_ai import UNYCompassDatabase, UNYCompassBot
+    from telemetry import REGISTRY, start_trace, end_trace
+    from admission import AdmissionController, Overloaded
+    import profiling
 except ImportError as e:
     print(json.dumps({"error": f"Failed to import hunter_ai: {e}"}))
     sys.exit(1)
@@ -41,22 +49,132 @@ def apply_cors(response):
         response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
     return response
 
+# Request metrics (exposed on /metrics)
+HTTP_REQUESTS = REGISTRY.counter("unycompass_http_requests_total", "HTTP requests by endpoint, method and status")
+HTTP_ERRORS = REGISTRY.counter("unycompass_http_errors_total", "HTTP responses with status >= 500 by endpoint")
+HTTP_LATENCY = REGISTRY.histogram("unycompass_http_request_duration_seconds", "End-to-end request latency by endpoint")
+HTTP_IN_FLIGHT = REGISTRY.gauge("unycompass_http_requests_in_flight", "Requests currently being processed")
+
+def _endpoint_label():
+    """Route template (not raw path) so per-session URLs don't explode label cardinality"""
+    return request.url_rule.rule if request.url_rule else "unmatched"
+
+# Slow-request threshold for logging full traces to stdout (unset: never, 0: every traced request)
+TRACE_LOG_SLOW_MS = float(os.getenv("TRACE_LOG_SLOW_MS")) if os.getenv("TRACE_LOG_SLOW_MS") else None
+
+def _request_id():
+    """Propagate the caller's request ID, else derive one from the UI session ID"""
+    header_id = request.headers.get('X-Request-ID')
+    if header_id:
+        return header_id[:128]
+    data = request.get_json(silent=True) if request.is_json else None
+    ui_session_id = data.get('ui_session_id') if isinstance(data, dict) else None
+    suffix = uuid.uuid4().hex[:12]
+    # The body is client-controlled and ends up in a response header: keep a safe, short prefix
+    prefix = re.sub(r"[^A-Za-z0-9._-]", "", str(ui_session_id))[:64] if ui_session_id is not None else ""
+    return f"{prefix}-{suffix}" if prefix else suffix
+
+@app.before_request
+def begin_request_trace():
+    g.trace = start_trace(_request_id())
+    g.request_start = time.perf_counter()
+    HTTP_IN_FLIGHT.inc()
+
+@app.after_request
+def record_request_metrics(response):
+    trace = g.get('trace')
+    if trace is None:
+        return response
+    elapsed = time.perf_counter() - g.request_start
+    endpoint = _endpoint_label()
+
+    HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    HTTP_LATENCY.observe(elapsed, endpoint=endpoint)
+    if response.status_code >= 500:
+        HTTP_ERRORS.inc(endpoint=endpoint)
+
+    response.headers["X-Request-ID"] = trace.request_id
+    response.headers["X-Response-Time"] = f"{elapsed * 1000:.1f}ms"
+    response.headers["Server-Timing"] = trace.server_timing_header(total=elapsed)
+
+    if trace.spans and TRACE_LOG_SLOW_MS is not None and elapsed * 1000 >= TRACE_LOG_SLOW_MS:
+        print(f"🧭 Trace {json.dumps(trace.to_dict())}")
+    return response
+
+@app.teardown_request
+def finish_request_trace(exc):
+    trace = g.pop('trace', None)
+    if trace is not None:
+        HTTP_IN_FLIGHT.dec()
+        end_trace(trace)
+
 # 🚀 FIXED: Initialize the chatbot ONCE when the server starts (like your old working version)
-print("🤖 Initializing Hunter College Chatbot at startup...")
-try:
-    start_time = time.time()
-    db = UNYCompassDatabase()
-    bot = UNYCompassBot(db)
-    initialization_time = time.time() - start_time
-    print(f"✅ Chatbot initialized successfully in {initialization_time:.2f}s!")
-    CHATBOT_READY = True
-    CHATBOT_ERROR = None
-except Exception as e:
-    print(f"❌ Failed to initialize chatbot: {e}")
-    CHATBOT_READY = False
-    CHATBOT_ERROR = str(e)
-    bot = None
-    db = None
+# FAST_START=true loads the model/Pinecone in a background thread instead, so /ping and the
+# status routes answer liveness probes right after boot; chat routes return 503 until ready.
+FAST_START = os.getenv("FAST_START", "false").lower() == "true"
+PREWARM_TOP_N = int(os.getenv("PREWARM_TOP_N", "50"))
+CHATBOT_READY = False
+CHATBOT_ERROR = "Chatbot is still initializing"
+initialization_time = None
+db = None
+bot = None
+
+def initialize_chatbot():
+    global db, bot, CHATBOT_READY, CHATBOT_ERROR, initialization_time
+    print("🤖 Initializing Hunter College Chatbot at startup...")
+    try:
+        start_time = time.time()
+        db = UNYCompassDatabase()
+        bot = UNYCompassBot(db)
+        # Replay the most frequent logged questions so the first requests after a deploy hit warm caches
+        bot.prewarm_from_log(PREWARM_TOP_N)
+        initialization_time = time.time() - start_time
+        print(f"✅ Chatbot initialized successfully in {initialization_time:.2f}s!")
+        CHATBOT_ERROR = None
+        CHATBOT_READY = True
+    except Exception as e:
+        print(f"❌ Failed to initialize chatbot: {e}")
+        CHATBOT_READY = False
+        CHATBOT_ERROR = str(e)
+        bot = None
+        db = None
+
+def chatbot_unavailable():
+    """503 + Retry-After while the background initialization is still running"""
+    response = jsonify({"error": f"Chatbot not available: {CHATBOT_ERROR}"})
+    response.status_code = 503
+    if initialization_thread is not None and initialization_thread.is_alive():
+        response.headers["Retry-After"] = "5"
+    return response
+
+initialization_thread = None
+if FAST_START:
+    initialization_thread = threading.Thread(target=initialize_chatbot, name="chatbot-init", daemon=True)
+    initialization_thread.start()
+else:
+    initialize_chatbot()
+
+# Bounded concurrency for the ask endpoints: excess requests queue briefly (fair across sessions)
+# or get a fast 503 + Retry-After instead of piling up behind the OpenAI rate limit
+admission = AdmissionController.from_env()
+
+def admission_session():
+    """Fairness key for the wait queue: the UI session, else the client address"""
+    data = request.get_json(silent=True)
+    ui_session_id = data.get('ui_session_id') if isinstance(data, dict) else None
+    return ui_session_id if ui_session_id is not None else request.remote_addr
+
+def admission_slot():
+    return admission.admit(admission_session()) if admission is not None else contextlib.nullcontext()
+
+def overloaded_response(error):
+    """503 + Retry-After for a request shed by admission control"""
+    print(f"🚦 Shedding request ({error.reason}), retry after {error.retry_after}s")
+    response = jsonify({"error": "Chatbot is busy, please retry shortly", "reason": error.reason,
+                        "retry_after": error.retry_after})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(error.retry_after)
+    return response
 
 def ask_question_with_session(question, session_id=None):
     """Ask a question to the chatbot with session-specific memory"""
@@ -101,8 +219,14 @@ def chat():
     data = request.get_json()
     if not data or 'message' not in data:
         return jsonify({"error": "Please provide a 'message' field in your request"}), 400
+    if not CHATBOT_READY:
+        return chatbot_unavailable()
     
-    response = ask_question_with_session(data['message'])
+    try:
+        with admission_slot():
+            response = ask_question_with_session(data['message'])
+    except Overloaded as e:
+        return overloaded_response(e)
     if "error" in response:
         return jsonify(response), 500
     
@@ -115,7 +239,7 @@ def chat():
 @app.route('/status', methods=['GET'])
 def status():
     return jsonify({
-        "status": "ready" if CHATBOT_READY else "error",
+        "status": "ready" if CHATBOT_READY else ("initializing" if initialization_thread is not None and initialization_thread.is_alive() else "error"),
         "chatbot_ready": CHATBOT_READY,
         "error": CHATBOT_ERROR if not CHATBOT_READY else None
     })
@@ -148,11 +272,14 @@ def chatbot_ask():
     
     print(f"🤖 Received message for UI session {ui_session_id}: {message[:50]}...")
     
+    if not CHATBOT_READY:
+        return chatbot_unavailable()
     
     try:
-        start_time = time.time()
-        answer = bot.answer_question(message.strip())  # ← Same as terminal!
-        processing_time = time.time() - start_time
+        with admission_slot():
+            start_time = time.time()
+            answer = bot.answer_question(message.strip())  # ← Same as terminal!
+            processing_time = time.time() - start_time
         
         response = {
             "success": True,
@@ -161,6 +288,8 @@ def chatbot_ask():
             "timestamp": str(datetime.now()),
             "processing_time": processing_time
         }
+    except Overloaded as e:
+        return overloaded_response(e)
     except Exception as e:
         print(f"❌ Error processing question: {e}")
         return jsonify({"error": f"Error processing question: {str(e)}"}), 500
@@ -173,6 +302,70 @@ def chatbot_ask():
         "processing_time": response.get("processing_time")
     })
 
+def token_denied(expected, header):
+    """404 unless the endpoint's token is configured, 401 unless the request carries it (`header` or Bearer)"""
+    if not expected:
+        return jsonify({"error": "Not found"}), 404
+    supplied = request.headers.get(header) or ''
+    authorization = request.headers.get('Authorization', '')
+    if not supplied and authorization.startswith('Bearer '):
+        supplied = authorization[len('Bearer '):]
+    if not hmac.compare_digest(supplied.encode(), expected.encode()):
+        return jsonify({"error": "Invalid token"}), 401
+    return None
+
+# Bulk answers for advisor review and regression checks: 404 unless BATCH_TOKEN is set
+BATCH_TOKEN = os.getenv("BATCH_TOKEN")
+BATCH_MAX_QUESTIONS = int(os.getenv("BATCH_MAX_QUESTIONS", "500"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "16"))
+
+@app.route('/api/chatbot/batch', methods=['POST', 'OPTIONS'])
+def chatbot_batch():
+    """Answer a list of questions; results stream back as NDJSON lines in completion order
+
+    Each question's LLM call takes an admission slot like an ask request, so batches share the
+    ask endpoints' concurrency limit; while those are shedding, batch questions back off and retry
+    until their own deadline instead of failing.
+    """
+    if request.method == 'OPTIONS':
+        return '', 200
+    denied = token_denied(BATCH_TOKEN, 'X-Batch-Token')
+    if denied:
+        return denied
+    
+    data = request.get_json(silent=True)
+    questions = data.get('questions') if isinstance(data, dict) else None
+    if not isinstance(questions, list) or not questions or not all(isinstance(q, str) for q in questions):
+        return jsonify({"error": "Please provide a non-empty 'questions' list of strings"}), 400
+    if len(questions) > BATCH_MAX_QUESTIONS:
+        return jsonify({"error": f"At most {BATCH_MAX_QUESTIONS} questions per batch"}), 400
+    if not CHATBOT_READY:
+        return chatbot_unavailable()
+    
+    try:
+        max_concurrency = min(int(data.get('max_concurrency') or BATCH_MAX_CONCURRENCY), BATCH_MAX_CONCURRENCY)
+    except (TypeError, ValueError):
+        return jsonify({"error": "'max_concurrency' must be an integer"}), 400
+    
+    print(f"📦 Batch of {len(questions)} questions (LLM concurrency {max_concurrency})")
+    # Queued apart from the caller's interactive requests, so a batch can't crowd those out
+    session = ('batch', admission_session())
+    
+    def llm_slot(deadline):
+        return admission.admit(session, retry_until=time.perf_counter() + deadline.remaining())
+    
+    def generate():
+        results = bot.answer_batch(questions, max_concurrency=max(1, max_concurrency),
+                                   llm_slot=llm_slot if admission is not None else None)
+        try:
+            for result in results:
+                yield json.dumps(result) + "\n"
+        finally:
+            # Also runs when the client disconnects: cancels the questions not started yet
+            results.close()
+    
+    return Response(generate(), mimetype='application/x-ndjson')
+
 # Optional: Reset conversation memory endpoint
 @app.route('/api/chatbot/reset/<int:session_id>', methods=['POST'])
 def reset_session_memory(session_id):
@@ -186,14 +379,43 @@ def reset_session_memory(session_id):
     except Exception as e:
         return jsonify({"error": f"Failed to reset session memory: {str(e)}"}), 500
 
-# Warmup endpoint (now just returns status since we init at startup)
+# Warmup endpoint: prewarm caches with the top logged questions (or the questions given).
+# Needs the debug token, like the other operator endpoints
 @app.route('/api/chatbot/warmup', methods=['POST'])
 def warmup():
-    """Chatbot is already warm since we initialize at startup"""
+    """Replay the top_n most frequent logged questions (or a 'questions' list) through retrieval"""
+    denied = debug_denied()
+    if denied:
+        return denied
+    
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
+    questions = data.get('questions')
+    if questions is not None:
+        if not isinstance(questions, list) or not all(isinstance(q, str) for q in questions):
+            return jsonify({"error": "'questions' must be a list of strings"}), 400
+        if len(questions) > BATCH_MAX_QUESTIONS:
+            return jsonify({"error": f"At most {BATCH_MAX_QUESTIONS} questions per warmup"}), 400
+    try:
+        top_n = int(data.get('top_n', PREWARM_TOP_N))
+    except (TypeError, ValueError):
+        return jsonify({"error": "'top_n' must be an integer"}), 400
+    if not 0 <= top_n <= BATCH_MAX_QUESTIONS:
+        return jsonify({"error": f"'top_n' must be between 0 and {BATCH_MAX_QUESTIONS}"}), 400
+    if not CHATBOT_READY:
+        return chatbot_unavailable()
+    
+    try:
+        with admission_slot():
+            result = bot.prewarm(questions) if questions else bot.prewarm_from_log(top_n)
+    except Overloaded as e:
+        return overloaded_response(e)
+    
     return jsonify({
-        "message": "Chatbot already warm (initialized at startup)",
+        "message": f"Prewarmed {result['questions']} questions",
         "ready": CHATBOT_READY,
-        "error": CHATBOT_ERROR if not CHATBOT_READY else None
+        **result
     })
 
 # Debug endpoints
@@ -207,7 +429,9 @@ def debug_status():
             "has_bot_instance": bot is not None,
             "chatbot_error": CHATBOT_ERROR,
             "initialization_time": f"{initialization_time:.2f}s" if CHATBOT_READY else None,
-            "startup_initialization": True  # This is the key difference!
+            "startup_initialization": True,  # This is the key difference!
+            "fast_start": FAST_START,
+            "admission": admission.stats() if admission is not None else None
         }
         
         # Try to get vector database stats if available
@@ -225,6 +449,92 @@ def debug_status():
     except Exception as e:
         return jsonify({"error": f"Debug failed: {str(e)}"})
 
+# Profiling endpoints: 404 unless DEBUG_TOKEN is set, and nothing runs until one is called
+DEBUG_TOKEN = os.getenv("DEBUG_TOKEN")
+DEBUG_MAX_SECONDS = float(os.getenv("DEBUG_PROFILE_MAX_SECONDS", "60"))
+
+def debug_denied():
+    """404 unless DEBUG_TOKEN is set, 401 unless the request carries it (X-Debug-Token or Bearer)"""
+    return token_denied(DEBUG_TOKEN, 'X-Debug-Token')
+
+def finite_arg(name, default):
+    """Float query argument; ValueError for non-numbers and for nan / inf, which no clamp catches"""
+    value = float(request.args.get(name, default))
+    if not math.isfinite(value):
+        raise ValueError(f"'{name}' must be a finite number")
+    return value
+
+def debug_seconds(default):
+    return min(max(finite_arg('seconds', default), 0.0), DEBUG_MAX_SECONDS)
+
+@app.route('/debug/profile', methods=['GET'])
+def debug_profile():
+    """Sample request threads' stacks for ?seconds= (default 10) and return folded stacks
+
+    ?format=json adds leaf categories (torch, tokenization, json, network, waiting...), the top
+    leaf frames and the sampler's wake-up lag (GIL contention); ?threads=all includes idle threads.
+    """
+    denied = debug_denied()
+    if denied:
+        return denied
+    try:
+        seconds = debug_seconds(10)
+        interval = min(max(finite_arg('interval_ms', 5), 1.0), 1000.0) / 1000
+    except ValueError as e:
+        return jsonify({"error": f"Invalid profile request: {e}"}), 400
+    include = None if request.args.get('threads') == 'all' else "full_dispatch_request"
+    try:
+        profile = profiling.sample_stacks(seconds, interval, include=include)
+    except profiling.ProfilerBusy as e:
+        return jsonify({"error": str(e)}), 409
+    print(f"🔬 Profiled {profile['thread_samples']} thread samples over {profile['seconds']}s")
+    if request.args.get('format') == 'json':
+        return jsonify(profile)
+    return Response(profile['folded'] + '\n', mimetype='text/plain')
+
+def memory_components():
+    """What the per-component accounting walks: the model, caches, session store, index and docstore"""
+    return {
+        "model": db.model if db else None,
+        "index": db.index if db else None,
+        "docstore": db.docstore if db else None,
+        "caches": {
+            "search": type(db).search,
+            "embedding": type(db).embed_query,
+            "question_type": type(bot).detect_question_type,
+        } if db and bot else None,
+        "session_store": bot.session_memories if bot else None,
+    }
+
+@app.route('/debug/memory', methods=['GET'])
+def debug_memory():
+    """Process RSS, per-component memory and tracemalloc's top allocation sites
+
+    ?seconds= traces allocations for that long (default 0: components only); ?top= sites to list.
+    """
+    denied = debug_denied()
+    if denied:
+        return denied
+    try:
+        seconds = debug_seconds(0)
+        top = int(request.args.get('top', 25))
+    except ValueError as e:
+        return jsonify({"error": f"Invalid memory request: {e}"}), 400
+    report = {"process": profiling.process_memory()}
+    # Cache keys hold the database and bot, so the walk must not continue into them
+    report["components"] = profiling.component_memory(memory_components(), stop=[db, bot, app])
+    if seconds > 0:
+        try:
+            report["allocations"] = profiling.allocation_snapshot(seconds, top=top)
+        except profiling.ProfilerBusy as e:
+            return jsonify({"error": str(e)}), 409
+    return jsonify(report)
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus scrape endpoint: stage latency histograms, cache hit ratios, in-flight and error counts"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/ping', methods=['GET'])
 def ping():
     """Simple ping to test if server is responsive"""
@@ -235,7 +545,8 @@ def ping():
     })
 
 if __name__ == '__main__':
-    # The initialization already happened above when the module loaded
-    print("🚀 Flask API ready - chatbot pre-initialized!")
-    app.run(host='0.0.0.0', port=5001, debug=False, threaded=True)
+    # Development server. In production use api/serve.py (pre-fork gunicorn, model shared by workers)
+    # The initialization already happened (or is running in the background) when the module loaded
+    print("🚀 Flask API ready - " + ("chatbot initializing in background" if FAST_START else "chatbot pre-initialized!"))
+    app.run(host='0.0.0.0', port=int(os.getenv("PORT", "5001")), debug=False, threaded=True)
     
\ No newline at end of file
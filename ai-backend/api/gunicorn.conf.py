@@ -0,0 +1,69 @@
+"""Production gunicorn settings for the chatbot API (used by api/serve.py)
+
+The master imports flask_api once (preload_app), which loads the SentenceTransformer weights,
+the Pinecone client or a memory-mapped snapshot, and then forks the workers. Workers share
+those pages copy-on-write instead of each loading its own ~420 MB model copy.
+
+Environment:
+    PORT                    listen port (default 5001)
+    WEB_CONCURRENCY         worker processes (default: CPU count, at most 4)
+    GUNICORN_THREADS        threads per worker; requests mostly wait on OpenAI (default 16)
+    MAX_REQUESTS            recycle a worker after this many requests, 0 = never (default 1000)
+    MAX_REQUESTS_JITTER     random spread so workers don't all recycle at once (default 100)
+    TORCH_THREADS_PER_WORKER  intra-op threads per worker (default: CPUs / workers)
+"""
+import gc
+import os
+import sys
+
+_cpus = os.cpu_count() or 1
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
+workers = int(os.getenv("WEB_CONCURRENCY", str(min(_cpus, 4))))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "16"))
+
+# Load the app (model, index, bot) in the master and fork workers from it
+preload_app = True
+
+# Graceful recycling bounds slow leaks (session memories, caches) without dropping requests:
+# a recycled worker stops accepting, finishes in-flight requests within graceful_timeout, exits,
+# and the master forks a replacement from the already-initialized preload image
+max_requests = int(os.getenv("MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "100"))
+graceful_timeout = 30
+timeout = 120  # ANSWER_BUDGET_SECONDS plus headroom
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+# Background initialization would be copied mid-flight into every fork, so the preloaded
+# master always initializes synchronously
+if os.getenv("FAST_START", "false").lower() == "true":
+    print("ℹ️ FAST_START is ignored under gunicorn: the master initializes before forking")
+os.environ["FAST_START"] = "false"
+
+
+def torch_threads_per_worker(worker_count: int) -> int:
+    configured = os.getenv("TORCH_THREADS_PER_WORKER")
+    if configured:
+        return max(1, int(configured))
+    return max(1, _cpus // max(1, worker_count))
+
+
+def when_ready(server):
+    # Everything allocated during preload is long-lived. Moving it to the permanent generation keeps
+    # the workers' cyclic GC from touching (and so copying) those pages after the fork.
+    gc.collect()
+    gc.freeze()
+    server.log.info(f"Preloaded app frozen ({gc.get_freeze_count()} objects); forking {server.num_workers} workers")
+
+
+def post_fork(server, worker):
+    # N workers x default torch threads (= all cores) oversubscribes the CPU during query encoding
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(torch_threads_per_worker(server.num_workers))
+    server.log.info(f"Worker {worker.pid} started (torch threads: "
+                    f"{torch.get_num_threads() if torch is not None else 'n/a'})")
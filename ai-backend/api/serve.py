@@ -0,0 +1,67 @@
+"""Production entry point: pre-fork gunicorn server configured by api/gunicorn.conf.py
+
+    python api/serve.py                                   # WEB_CONCURRENCY workers on $PORT
+    python api/serve.py --workers 4 --threads 8 --port 8000
+    python api/serve.py --app benchmarks.stub_app:app     # same launcher, stubbed backends
+
+`python api/flask_api.py` still runs the single-process Werkzeug server for local development.
+"""
+import argparse
+import importlib
+import sys
+from pathlib import Path
+
+from gunicorn.app.base import Application
+
+API_DIR = Path(__file__).parent
+CONFIG_PATH = API_DIR / "gunicorn.conf.py"
+
+# flask_api is imported as a top-level module, like `python api/flask_api.py` does
+for path in (API_DIR, API_DIR.parent):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+class ChatbotServer(Application):
+    def __init__(self, app_path: str, overrides: dict):
+        self.app_path = app_path
+        self.overrides = overrides
+        super().__init__()
+
+    def init(self, parser, opts, args):
+        pass
+
+    def load_config(self):
+        self.load_config_from_file(str(CONFIG_PATH))
+        for key, value in self.overrides.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # With preload_app this runs once in the master, before any worker is forked
+        module_name, _, attribute = self.app_path.partition(':')
+        return getattr(importlib.import_module(module_name), attribute or 'app')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the chatbot API under gunicorn (pre-fork, preloaded)")
+    parser.add_argument('--app', default='flask_api:app', help='WSGI app as module:attribute')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: WEB_CONCURRENCY or CPU count)')
+    parser.add_argument('--threads', type=int, help='Threads per worker (default: GUNICORN_THREADS or 16)')
+    parser.add_argument('--port', type=int, help='Listen port (default: PORT or 5001)')
+    parser.add_argument('--max-requests', type=int, help='Recycle workers after N requests (0 disables)')
+    args = parser.parse_args(argv)
+
+    overrides = {}
+    if args.workers:
+        overrides['workers'] = args.workers
+    if args.threads:
+        overrides['threads'] = args.threads
+    if args.port:
+        overrides['bind'] = [f"0.0.0.0:{args.port}"]
+    if args.max_requests is not None:
+        overrides['max_requests'] = args.max_requests
+    ChatbotServer(args.app, overrides).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""Reproducible performance benchmarks for the Hunter College chatbot (no OpenAI/Pinecone access needed)"""
+import sys
+from pathlib import Path
+
+# Make the flat chatbot modules (hunter_ai, telemetry, local_index, ...) importable, like flask_api does
+CHATBOT_DIR = Path(__file__).parent.parent / "chatbot"
+if str(CHATBOT_DIR) not in sys.path:
+    sys.path.append(str(CHATBOT_DIR))
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+RESULTS_DIR = Path(__file__).parent / "results"
@@ -0,0 +1,153 @@
+"""LocalVectorIndex at multi-college scale: exact brute-force search vs the IVF partition
+
+For each size, bulk-loads that many synthetic 768-dim embeddings into one namespace, trains the
+IVF partition (build time), then measures query latency and recall@k against exact search at each
+nprobe. Also times incremental churn (deleting and re-inserting --churn vectors) and, with
+--persist, save/load of the whole index.
+
+The vectors are clustered like sentence embeddings (one topic centre per ~100 chunks plus noise,
+cosine ~0.7 to their centre); queries are fresh draws from the same topics. Uniform random
+vectors would be a worst case no real corpus looks like.
+
+Usage (from ai-backend/):
+    python -m benchmarks.ann_bench
+    python -m benchmarks.ann_bench --sizes 100000 --nprobe 4,8,16,32 --queries 500
+    python -m benchmarks.ann_bench --sizes 1000000 --persist    # needs ~4 GB RAM and 3 GB of disk
+"""
+import argparse
+import gc
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.reporting import peak_rss_mb, summarize, write_results
+
+NAMESPACE = "bench"
+
+
+def topic_centres(count: int, dimension: int, rng) -> np.ndarray:
+    centres = rng.standard_normal((count, dimension), dtype=np.float32)
+    return centres / np.linalg.norm(centres, axis=1, keepdims=True)
+
+
+def draw(centres: np.ndarray, count: int, rng, noise: float = 1.0, block: int = 65536) -> np.ndarray:
+    """`count` normalised vectors scattered around random topic centres"""
+    dimension = centres.shape[1]
+    out = np.empty((count, dimension), dtype=np.float32)
+    for start in range(0, count, block):
+        end = min(start + block, count)
+        rows = centres[rng.integers(0, len(centres), end - start)]
+        rows += rng.standard_normal(rows.shape, dtype=np.float32) * (noise / np.sqrt(dimension))
+        out[start:end] = rows / np.linalg.norm(rows, axis=1, keepdims=True)
+    return out
+
+
+def time_queries(index, queries, k: int, **kwargs):
+    latencies, results = [], []
+    for query in queries:
+        started = time.perf_counter()
+        matches = index.query(query, top_k=k, namespace=NAMESPACE, **kwargs)['matches']
+        latencies.append(time.perf_counter() - started)
+        results.append({m['id'] for m in matches})
+    return latencies, results
+
+
+def recall(approx, exact, k: int) -> float:
+    return round(sum(len(a & e) for a, e in zip(approx, exact)) / (k * len(exact)), 4)
+
+
+def run_size(size: int, args, rng):
+    from local_index import LocalVectorIndex
+
+    centres = topic_centres(max(1, size // 100), args.dimension, rng)
+    matrix = draw(centres, size, rng)
+    queries = draw(centres, args.queries, rng)
+    index = LocalVectorIndex(dimension=args.dimension, ann="ivf", nlist=args.nlist, ann_min_vectors=1)
+    index.attach(NAMESPACE, [f"v{i}" for i in range(size)], matrix, [{}] * size, shared=False)
+    row = {'vectors': size, 'matrix_mb': round(matrix.nbytes / 1e6, 1)}
+
+    index.ann = None
+    exact_latency, exact = time_queries(index, queries, args.k)
+    row['exact'] = {'latency': summarize(exact_latency)}
+    print(f"📏 {size:>9,} vectors  exact        p50 {row['exact']['latency']['p50_ms']:>8}ms  "
+          f"p95 {row['exact']['latency']['p95_ms']:>8}ms")
+
+    index.ann = "ivf"
+    started = time.perf_counter()
+    index.build_ann(NAMESPACE)
+    ivf = index._namespaces[NAMESPACE]['ivf']
+    row['build_seconds'] = round(time.perf_counter() - started, 2)
+    row['nlist'] = len(ivf.centroids)
+    print(f"🏗️ IVF with {row['nlist']} lists built in {row['build_seconds']}s")
+
+    row['ivf'] = {}
+    for nprobe in args.nprobe:
+        latency, approx = time_queries(index, queries, args.k, nprobe=nprobe)
+        stats = {'latency': summarize(latency), f'recall@{args.k}': recall(approx, exact, args.k)}
+        row['ivf'][nprobe] = stats
+        print(f"   nprobe {nprobe:<4} recall@{args.k} {stats[f'recall@{args.k}']:.3f}  "
+              f"p50 {stats['latency']['p50_ms']:>8}ms  p95 {stats['latency']['p95_ms']:>8}ms")
+
+    # Churn without growing the matrix: delete vectors, then insert as many new ones
+    churn = min(args.churn, size // 2)
+    fresh = draw(centres, churn, rng)
+    started = time.perf_counter()
+    index.delete(ids=[f"v{i}" for i in range(churn)], namespace=NAMESPACE)
+    deleted = time.perf_counter() - started
+    started = time.perf_counter()
+    for start in range(0, churn, 1000):
+        index.upsert([{'id': f"new{i}", 'values': fresh[i]} for i in range(start, min(start + 1000, churn))],
+                     namespace=NAMESPACE)
+    inserted = time.perf_counter() - started
+    row['churn'] = {'vectors': churn, 'delete_per_s': round(churn / deleted), 'insert_per_s': round(churn / inserted)}
+    print(f"🔁 churn {churn:,}: {row['churn']['delete_per_s']:,} deletes/s, {row['churn']['insert_per_s']:,} inserts/s")
+
+    if args.persist:
+        workdir = tempfile.mkdtemp(prefix="ann_bench_")
+        try:
+            started = time.perf_counter()
+            index.save(f"{workdir}/index")
+            saved = time.perf_counter() - started
+            del index, matrix
+            gc.collect()
+            started = time.perf_counter()
+            index = LocalVectorIndex.load(f"{workdir}/index")
+            row['persist'] = {'save_seconds': round(saved, 2), 'load_seconds': round(time.perf_counter() - started, 2),
+                              'retrained_on_load': index._namespaces[NAMESPACE]['ivf'] is None}
+            print(f"💾 saved in {row['persist']['save_seconds']}s, loaded in {row['persist']['load_seconds']}s")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return row
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recall, latency and build time of the IVF local index")
+    parser.add_argument('--sizes', default='100000,1000000', help='Comma-separated vector counts')
+    parser.add_argument('--dimension', type=int, default=768)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=8, help='top_k (recall@k against exact search)')
+    parser.add_argument('--nprobe', default='4,8,16,32', help='Comma-separated nprobe values')
+    parser.add_argument('--nlist', type=int, help='IVF lists (default: sqrt of the size)')
+    parser.add_argument('--churn', type=int, default=10000, help='Vectors deleted and re-inserted after the build')
+    parser.add_argument('--persist', action='store_true', help='Also time save() and load()')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Results JSON path (default: benchmarks/results/)')
+    args = parser.parse_args(argv)
+    args.nprobe = [int(n) for n in args.nprobe.split(',') if n.strip()]
+
+    rng = np.random.default_rng(args.seed)
+    results = {'config': vars(args), 'sizes': {}}
+    for size in [int(s) for s in args.sizes.split(',') if s.strip()]:
+        results['sizes'][size] = run_size(size, args, rng)
+        gc.collect()
+    results['peak_rss_mb'] = peak_rss_mb()
+    path = write_results('ann', results, args.output)
+    print(f"✅ Results written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
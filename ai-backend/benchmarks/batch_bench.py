@@ -0,0 +1,80 @@
+"""Bulk question answering: answer_question in a loop vs UNYCompassBot.answer_batch
+
+Answers the fixture question set (repeated --repeat times) against local stand-ins: fake LLM,
+hashing embedder with per-call latency, LocalVectorIndex with injected query latency.
+
+Usage (from ai-backend/):
+    python -m benchmarks.batch_bench
+    python -m benchmarks.batch_bench --repeat 5 --concurrency 16 --llm-latency 0.4
+"""
+import argparse
+import contextlib
+import io
+import sys
+import time
+
+from benchmarks.fakes import FakeChatOpenAI, HashingEmbedder, build_local_bot, load_questions
+from benchmarks.pipeline_bench import clear_caches
+from benchmarks.reporting import summarize, write_results
+
+
+def run_loop(bot, questions):
+    started = time.perf_counter()
+    for question in questions:
+        bot.answer_question(question)
+    return {'seconds': round(time.perf_counter() - started, 3)}
+
+
+def run_batch(bot, questions, concurrency):
+    started = time.perf_counter()
+    first = None
+    elapsed, llm, errors = [], [], 0
+    for result in bot.answer_batch(questions, max_concurrency=concurrency):
+        if first is None:
+            first = time.perf_counter() - started
+        if 'error' in result:
+            errors += 1
+        elapsed.append(result['timings_ms']['elapsed'] / 1000)
+        llm.append(result['timings_ms']['llm'] / 1000)
+    return {
+        'seconds': round(time.perf_counter() - started, 3),
+        'first_result_seconds': round(first, 3) if first is not None else None,
+        'errors': errors,
+        'completion': summarize(elapsed),
+        'llm': summarize(llm),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare looping answer_question with answer_batch")
+    parser.add_argument('--repeat', type=int, default=3, help='Copies of the question set (distinct wording per copy)')
+    parser.add_argument('--concurrency', type=int, default=8, help='answer_batch LLM concurrency')
+    parser.add_argument('--llm-latency', type=float, default=0.2)
+    parser.add_argument('--token-rate', type=float, default=400.0)
+    parser.add_argument('--embed-latency', type=float, default=0.01, help='Seconds per encode() call')
+    parser.add_argument('--query-latency', type=float, default=0.02)
+    parser.add_argument('--output', help='Results JSON path (default: benchmarks/results/)')
+    args = parser.parse_args(argv)
+
+    llm = FakeChatOpenAI(latency_s=args.llm_latency, tokens_per_second=args.token_rate)
+    bot = build_local_bot(llm=llm, embedder=HashingEmbedder(latency_s=args.embed_latency),
+                          query_latency_s=args.query_latency)
+    # Vary the wording per copy so neither mode gets cache or in-flight hits
+    questions = [f"{question} ({copy})" if copy else question
+                 for copy in range(args.repeat) for question in load_questions()]
+
+    results = {'config': vars(args), 'questions': len(questions)}
+    for mode in ('loop', 'batch'):
+        clear_caches()
+        with contextlib.redirect_stdout(io.StringIO()):
+            row = run_loop(bot, questions) if mode == 'loop' else run_batch(bot, questions, args.concurrency)
+        results[mode] = row
+        print(f"⚡ {mode:<5} {len(questions)} questions in {row['seconds']:.2f}s"
+              + (f", first result after {row['first_result_seconds']:.2f}s" if mode == 'batch' else ''))
+    path = write_results('batch', results, args.output)
+    print(f"✅ Results written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Chunker throughput and parity benchmark
+
+Compares the built-in RecursiveChunker (serial and process pool) with LangChain's
+RecursiveCharacterTextSplitter, when installed, on the crawl corpus.
+
+Usage (from ai-backend/):
+    python -m benchmarks.chunker_bench                                  # docs/hunter_hybrid.txt, else fixture
+    python -m benchmarks.chunker_bench --corpus ../docs/hunter_hybrid.txt --scale 20 --processes 8
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from benchmarks import FIXTURES_DIR
+from benchmarks.reporting import peak_rss_mb, write_results
+
+DEFAULT_CORPUS = Path(__file__).parent.parent / "docs" / "hunter_hybrid.txt"
+
+
+def load_pages(path: Path, scale: int):
+    """Page bodies exactly as UNYCompassDatabase.upload_text_file extracts them"""
+    text = path.read_text(encoding='utf-8')
+    pages = []
+    for page in text.split("--- PAGE:")[1:]:
+        lines = page.strip().split('\n', 1)
+        if len(lines) >= 2 and lines[1].strip():
+            pages.append(lines[1].strip())
+    return pages * scale
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main(argv=None):
+    from chunker import RecursiveChunker
+
+    parser = argparse.ArgumentParser(description="Benchmark chunking throughput and LangChain parity")
+    parser.add_argument('--corpus', default=str(DEFAULT_CORPUS if DEFAULT_CORPUS.exists() else FIXTURES_DIR / "corpus.txt"))
+    parser.add_argument('--scale', type=int, default=1, help='Replicate the corpus N times')
+    parser.add_argument('--processes', type=int, default=0, help='Pool size for the parallel run (0 = cpu count)')
+    parser.add_argument('--output', help='Results JSON path (default: benchmarks/results/)')
+    args = parser.parse_args(argv)
+
+    pages = load_pages(Path(args.corpus), args.scale)
+    total_chars = sum(len(p) for p in pages)
+    megabytes = total_chars / 1_000_000
+    print(f"📄 {len(pages)} pages, {total_chars:,} characters from {args.corpus}")
+
+    # Same configuration as UNYCompassDatabase.create_text_splitter()
+    chunker = RecursiveChunker(chunk_size=800, chunk_overlap=100)
+    native, native_s = timed(lambda: [chunker.split_text(p) for p in pages])
+    parallel, parallel_s = timed(lambda: chunker.split_pages(pages, processes=args.processes or os.cpu_count(),
+                                                             min_parallel_chars=0))
+    results = {
+        'corpus': args.corpus,
+        'pages': len(pages),
+        'characters': total_chars,
+        'chunks': sum(len(c) for c in native),
+        'native_serial': {'seconds': round(native_s, 3), 'mb_per_s': round(megabytes / native_s, 2)},
+        'native_parallel': {'seconds': round(parallel_s, 3), 'mb_per_s': round(megabytes / parallel_s, 2),
+                            'matches_serial': parallel == native},
+    }
+
+    try:
+        import_started = time.perf_counter()
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+        import_s = time.perf_counter() - import_started
+    except ImportError:
+        RecursiveCharacterTextSplitter = None
+        print("ℹ️ langchain_text_splitters not installed - skipping parity check")
+
+    if RecursiveCharacterTextSplitter is not None:
+        reference_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunker.chunk_size, chunk_overlap=chunker.chunk_overlap,
+            separators=chunker.separators, length_function=len
+        )
+        reference, reference_s = timed(lambda: [reference_splitter.split_text(p) for p in pages])
+        mismatched = [i for i, (a, b) in enumerate(zip(native, reference)) if a != b]
+        results['langchain'] = {
+            'import_seconds': round(import_s, 3),
+            'seconds': round(reference_s, 3),
+            'mb_per_s': round(megabytes / reference_s, 2),
+        }
+        results['parity'] = {
+            'pages_identical': len(pages) - len(mismatched),
+            'pages_mismatched': len(mismatched),
+            'first_mismatches': mismatched[:10]
+        }
+
+    results['peak_rss_mb'] = peak_rss_mb()
+    for name in ('native_serial', 'native_parallel', 'langchain'):
+        if name in results:
+            print(f"⚡ {name:<16} {results[name]['seconds']:>8.3f}s  {results[name]['mb_per_s']:>8.2f} MB/s")
+    if 'parity' in results:
+        print(f"🔍 Parity: {results['parity']['pages_identical']}/{len(pages)} pages identical")
+    path = write_results('chunker', results, args.output)
+    print(f"✅ Results written to {path}")
+    return 1 if results.get('parity', {}).get('pages_mismatched') else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Crawler dedup-state benchmark: Python sets of strings vs FingerprintSet and BloomFilter
+
+Fills each structure with N keys shaped like the crawler's (MD5 hex content hashes and page URLs),
+then looks up N more keys, half of them present. Memory is what tracemalloc attributes to the
+structure plus the keys it keeps alive; throughput is measured in a separate, untraced pass.
+
+Usage (from ai-backend/):
+    python -m benchmarks.dedup_bench                       # 1M entries
+    python -m benchmarks.dedup_bench --entries 200000 --error-rate 0.0001
+"""
+import argparse
+import gc
+import hashlib
+import sys
+import time
+import tracemalloc
+
+from benchmarks.reporting import peak_rss_mb, write_results
+
+
+def md5_keys(start, count):
+    return (hashlib.md5(str(i).encode()).hexdigest() for i in range(start, start + count))
+
+
+def url_keys(start, count):
+    return (f"https://hunter.cuny.edu/academics/programs/page-{i}/" for i in range(start, start + count))
+
+
+def fill(structure, keys):
+    add = structure.add
+    for key in keys:
+        add(key)
+    return structure
+
+
+def measure_memory(factory, keys):
+    gc.collect()
+    tracemalloc.start()
+    structure = fill(factory(), keys)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return structure, current
+
+
+def measure(name, factory, key_source, entries):
+    structure, memory_bytes = measure_memory(factory, key_source(0, entries))
+    del structure
+    gc.collect()
+
+    started = time.perf_counter()
+    structure = fill(factory(), key_source(0, entries))
+    insert_s = time.perf_counter() - started
+
+    # Half present (0..N/2), half absent (N..1.5N)
+    started = time.perf_counter()
+    hits = sum(1 for key in key_source(entries // 2, entries // 2) if key in structure)
+    false_positives = sum(1 for key in key_source(entries, entries - entries // 2) if key in structure)
+    lookup_s = time.perf_counter() - started
+
+    return {
+        'structure': name,
+        'memory_mb': round(memory_bytes / 1e6, 1),
+        'bytes_per_entry': round(memory_bytes / entries, 1),
+        'inserts_per_s': round(entries / insert_s),
+        'lookups_per_s': round(entries / lookup_s),
+        'hits': hits,
+        'false_positives': false_positives,
+    }
+
+
+def main(argv=None):
+    from compact_sets import BloomFilter, FingerprintSet
+
+    parser = argparse.ArgumentParser(description="Compare crawler dedup-set memory and throughput")
+    parser.add_argument('--entries', type=int, default=1_000_000)
+    parser.add_argument('--error-rate', type=float, default=0.001, help='BloomFilter false-positive rate')
+    parser.add_argument('--output', help='Results JSON path (default: benchmarks/results/)')
+    args = parser.parse_args(argv)
+    entries = args.entries
+
+    # Key generation alone, so its share of the timings below is visible
+    started = time.perf_counter()
+    for _ in md5_keys(0, entries):
+        pass
+    keygen_s = time.perf_counter() - started
+
+    candidates = [
+        ('set[str]', set),
+        ('FingerprintSet', FingerprintSet),
+        (f'BloomFilter(p={args.error_rate})', lambda: BloomFilter(entries, args.error_rate)),
+    ]
+    results = {'entries': entries, 'key_generation_per_s': round(entries / keygen_s), 'workloads': {}}
+    for workload, key_source in (('content_hashes', md5_keys), ('visited_urls', url_keys)):
+        print(f"\n📦 {workload}: {entries:,} keys")
+        rows = []
+        for name, factory in candidates:
+            row = measure(name, factory, key_source, entries)
+            rows.append(row)
+            print(f"   {name:<24} {row['memory_mb']:>8.1f} MB  {row['bytes_per_entry']:>6.1f} B/entry  "
+                  f"{row['inserts_per_s']:>10,} ins/s  {row['lookups_per_s']:>10,} lookups/s  "
+                  f"fp={row['false_positives']}")
+        results['workloads'][workload] = rows
+
+    results['peak_rss_mb'] = peak_rss_mb()
+    path = write_results('dedup', results, args.output)
+    print(f"\n✅ Results written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
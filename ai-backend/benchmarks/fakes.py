@@ -0,0 +1,174 @@
+import hashlib
+import re
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from benchmarks import FIXTURES_DIR
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class FakeMessage:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeChatOpenAI:
+    """Deterministic stand-in for ChatOpenAI with configurable latency and token rate
+
+    Response time = latency_s (time to first token) + output_tokens / tokens_per_second.
+    The answer text is derived from a hash of the prompt, so the same prompt always yields the same answer.
+    Every `tail_every`-th call additionally sleeps `tail_latency_s` to emulate slow upstream stragglers.
+    With `capacity` set, at most that many calls are served at once and the rest wait their turn,
+    like requests retrying against an upstream rate limit.
+    """
+
+    def __init__(self, latency_s: float = 0.4, tokens_per_second: float = 80.0,
+                 output_tokens: int = 120, jitter: float = 0.0, seed: int = 0,
+                 tail_latency_s: float = 0.0, tail_every: int = 0, capacity: int = 0):
+        self.latency_s = latency_s
+        self.tail_latency_s = tail_latency_s
+        self.tail_every = tail_every
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.jitter = jitter
+        self.seed = seed
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._capacity = threading.Semaphore(capacity) if capacity > 0 else None
+
+    def _digest(self, prompt: str) -> bytes:
+        return hashlib.blake2b(f"{self.seed}:{prompt}".encode(), digest_size=16).digest()
+
+    def invoke(self, prompt, *args, **kwargs) -> FakeMessage:
+        prompt = str(prompt)
+        with self._lock:
+            self.calls += 1
+            call_number = self.calls
+
+        digest = self._digest(prompt)
+        delay = self.latency_s
+        if self.tail_every and call_number % self.tail_every == 0:
+            # Injected straggler, e.g. an upstream retry or overloaded replica
+            delay += self.tail_latency_s
+        if self.tokens_per_second > 0:
+            delay += self.output_tokens / self.tokens_per_second
+        if self.jitter:
+            # Deterministic per-prompt jitter in [-jitter, +jitter]
+            delay *= 1 + self.jitter * (digest[0] / 127.5 - 1)
+        if delay > 0:
+            if self._capacity is not None:
+                with self._capacity:
+                    time.sleep(delay)
+            else:
+                time.sleep(delay)
+
+        words = _TOKEN_PATTERN.findall(prompt.lower())
+        question_words = words[-12:] if words else ["hunter"]
+        body = " ".join(question_words[i % len(question_words)] for i in range(self.output_tokens))
+        return FakeMessage(f"[fake-{digest.hex()[:8]}] {body}")
+
+
+class HashingEmbedder:
+    """Deterministic SentenceTransformer stand-in: hashed bag-of-words projected to `dimension` floats
+
+    Texts sharing words get similar vectors, so retrieval over the fixture corpus behaves sensibly.
+    weights_mb allocates (and touches) that much resident memory to stand in for model weights,
+    e.g. ~420 MB for all-mpnet-base-v2, so per-process memory comparisons are realistic.
+    """
+
+    def __init__(self, dimension: int = 768, latency_s: float = 0.0, per_text_latency_s: float = 0.0,
+                 weights_mb: float = 0.0):
+        self.dimension = dimension
+        self.latency_s = latency_s
+        self.per_text_latency_s = per_text_latency_s
+        self.weights = np.ones(int(weights_mb * 1024 * 1024 // 4), dtype=np.float32) if weights_mb else None
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for token in _TOKEN_PATTERN.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], 'little') % self.dimension
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[bucket] += sign
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def encode(self, sentences, batch_size: int = 32, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        delay = self.latency_s + self.per_text_latency_s * len(texts)
+        if delay > 0:
+            time.sleep(delay)
+        embeddings = np.stack([self._embed_one(t) for t in texts]) if texts else \
+            np.zeros((0, self.dimension), dtype=np.float32)
+        return embeddings[0] if single else embeddings
+
+
+class LatencyInjectingIndex:
+    """Wrap an index and add fixed (plus optional tail) latency to each query, like a remote vector DB"""
+
+    def __init__(self, index, query_latency_s: float = 0.0, tail_latency_s: float = 0.0, tail_every: int = 0):
+        self._index = index
+        self.query_latency_s = query_latency_s
+        self.tail_latency_s = tail_latency_s
+        self.tail_every = tail_every
+        self.queries = 0
+        self._lock = threading.Lock()
+
+    def query(self, *args, **kwargs):
+        with self._lock:
+            self.queries += 1
+            n = self.queries
+        delay = self.query_latency_s
+        if self.tail_every and n % self.tail_every == 0:
+            delay += self.tail_latency_s
+        if delay > 0:
+            time.sleep(delay)
+        return self._index.query(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._index, name)
+
+
+def load_questions(path: Optional[Path] = None) -> List[str]:
+    import json
+    with open(path or FIXTURES_DIR / "questions.json", 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_local_bot(corpus_path: Optional[Path] = None, llm: Optional[FakeChatOpenAI] = None,
+                    embedder: Optional[HashingEmbedder] = None, query_latency_s: float = 0.0,
+                    tail_latency_s: float = 0.0, tail_every: int = 0, quiet: bool = True, query_log=None):
+    """Build a UNYCompassBot backed by the fixture corpus in a LocalVectorIndex and a fake LLM"""
+    import contextlib
+    import io
+
+    from hunter_ai import UNYCompassBot, UNYCompassDatabase
+    from local_index import LocalVectorIndex
+    from query_log import QueryLog
+
+    embedder = embedder or HashingEmbedder()
+    local_index = LocalVectorIndex(dimension=embedder.get_sentence_embedding_dimension())
+    index = LatencyInjectingIndex(local_index, query_latency_s, tail_latency_s, tail_every)
+
+    output = io.StringIO() if quiet else None
+    with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+        db = UNYCompassDatabase.from_components(embedder, index, namespace="benchmark")
+        # Index the corpus without injected latency or the embedder's simulated delay
+        db.index = local_index
+        saved = (embedder.latency_s, embedder.per_text_latency_s)
+        embedder.latency_s = embedder.per_text_latency_s = 0.0
+        db.upload_text_file(str(corpus_path or FIXTURES_DIR / "corpus.txt"))
+        embedder.latency_s, embedder.per_text_latency_s = saved
+        db.index = index
+        # No query log unless the caller passes one
+        bot = UNYCompassBot(db, llm=llm or FakeChatOpenAI(), query_log=query_log or QueryLog(None))
+    return bot
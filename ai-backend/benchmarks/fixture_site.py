@@ -0,0 +1,187 @@
+"""Local stand-in for hunter.cuny.edu built from benchmarks/fixtures/corpus.txt
+
+Serves every corpus page at its real path (as HTML with navigation links), a home page,
+robots.txt (Crawl-delay, a Disallow rule, Sitemap: line) and a sitemap index pointing at a plain
+and a gzipped sitemap with <lastmod> dates. Any other path is a 404. Requests are counted per
+status so crawls can be compared by wasted fetches. latency_s delays every response like a remote
+server; max_in_flight records the most requests the site ever served at once (politeness checks).
+
+Usage (from ai-backend/):
+    python -m benchmarks.fixture_site --port 8000      # then crawl http://127.0.0.1:8000
+"""
+import argparse
+import gzip
+import html
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from benchmarks import FIXTURES_DIR
+
+DISALLOWED_PREFIX = "/private/"
+
+
+def load_fixture_pages(path=FIXTURES_DIR / "corpus.txt") -> Dict[str, str]:
+    """{path: page text} for every '--- PAGE: url ---' block"""
+    pages = {}
+    for block in path.read_text(encoding='utf-8').split("--- PAGE:")[1:]:
+        header, _, body = block.partition('\n')
+        url = header.strip().rstrip('-').strip()
+        pages[urlparse(url).path] = body.strip()
+    return pages
+
+
+class FixtureSite:
+    def __init__(self, port: int = 0, crawl_delay: Optional[float] = None, sitemaps: bool = True,
+                 latency_s: float = 0.0):
+        self.pages = load_fixture_pages()
+        # A page that only the sitemap lists, under a robots.txt Disallow rule
+        self.pages[f"{DISALLOWED_PREFIX}staff-directory/"] = "Internal staff directory."
+        self.crawl_delay = crawl_delay
+        self.sitemaps = sitemaps
+        self.latency_s = latency_s
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = Counter()      # HTTP status -> count
+        self.paths = Counter()         # path -> count
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> "FixtureSite":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_counts(self):
+        with self._lock:
+            self.requests.clear()
+            self.paths.clear()
+            self.max_in_flight = 0
+
+    def lastmod(self, path: str) -> str:
+        # Deterministic dates: deeper pages were edited longer ago
+        return (date(2025, 9, 1) - timedelta(days=7 * path.count('/'))).isoformat()
+
+    def page_html(self, path: str) -> str:
+        parent = path.rstrip('/').rsplit('/', 1)[0] + '/'
+        related = [p for p in self.pages if p != path and (p.startswith(parent) or p.startswith(path))][:12]
+        links = ''.join(f'<li><a href="{html.escape(p)}">{html.escape(p.strip("/") or "home")}</a></li>'
+                        for p in ['/'] + related)
+        paragraphs = ''.join(f"<p>{html.escape(line)}</p>" for line in self.pages[path].split('\n') if line.strip())
+        title = path.strip('/').replace('/', ' - ').replace('-', ' ').title() or 'Hunter College'
+        return (f"<html><head><title>{html.escape(title)}</title></head><body>"
+                f"<nav><ul>{links}</ul></nav><main><h1>{html.escape(title)}</h1>{paragraphs}</main></body></html>")
+
+    def home_html(self) -> str:
+        sections = sorted({'/' + p.strip('/').split('/')[0] + '/' for p in self.pages
+                           if p.strip('/') and not p.startswith(DISALLOWED_PREFIX)})
+        links = ''.join(f'<li><a href="{s}">{s.strip("/")}</a></li>' for s in sections)
+        return (f"<html><head><title>Hunter College</title></head><body><nav><ul>{links}</ul></nav>"
+                f"<main><h1>Hunter College</h1><p>Hunter College of the City University of New York, "
+                f"founded in 1870, offers undergraduate and graduate programs across five schools.</p>"
+                f"</main></body></html>")
+
+    def robots_txt(self) -> str:
+        lines = ["User-agent: *", f"Disallow: {DISALLOWED_PREFIX}"]
+        if self.crawl_delay is not None:
+            lines.append(f"Crawl-delay: {self.crawl_delay}")
+        if self.sitemaps:
+            lines.append(f"Sitemap: {self.url}/sitemap_index.xml")
+        return '\n'.join(lines) + '\n'
+
+    def sitemap_index(self) -> str:
+        entries = ''.join(f"<sitemap><loc>{self.url}/{name}</loc><lastmod>2025-09-01</lastmod></sitemap>"
+                          for name in ('sitemap-main.xml', 'sitemap-artsci.xml.gz'))
+        return ('<?xml version="1.0" encoding="UTF-8"?>'
+                f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</sitemapindex>')
+
+    def urlset(self, artsci: bool) -> str:
+        entries = ''.join(
+            f"<url><loc>{self.url}{path}</loc><lastmod>{self.lastmod(path)}</lastmod></url>"
+            for path in sorted(self.pages) if path.startswith('/artsci/') == artsci
+        )
+        return ('<?xml version="1.0" encoding="UTF-8"?>'
+                f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>')
+
+    def respond(self, path: str):
+        """(status, content type, body) for a request path"""
+        if path == '/robots.txt':
+            return 200, 'text/plain', self.robots_txt().encode()
+        if self.sitemaps and path == '/sitemap_index.xml':
+            return 200, 'application/xml', self.sitemap_index().encode()
+        if self.sitemaps and path == '/sitemap-main.xml':
+            return 200, 'application/xml', self.urlset(artsci=False).encode()
+        if self.sitemaps and path == '/sitemap-artsci.xml.gz':
+            return 200, 'application/gzip', gzip.compress(self.urlset(artsci=True).encode())
+        if path == '/':
+            return 200, 'text/html; charset=utf-8', self.home_html().encode()
+        if path in self.pages:
+            return 200, 'text/html; charset=utf-8', self.page_html(path).encode()
+        return 404, 'text/html', b"<html><body><h1>Page not found</h1></body></html>"
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = urlparse(self.path).path
+                with site._lock:
+                    site.in_flight += 1
+                    site.max_in_flight = max(site.max_in_flight, site.in_flight)
+                if site.latency_s:
+                    time.sleep(site.latency_s)
+                status, content_type, body = site.respond(path)
+                with site._lock:
+                    site.in_flight -= 1
+                    site.requests[status] += 1
+                    site.paths[path] += 1
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the fixture corpus as a local Hunter College site")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--crawl-delay', type=float, help='Crawl-delay to advertise in robots.txt')
+    parser.add_argument('--no-sitemaps', action='store_true', help='Serve no sitemaps (robots.txt only)')
+    args = parser.parse_args(argv)
+
+    site = FixtureSite(args.port, crawl_delay=args.crawl_delay, sitemaps=not args.no_sitemaps)
+    print(f"🌐 Serving {len(site.pages)} fixture pages at {site.url} (Ctrl+C to stop)")
+    try:
+        site._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
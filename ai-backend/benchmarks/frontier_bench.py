@@ -0,0 +1,94 @@
+"""Frontier seeding benchmark: guessed seed URLs vs robots.txt/sitemap discovery
+
+Crawls the local fixture site (benchmarks/fixture_site.py) with HybridWebCrawler twice, once with
+only the hand-listed and generated seeds and once seeded from the sitemaps, and compares pages
+crawled against wasted fetches (404s and retries). With --recrawl each mode crawls a second time
+with the first run's negative cache, as a scheduled re-crawl would.
+
+Usage (from ai-backend/):
+    python -m benchmarks.frontier_bench
+    python -m benchmarks.frontier_bench --max-pages 60 --modes sitemap
+    python -m benchmarks.frontier_bench --recrawl
+"""
+import argparse
+import contextlib
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fixture_site import FixtureSite
+from benchmarks.reporting import write_results
+
+
+def run_crawl(site: FixtureSite, use_sitemaps: bool, max_pages: int, negative_cache_path=None):
+    from hunter_main import HybridWebCrawler
+
+    site.reset_counts()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        # The fixture stands in for hunter.cuny.edu, so the hand-listed seeds are rebased onto it
+        crawler = HybridWebCrawler(site.url, max_pages=max_pages, delay=0.0, use_sitemaps=use_sitemaps,
+                                   negative_cache_path=negative_cache_path, rebase_seeds=True)
+        crawler.crawl()
+    seconds = time.perf_counter() - started
+
+    reasons = {}
+    for failure in crawler.failed_urls:
+        reason = failure['reason'].split(' for url')[0]
+        reasons[reason] = reasons.get(reason, 0) + 1
+    return {
+        'seconds': round(seconds, 2),
+        'pages_crawled': len(crawler.pages_data),
+        'pages_attempted': crawler.page_count,
+        'failed_urls': len(crawler.failed_urls),
+        'failure_reasons': reasons,
+        'requests_by_status': {str(status): count for status, count in sorted(site.requests.items())},
+        'wasted_fetches': sum(count for status, count in site.requests.items() if status >= 400),
+        'frontier': crawler.frontier_stats,
+        'negative_cache': crawler.negative_cache.stats(),
+        'time_by_category_seconds': crawler.metrics.report()['time_by_category_seconds'],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare guessed and sitemap-seeded crawl frontiers")
+    parser.add_argument('--max-pages', type=int, default=60, help='Default stays under the fixture site\'s 66 pages')
+    parser.add_argument('--modes', default='guessed,sitemap')
+    parser.add_argument('--recrawl', action='store_true', help='Crawl each mode again with the persisted negative cache')
+    parser.add_argument('--output', help='Results JSON path (default: benchmarks/results/)')
+    args = parser.parse_args(argv)
+
+    # The crawler logs to crawler_hybrid.log in the working directory; keep that out of the repo
+    workdir = tempfile.mkdtemp(prefix="frontier_bench_")
+    previous_dir = os.getcwd()
+    os.chdir(workdir)
+    logging.disable(logging.INFO)
+
+    results = {'max_pages': args.max_pages, 'modes': {}}
+    try:
+        with FixtureSite() as site:
+            for mode in args.modes.split(','):
+                print(f"🕷️ Crawling {site.url} ({mode} frontier, up to {args.max_pages} pages)...")
+                cache_path = os.path.join(workdir, f"negative_cache_{mode}.json") if args.recrawl else None
+                runs = ['first', 'recrawl'] if args.recrawl else ['first']
+                for run in runs:
+                    row = run_crawl(site, use_sitemaps=(mode == 'sitemap'), max_pages=args.max_pages,
+                                    negative_cache_path=cache_path)
+                    results['modes'][mode if run == 'first' else f"{mode}_recrawl"] = row
+                    print(f"   {run:<8} {row['pages_crawled']} pages crawled, {row['failed_urls']} failed, "
+                          f"{row['wasted_fetches']} wasted fetches, "
+                          f"{row['negative_cache']['fetches_avoided']} avoided, {row['seconds']:.1f}s")
+    finally:
+        logging.disable(logging.NOTSET)
+        os.chdir(previous_dir)
+
+    path = write_results('frontier', results, args.output)
+    print(f"✅ Results written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
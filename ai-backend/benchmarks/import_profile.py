@@ -0,0 +1,139 @@
+"""Import-time profile and cold-start benchmark
+
+Profiles `import hunter_ai` with `python -X importtime` (heavy dependencies such as torch,
+sentence_transformers, langchain_openai and pinecone must not appear) and measures how long the
+API takes from process start to its first successful /ping with FAST_START=true.
+
+Usage (from ai-backend/):
+    python -m benchmarks.import_profile
+    python -m benchmarks.import_profile --module flask_api --top 25 --skip-ping
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+from benchmarks import CHATBOT_DIR
+from benchmarks.load_test import free_port
+from benchmarks.reporting import write_results
+
+API_DIR = Path(__file__).parent.parent / "api"
+HEAVY_MODULES = ["torch", "sentence_transformers", "transformers", "langchain_openai", "openai",
+                 "pinecone", "langchain_text_splitters"]
+
+
+def _import_env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(CHATBOT_DIR), str(API_DIR), env.get("PYTHONPATH", "")])
+    return env
+
+
+def parse_importtime(stderr: str):
+    """Parse `-X importtime` lines into [(module, self_us, cumulative_us, depth)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # Nesting is encoded as two extra spaces per level in front of the module name
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def profile_import(module: str, top: int):
+    """Import `module` in a fresh interpreter and report the slowest imports it triggered"""
+    code = (f"import json, sys, time; started = time.perf_counter(); import {module}; "
+            f"print(json.dumps({{'seconds': time.perf_counter() - started, "
+            f"'heavy': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))")
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True,
+                               text=True, env=_import_env())
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+    summary = json.loads(completed.stdout.strip().splitlines()[-1])
+    rows = parse_importtime(completed.stderr)
+    # `site` and its .pth hooks run at interpreter startup; children are listed before their parent
+    startup = [i for i, row in enumerate(rows) if row[0] == "site" and row[3] == 0]
+    if startup:
+        rows = rows[startup[-1] + 1:]
+    by_cumulative = sorted(rows, key=lambda row: row[2], reverse=True)
+    return {
+        'module': module,
+        'import_ms': round(summary['seconds'] * 1000, 1),
+        'modules_imported': len(rows),
+        'heavy_modules_loaded': summary['heavy'],
+        'slowest_cumulative': [{'module': name, 'cumulative_ms': round(cumulative / 1000, 1),
+                                'self_ms': round(self_us / 1000, 1)}
+                               for name, self_us, cumulative, _ in by_cumulative[:top]],
+        'slowest_self': [{'module': name, 'self_ms': round(self_us / 1000, 1)}
+                         for name, self_us, _, _ in sorted(rows, key=lambda row: row[1], reverse=True)[:top]]
+    }
+
+
+def time_to_first_ping(timeout: float = 60.0):
+    """Seconds from spawning `api/flask_api.py` (FAST_START=true) until /ping answers 200"""
+    port = free_port()
+    env = _import_env()
+    env.update({"FAST_START": "true", "PORT": str(port), "PYTHONUNBUFFERED": "1"})
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, str(API_DIR / "flask_api.py")], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"flask_api exited with code {process.returncode} before answering /ping")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/ping", timeout=1) as response:
+                    if response.status == 200:
+                        ready = json.loads(response.read()).get("ready")
+                        return {'first_ping_ms': round((time.perf_counter() - started) * 1000, 1),
+                                'chatbot_ready_at_first_ping': ready}
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError(f"/ping did not answer within {timeout:.0f}s")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile import time and fast-start cold boot")
+    parser.add_argument('--module', action='append', help='Module(s) to profile (default: hunter_ai, chunker)')
+    parser.add_argument('--top', type=int, default=15, help='Slowest imports to report')
+    parser.add_argument('--skip-ping', action='store_true', help='Skip the time-to-first-/ping measurement')
+    parser.add_argument('--output', help='Results JSON path (default: benchmarks/results/)')
+    args = parser.parse_args(argv)
+
+    results = {'python': sys.version.split()[0], 'imports': []}
+    for module in args.module or ['hunter_ai', 'chunker']:
+        profile = profile_import(module, args.top)
+        results['imports'].append(profile)
+        heavy = ", ".join(profile['heavy_modules_loaded']) or "none"
+        print(f"📦 import {module}: {profile['import_ms']}ms, {profile['modules_imported']} modules, heavy: {heavy}")
+        for row in profile['slowest_cumulative'][:5]:
+            print(f"   • {row['module']:<40} {row['cumulative_ms']:>8.1f}ms")
+
+    exit_code = 1 if any(p['heavy_modules_loaded'] for p in results['imports']) else 0
+    if not args.skip_ping:
+        try:
+            results['fast_start'] = time_to_first_ping()
+            print(f"🏓 First /ping after {results['fast_start']['first_ping_ms']}ms (FAST_START=true)")
+        except RuntimeError as e:
+            results['fast_start'] = {'error': str(e)}
+            print(f"❌ Fast-start measurement failed: {e}")
+            exit_code = 1
+
+    path = write_results('import_profile', results, args.output)
+    print(f"✅ Results written to {path}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
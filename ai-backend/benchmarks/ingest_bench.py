@@ -0,0 +1,137 @@
+"""Crawl-to-index benchmark: crawl, save, then re-read and index vs the streaming ingest pipeline
+
+Crawls the local fixture site (benchmarks/fixture_site.py) into a LocalVectorIndex with the
+HashingEmbedder standing in for the model (with simulated per-call and per-text latency).
+"sequential" is today's flow: crawl everything, save docs/, then upload_text_file,
+upload_page_records and upload_json_file re-read and re-split the files. "pipeline" is
+ingest.crawl_and_index. Reports wall time, time until the first chunk is searchable, and the
+pipeline's per-stage breakdown.
+
+Usage (from ai-backend/):
+    python -m benchmarks.ingest_bench
+    python -m benchmarks.ingest_bench --max-pages 60 --delay 0.05 --embed-latency 0.02
+"""
+import argparse
+import contextlib
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fakes import HashingEmbedder
+from benchmarks.fixture_site import FixtureSite
+from benchmarks.reporting import write_results
+
+
+def build_db(embedder, workdir):
+    from hunter_ai import UNYCompassDatabase
+    from local_index import LocalVectorIndex
+
+    index = LocalVectorIndex(dimension=embedder.get_sentence_embedding_dimension())
+    db = UNYCompassDatabase.from_components(embedder, index, namespace="benchmark")
+    db.indexed_files_record = os.path.join(workdir, "indexed_files.json")
+    return db, index
+
+
+def build_crawler(site, args, output):
+    from hunter_main import HybridWebCrawler
+
+    return HybridWebCrawler(site.url, max_pages=args.max_pages, delay=args.delay, negative_cache_path=None,
+                            page_records_path=output.replace('.txt', '_pages.ndjson'), rebase_seeds=True)
+
+
+def run_sequential(site, args, workdir):
+    embedder = HashingEmbedder(latency_s=args.embed_latency, per_text_latency_s=args.per_text_latency)
+    output = os.path.join(workdir, "sequential", "crawl.txt")
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        crawler = build_crawler(site, args, output)
+        crawler.crawl()
+        crawler.save_results(output)
+        crawled = time.perf_counter() - started
+        db, index = build_db(embedder, workdir)
+        db.upload_text_file(output)
+        db.upload_page_records(output.replace('.txt', '_pages.ndjson'))
+        for suffix in ('_urls.json', '_analytics.json'):
+            db.upload_json_file(output.replace('.txt', suffix))
+    seconds = time.perf_counter() - started
+    return {
+        'seconds': round(seconds, 2),
+        'crawl_seconds': round(crawled, 2),
+        'index_seconds': round(seconds - crawled, 2),
+        'first_searchable_seconds': round(seconds, 2),
+        'pages': len(crawler.pages_data),
+        'vectors': index.describe_index_stats().total_vector_count,
+    }
+
+
+def run_pipeline(site, args, workdir):
+    from ingest import crawl_and_index
+
+    embedder = HashingEmbedder(latency_s=args.embed_latency, per_text_latency_s=args.per_text_latency)
+    output = os.path.join(workdir, "pipeline", "crawl.txt")
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        crawler = build_crawler(site, args, output)
+        db, index = build_db(embedder, workdir)
+        report = crawl_and_index(crawler, db, output, queue_size=args.queue_size,
+                                 embed_batch_size=args.embed_batch_size)
+    seconds = time.perf_counter() - started
+    return {
+        'seconds': round(seconds, 2),
+        'first_searchable_seconds': report['first_searchable_seconds'],
+        'pages': len(crawler.pages_data),
+        'vectors': index.describe_index_stats().total_vector_count,
+        'bottleneck': report['bottleneck'],
+        'stages': report['stages'],
+        'max_queue_depth': report['max_queue_depth'],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare crawl-then-index with the streaming ingest pipeline")
+    parser.add_argument('--max-pages', type=int, default=60)
+    parser.add_argument('--delay', type=float, default=0.05, help='Crawler politeness delay per page (s)')
+    parser.add_argument('--embed-latency', type=float, default=0.02, help='Simulated model latency per encode() call (s)')
+    parser.add_argument('--per-text-latency', type=float, default=0.002, help='Simulated latency per text embedded (s)')
+    parser.add_argument('--queue-size', type=int, default=32)
+    parser.add_argument('--embed-batch-size', type=int, default=64)
+    parser.add_argument('--modes', default='sequential,pipeline')
+    parser.add_argument('--output', help='Results JSON path (default: benchmarks/results/)')
+    args = parser.parse_args(argv)
+
+    # The crawler logs to crawler_hybrid.log in the working directory; keep that out of the repo
+    workdir = tempfile.mkdtemp(prefix="ingest_bench_")
+    previous_dir = os.getcwd()
+    os.chdir(workdir)
+    logging.disable(logging.INFO)
+
+    runners = {'sequential': run_sequential, 'pipeline': run_pipeline}
+    results = {'config': vars(args), 'modes': {}}
+    try:
+        with FixtureSite() as site:
+            for mode in args.modes.split(','):
+                print(f"🕷️ {mode}: crawling {site.url} (up to {args.max_pages} pages) and indexing...")
+                site.reset_counts()
+                row = runners[mode](site, args, workdir)
+                results['modes'][mode] = row
+                print(f"   {row['pages']} pages, {row['vectors']} vectors in {row['seconds']:.2f}s, "
+                      f"first searchable after {row['first_searchable_seconds']}s")
+                if 'stages' in row:
+                    for name, stage in row['stages'].items():
+                        print(f"   {name:<7} {stage['items']:>5} items  busy {stage['busy_seconds']:>6.2f}s  "
+                              f"blocked {stage['blocked_seconds']:>6.2f}s")
+                    print(f"   bottleneck: {row['bottleneck']}")
+    finally:
+        logging.disable(logging.NOTSET)
+        os.chdir(previous_dir)
+
+    path = write_results('ingest', results, args.output)
+    print(f"✅ Results written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
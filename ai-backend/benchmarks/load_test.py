@@ -0,0 +1,397 @@
+"""Open-loop HTTP load test for the Flask API with stubbed backends
+
+Starts the API (benchmarks.stub_app) in a subprocess under the chosen serving mode, then drives
+/api/chatbot/ask, /chat and /api/chatbot/status at a fixed arrival rate for each RPS step.
+Latency is measured from each request's *scheduled* send time, so client-side queueing shows up
+instead of being hidden (no coordinated omission).
+
+Usage (from ai-backend/):
+    python -m benchmarks.load_test --mode threaded --rps 2,5,10,20 --duration 20
+    python -m benchmarks.load_test --mode prefork --workers 4 --rps 5,10,20,40
+    python -m benchmarks.load_test --mode threaded,prefork,asgi --mix ask=0.8,chat=0.1,status=0.1
+    python -m benchmarks.load_test --mode threaded,production --workers 4 --model-mb 420   # RSS/PSS per mode
+    python -m benchmarks.load_test --rps 30 --llm-capacity 6 --admission true,false      # load shedding under a spike
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from benchmarks.fakes import load_questions
+from benchmarks.reporting import summarize, write_results
+
+AI_BACKEND_DIR = Path(__file__).parent.parent
+
+ENDPOINTS = {
+    'ask': ('POST', '/api/chatbot/ask'),
+    'chat': ('POST', '/chat'),
+    'status': ('GET', '/api/chatbot/status'),
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def server_command(mode: str, port: int, workers: int, threads: int):
+    bind = f"127.0.0.1:{port}"
+    if mode == 'threaded':
+        return [sys.executable, '-m', 'benchmarks.stub_app', '--port', str(port)]
+    if mode == 'production':
+        # api/serve.py: preloaded master, gthread workers, gc.freeze, torch thread coordination
+        return [sys.executable, 'api/serve.py', '--app', 'benchmarks.stub_app:app', '--port', str(port),
+                '--workers', str(workers), '--threads', str(threads)]
+    if mode == 'prefork':
+        return ['gunicorn', '-w', str(workers), '-k', 'sync', '--preload', '-b', bind,
+                '--timeout', '120', 'benchmarks.stub_app:app']
+    if mode == 'gthread':
+        return ['gunicorn', '-w', str(workers), '-k', 'gthread', '--threads', str(threads), '--preload',
+                '-b', bind, '--timeout', '120', 'benchmarks.stub_app:app']
+    if mode == 'asgi':
+        return ['uvicorn', 'benchmarks.stub_app:asgi_app', '--host', '127.0.0.1', '--port', str(port),
+                '--workers', str(workers), '--log-level', 'warning']
+    raise ValueError(f"Unknown serving mode: {mode}")
+
+
+def _child_pids(pid: int):
+    """Direct children of `pid` (Linux /proc)"""
+    children = []
+    for entry in Path('/proc').iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / 'stat').read_text()
+        except OSError:
+            continue
+        # Field 4 (ppid) follows the parenthesised command name, which may itself contain spaces
+        if int(stat.rsplit(')', 1)[1].split()[1]) == pid:
+            children.append(int(entry.name))
+    return children
+
+
+def process_memory(pid: int) -> dict:
+    """RSS, PSS and shared/private split in MB from /proc/<pid>/smaps_rollup
+
+    PSS divides each shared page among the processes mapping it, so summing PSS across a
+    pre-fork server's processes gives its real footprint; summing RSS double-counts shared weights.
+    """
+    fields = {}
+    for line in (Path('/proc') / str(pid) / 'smaps_rollup').read_text().splitlines()[1:]:
+        name, _, value = line.partition(':')
+        parts = value.split()
+        if len(parts) == 2 and parts[1] == 'kB':
+            fields[name] = int(parts[0]) / 1024
+    return {
+        'pid': pid,
+        'rss_mb': round(fields.get('Rss', 0), 1),
+        'pss_mb': round(fields.get('Pss', 0), 1),
+        'shared_mb': round(fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0), 1),
+        'private_mb': round(fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0), 1),
+    }
+
+
+def server_memory(root_pid: int) -> Optional[dict]:
+    """Memory of a server's process tree (master + workers); None where /proc isn't available"""
+    if not Path('/proc/self/smaps_rollup').exists():
+        return None
+    pids, frontier = [], [root_pid]
+    while frontier:
+        pid = frontier.pop()
+        pids.append(pid)
+        frontier.extend(_child_pids(pid))
+    processes = []
+    for pid in pids:
+        try:
+            processes.append(process_memory(pid))
+        except OSError:
+            continue
+    return {
+        'processes': processes,
+        'total_rss_mb': round(sum(p['rss_mb'] for p in processes), 1),
+        'total_pss_mb': round(sum(p['pss_mb'] for p in processes), 1),
+    }
+
+
+class ServerProcess:
+    """Run one serving mode in a subprocess and wait until /ping answers"""
+
+    def __init__(self, mode: str, workers: int, threads: int, env_overrides: dict, startup_timeout: float = 120):
+        self.mode = mode
+        self.port = free_port()
+        self.command = server_command(mode, self.port, workers, threads)
+        self.env = {**os.environ, **env_overrides}
+        self.startup_timeout = startup_timeout
+        self.process = None
+
+    def __enter__(self):
+        if shutil.which(self.command[0]) is None and self.command[0] != sys.executable:
+            raise RuntimeError(f"'{self.command[0]}' is not installed; cannot run mode '{self.mode}'")
+        # Server logs go to a temp file: a PIPE nobody drains would eventually block the server
+        self.log = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(
+            self.command, cwd=AI_BACKEND_DIR, env=self.env,
+            stdout=self.log, stderr=subprocess.STDOUT, start_new_session=True
+        )
+        deadline = time.time() + self.startup_timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                self.log.seek(0)
+                raise RuntimeError(f"{self.mode} server exited: {self.log.read().decode(errors='replace')[-2000:]}")
+            try:
+                conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=2)
+                conn.request('GET', '/ping')
+                if conn.getresponse().status == 200:
+                    conn.close()
+                    return self
+            except OSError:
+                pass
+            time.sleep(0.25)
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"{self.mode} server did not become ready in {self.startup_timeout}s")
+
+    def __exit__(self, *exc):
+        if self.process and self.process.poll() is None:
+            os.killpg(self.process.pid, signal.SIGTERM)
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+        if getattr(self, 'log', None):
+            self.log.close()
+
+
+class LoadGenerator:
+    """Open-loop request generator: arrivals follow a Poisson process at the target RPS"""
+
+    def __init__(self, port: int, mix: dict, sessions: int, questions, timeout: float, max_outstanding: int, seed: int):
+        self.port = port
+        self.mix = mix
+        self.sessions = sessions
+        self.questions = questions
+        self.timeout = timeout
+        self.max_outstanding = max_outstanding
+        self.random = random.Random(seed)
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _send(self, kind: str, body, scheduled_at: float):
+        method, path = ENDPOINTS[kind]
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload else {}
+        status = None
+        error = None
+        try:
+            conn = self._connection()
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+            except (http.client.HTTPException, ConnectionError):
+                # Stale keep-alive connection: reconnect once
+                conn.close()
+                self._local.conn = None
+                conn = self._connection()
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+            response.read()
+            status = response.status
+        except Exception as e:
+            error = type(e).__name__
+            self._local.conn = None
+        return kind, status, error, time.perf_counter() - scheduled_at
+
+    def _next_request(self):
+        kind = self.random.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        question = self.random.choice(self.questions)
+        if kind == 'ask':
+            return kind, {'message': question, 'ui_session_id': self.random.randrange(self.sessions)}
+        if kind == 'chat':
+            return kind, {'message': question}
+        return kind, None
+
+    def run_step(self, rps: float, duration: float):
+        results = []
+        lock = threading.Lock()
+
+        def record(future):
+            with lock:
+                results.append(future.result())
+
+        started = time.perf_counter()
+        scheduled = started
+        sent = 0
+        with ThreadPoolExecutor(max_workers=self.max_outstanding) as pool:
+            while scheduled - started < duration:
+                now = time.perf_counter()
+                if scheduled > now:
+                    time.sleep(scheduled - now)
+                kind, body = self._next_request()
+                pool.submit(self._send, kind, body, scheduled).add_done_callback(record)
+                sent += 1
+                scheduled += self.random.expovariate(rps)
+        elapsed = time.perf_counter() - started
+
+        by_endpoint = {}
+        for kind, status, error, latency in results:
+            entry = by_endpoint.setdefault(kind, {'latencies': [], 'errors': 0, 'statuses': {}})
+            entry['latencies'].append(latency)
+            if error or status is None or status >= 500:
+                entry['errors'] += 1
+            key = str(status) if status is not None else error
+            entry['statuses'][key] = entry['statuses'].get(key, 0) + 1
+
+        all_latencies = [r[3] for r in results]
+        # Requests shed by admission control (503) return fast; report answered latency on its own
+        ok_latencies = [r[3] for r in results if r[1] is not None and r[1] < 400]
+        shed = sum(1 for r in results if r[1] == 503)
+        total_errors = sum(e['errors'] for e in by_endpoint.values())
+        ok = len(results) - total_errors
+        return {
+            'target_rps': rps,
+            'sent': sent,
+            'completed': len(results),
+            'achieved_rps': round(ok / elapsed, 2) if elapsed > 0 else None,
+            'error_rate': round(total_errors / len(results), 4) if results else None,
+            'latency': summarize(all_latencies),
+            'ok_latency': summarize(ok_latencies),
+            'shed': shed,
+            'endpoints': {
+                kind: {
+                    'latency': summarize(entry['latencies']),
+                    'error_rate': round(entry['errors'] / len(entry['latencies']), 4),
+                    'statuses': entry['statuses']
+                }
+                for kind, entry in by_endpoint.items()
+            }
+        }
+
+
+def is_saturated(step: dict, slo_ms: float, max_error_rate: float) -> bool:
+    p99 = step['latency'].get('p99_ms')
+    return (
+        (p99 is not None and p99 > slo_ms)
+        or (step['error_rate'] or 0) > max_error_rate
+        or (step['achieved_rps'] or 0) < 0.9 * step['target_rps']
+    )
+
+
+def parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint '{name}' (choose from {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Open-loop load test of the Flask chatbot API")
+    parser.add_argument('--mode', default='threaded',
+                        help='threaded, production, prefork, gthread, asgi (comma-separated)')
+    parser.add_argument('--rps', default='2,5,10,20', help='Comma-separated target request rates')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds per RPS step')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('ask=0.8,chat=0.1,status=0.1'))
+    parser.add_argument('--sessions', type=int, default=50, help='Distinct ui_session_id values')
+    parser.add_argument('--workers', type=int, default=4, help='Worker processes for prefork/gthread/asgi')
+    parser.add_argument('--threads', type=int, default=8, help='Threads per worker for gthread')
+    parser.add_argument('--timeout', type=float, default=60, help='Client request timeout (s)')
+    parser.add_argument('--max-outstanding', type=int, default=512, help='Client concurrency cap')
+    parser.add_argument('--slo-ms', type=float, default=5000, help='p99 latency that counts as saturated')
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--stop-at-saturation', action='store_true', help='Skip higher RPS steps once saturated')
+    parser.add_argument('--llm-latency', type=float, default=0.4)
+    parser.add_argument('--token-rate', type=float, default=80)
+    parser.add_argument('--query-latency', type=float, default=0.03)
+    parser.add_argument('--llm-capacity', type=int, default=0,
+                        help='Concurrent LLM calls the stub upstream serves before queueing (0 = unlimited)')
+    parser.add_argument('--admission', default='',
+                        help='ADMISSION_CONTROL values to run each mode with, e.g. true,false (default: server default)')
+    parser.add_argument('--model-mb', type=float, default=420,
+                        help='Resident ballast standing in for the embedding model (all-mpnet-base-v2 is ~420 MB)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Results JSON path (default: benchmarks/results/)')
+    args = parser.parse_args(argv)
+
+    env_overrides = {
+        'STUB_LLM_LATENCY': str(args.llm_latency),
+        'STUB_TOKEN_RATE': str(args.token_rate),
+        'STUB_QUERY_LATENCY': str(args.query_latency),
+        'STUB_MODEL_MB': str(args.model_mb),
+        'STUB_LLM_CAPACITY': str(args.llm_capacity),
+    }
+    questions = load_questions()
+    rps_steps = [float(r) for r in args.rps.split(',') if r.strip()]
+
+    runs = []
+    for mode in [m.strip() for m in args.mode.split(',') if m.strip()]:
+        admission_values = [a.strip() for a in args.admission.split(',') if a.strip()]
+        if not admission_values:
+            runs.append((mode, mode, env_overrides))
+        for value in admission_values:
+            runs.append((f"{mode}+admission={value}", mode, {**env_overrides, 'ADMISSION_CONTROL': value}))
+
+    modes = {}
+    for name, mode, run_env in runs:
+        print(f"🚀 Starting '{name}' server...")
+        try:
+            with ServerProcess(mode, args.workers, args.threads, run_env) as server:
+                generator = LoadGenerator(server.port, args.mix, args.sessions, questions,
+                                          args.timeout, args.max_outstanding, args.seed)
+                steps = []
+                saturation_rps = None
+                for rps in rps_steps:
+                    step = generator.run_step(rps, args.duration)
+                    step['saturated'] = is_saturated(step, args.slo_ms, args.max_error_rate)
+                    steps.append(step)
+                    print(f"   {rps:>6.1f} rps → achieved {step['achieved_rps']} rps, "
+                          f"p50 {step['latency'].get('p50_ms')}ms, p99 {step['latency'].get('p99_ms')}ms, "
+                          f"answered p99 {step['ok_latency'].get('p99_ms')}ms, shed {step['shed']}, "
+                          f"errors {step['error_rate']:.1%}{' ⚠️ saturated' if step['saturated'] else ''}")
+                    if step['saturated'] and saturation_rps is None:
+                        saturation_rps = rps
+                        if args.stop_at_saturation:
+                            break
+                # Sampled after the load steps, once workers have touched their working set
+                memory = server_memory(server.process.pid)
+                if memory:
+                    print(f"   memory: {len(memory['processes'])} processes, "
+                          f"PSS {memory['total_pss_mb']} MB, RSS {memory['total_rss_mb']} MB")
+                modes[name] = {'command': ' '.join(server.command), 'steps': steps, 'saturation_rps': saturation_rps,
+                               'memory': memory}
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            modes[name] = {'error': str(e)}
+
+    results = {'config': {k: v for k, v in vars(args).items()}, 'modes': modes}
+    path = write_results('load', results, args.output)
+    print(f"✅ Results written to {path}")
+    for mode, data in modes.items():
+        if 'steps' in data:
+            footprint = f", {data['memory']['total_pss_mb']} MB PSS" if data.get('memory') else ""
+            print(f"   • {mode}: saturates at {data['saturation_rps'] or '> ' + str(rps_steps[-1])} rps{footprint}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
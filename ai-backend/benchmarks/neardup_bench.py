@@ -0,0 +1,117 @@
+"""Near-duplicate detection at crawl scale: lookup cost and recall as the page count grows
+
+Generates a synthetic site of template-heavy pages (a shared navigation block per section plus a
+unique body) with planted near-duplicates: copies of earlier pages with a few words changed and a
+different sidebar. Each page is looked up in a NearDuplicateIndex and added if it is new, as
+HybridWebCrawler.check_near_duplicate does. For every --pages size, reports the time per page for
+lookup + add (fingerprinting is reported separately), the mean number of LSH candidates each lookup
+compared, and recall on the planted pairs whose exact shingle Jaccard similarity reaches the threshold.
+A lookup cost that stays flat as pages grow means the index scales linearly with the crawl.
+
+Usage (from ai-backend/):
+    python -m benchmarks.neardup_bench
+    python -m benchmarks.neardup_bench --pages 1000,10000,100000 --threshold 0.85
+"""
+import argparse
+import random
+import sys
+import time
+
+from benchmarks.reporting import peak_rss_mb, write_results
+
+
+def synthetic_site(count: int, duplicate_rate: float, seed: int):
+    """[(url, text, original index or None)]: pages in crawl order, near-duplicates after their original"""
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(20000)]
+    templates = [" ".join(rng.choices(vocabulary, k=120)) for _ in range(8)]
+    pages = []
+    while len(pages) < count:
+        template = rng.choice(templates)
+        body = rng.choices(vocabulary, k=rng.choice([80, 150, 300, 600]))
+        pages.append((f"page-{len(pages)}", f"{template} {' '.join(body)}", None))
+        if rng.random() < duplicate_rate and len(pages) < count:
+            edited = list(body)
+            for _ in range(max(1, len(body) // 60)):
+                edited[rng.randrange(len(edited))] = rng.choice(vocabulary)
+            sidebar = " ".join(rng.choices(vocabulary, k=4))
+            pages.append((f"page-{len(pages)}", f"{template} {' '.join(edited)} {sidebar}", len(pages) - 1))
+    return pages
+
+
+def jaccard(a, b) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def run(pages, threshold: float):
+    from neardup import NearDuplicateIndex, shingle_hashes
+
+    index = NearDuplicateIndex(threshold)
+    started = time.perf_counter()
+    signatures = [index.fingerprint(text) for _, text, _ in pages]
+    fingerprint_s = time.perf_counter() - started
+
+    candidates = 0
+    matches = {}
+    started = time.perf_counter()
+    for (url, _, _), signature in zip(pages, signatures):
+        match = index.find(signature)
+        if match is None:
+            index.add(url, signature)
+        else:
+            matches[url] = match[0]
+    index_s = time.perf_counter() - started
+    # Counted in a separate pass so it doesn't inflate the timing above
+    rebuilt = NearDuplicateIndex(threshold)
+    for (url, _, _), signature in zip(pages, signatures):
+        candidates += len(rebuilt.candidates(signature))
+        if url not in matches:
+            rebuilt.add(url, signature)
+
+    expected, found = 0, 0
+    for url, text, original in pages:
+        if original is None:
+            continue
+        similarity = jaccard(set(shingle_hashes(text).tolist()), set(shingle_hashes(pages[original][1]).tolist()))
+        if similarity >= threshold:
+            expected += 1
+            found += url in matches
+    return {
+        'pages': len(pages),
+        'rows_per_band': index.rows,
+        'fingerprint_us_per_page': round(fingerprint_s / len(pages) * 1e6, 1),
+        'index_us_per_page': round(index_s / len(pages) * 1e6, 1),
+        'candidates_per_lookup': round(candidates / len(pages), 2),
+        'near_duplicates_planted': expected,
+        'recall': round(found / expected, 3) if expected else None,
+        'matches': len(matches),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Near-duplicate index lookup cost and recall versus page count")
+    parser.add_argument('--pages', default='1000,10000,50000', help='Comma-separated crawl sizes')
+    parser.add_argument('--threshold', type=float, default=0.9, help='near_duplicate_threshold')
+    parser.add_argument('--duplicate-rate', type=float, default=0.1, help='Fraction of pages followed by a near-duplicate')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Results JSON path (default: benchmarks/results/)')
+    args = parser.parse_args(argv)
+    sizes = [int(n) for n in args.pages.split(',') if n.strip()]
+
+    site = synthetic_site(max(sizes), args.duplicate_rate, args.seed)
+    results = {'config': vars(args), 'runs': []}
+    for size in sizes:
+        row = run(site[:size], args.threshold)
+        results['runs'].append(row)
+        print(f"🪞 {size:>8,} pages  {row['index_us_per_page']:>8} µs/page lookup+add  "
+              f"{row['candidates_per_lookup']:>6} candidates/lookup  recall {row['recall']}  "
+              f"(fingerprint {row['fingerprint_us_per_page']} µs/page)")
+
+    results['peak_rss_mb'] = peak_rss_mb()
+    path = write_results('neardup', results, args.output)
+    print(f"✅ Results written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Multi-site crawling: one HybridWebCrawler after another vs crawl_orchestrator.CrawlOrchestrator
+
+Starts N fixture sites (benchmarks/fixture_site.py), each on its own port and so its own domain,
+with --latency per response. "sequential" runs crawler.crawl() for each site in turn, as looping
+over crawl_hunter_hybrid() would. "orchestrator" crawls them all on one pool of --workers threads.
+Both use the same per-domain --delay. Reports wall time, aggregate pages/min, worker utilization
+and the most requests any one site served at once (politeness: must stay 1).
+
+Usage (from ai-backend/):
+    python -m benchmarks.orchestrator_bench
+    python -m benchmarks.orchestrator_bench --sites 1,2,4,8 --max-pages 30 --delay 0.2 --workers 8
+"""
+import argparse
+import contextlib
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fixture_site import FixtureSite
+from benchmarks.reporting import write_results
+
+
+def run_sequential(sites, args, workdir):
+    from hunter_main import HybridWebCrawler
+
+    os.makedirs(workdir, exist_ok=True)
+    pages = 0
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i, site in enumerate(sites):
+            crawler = HybridWebCrawler(site.url, max_pages=args.max_pages, delay=args.delay, negative_cache_path=None,
+                                       rebase_seeds=True)
+            crawler.crawl()
+            crawler.save_results(os.path.join(workdir, f"sequential_{i}.txt"))
+            pages += len(crawler.pages_data)
+    seconds = time.perf_counter() - started
+    return {'seconds': round(seconds, 2), 'pages': pages, 'pages_per_minute': round(pages / seconds * 60, 1)}
+
+
+def run_orchestrator(sites, args, workdir):
+    from crawl_orchestrator import CrawlOrchestrator, CrawlSite
+
+    # The fixture sites stand in for hunter.cuny.edu, like the sequential crawls' rebased seeds
+    crawl_sites = [CrawlSite(f"site{i}", site.url, output_dir=os.path.join(workdir, "orchestrator"),
+                             max_pages=args.max_pages, delay=args.delay, hand_listed_seeds=True)
+                   for i, site in enumerate(sites)]
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = CrawlOrchestrator(crawl_sites, max_workers=args.workers, crawler_options={'rebase_seeds': True}).run()
+    seconds = time.perf_counter() - started
+    return {
+        'seconds': round(seconds, 2),
+        'pages': report['pages'],
+        'pages_per_minute': report['pages_per_minute'],
+        'worker_utilization': report['worker_utilization'],
+        'sum_site_seconds': report['sum_site_seconds'],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare crawling sites one by one with the crawl orchestrator")
+    parser.add_argument('--sites', default='1,2,4,8', help='Comma-separated numbers of sites to crawl')
+    parser.add_argument('--max-pages', type=int, default=30, help='Pages per site')
+    parser.add_argument('--delay', type=float, default=0.2, help='Per-domain politeness delay (s)')
+    parser.add_argument('--latency', type=float, default=0.05, help='Simulated server latency per response (s)')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--modes', default='sequential,orchestrator')
+    parser.add_argument('--output', help='Results JSON path (default: benchmarks/results/)')
+    args = parser.parse_args(argv)
+    counts = [int(n) for n in args.sites.split(',') if n.strip()]
+
+    # The crawler logs to crawler_hybrid.log in the working directory; keep that out of the repo
+    workdir = tempfile.mkdtemp(prefix="orchestrator_bench_")
+    previous_dir = os.getcwd()
+    os.chdir(workdir)
+    logging.disable(logging.INFO)
+
+    runners = {'sequential': run_sequential, 'orchestrator': run_orchestrator}
+    results = {'config': vars(args), 'sites': {}}
+    sites = [FixtureSite(latency_s=args.latency).start() for _ in range(max(counts))]
+    try:
+        for count in counts:
+            results['sites'][count] = {}
+            for mode in args.modes.split(','):
+                for site in sites[:count]:
+                    site.reset_counts()
+                row = runners[mode](sites[:count], args, os.path.join(workdir, f"{mode}_{count}"))
+                row['max_in_flight_per_site'] = max(site.max_in_flight for site in sites[:count])
+                results['sites'][count][mode] = row
+                utilization = f"  workers {row['worker_utilization']:.0%} busy" if 'worker_utilization' in row else ''
+                print(f"🕷️ {count} sites {mode:<12} {row['pages']:>4} pages in {row['seconds']:>6.2f}s  "
+                      f"{row['pages_per_minute']:>7} pages/min  max in flight per site "
+                      f"{row['max_in_flight_per_site']}{utilization}")
+    finally:
+        for site in sites:
+            site.stop()
+        logging.disable(logging.NOTSET)
+        os.chdir(previous_dir)
+
+    path = write_results('orchestrator', results, args.output)
+    print(f"✅ Results written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
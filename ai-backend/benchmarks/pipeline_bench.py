@@ -0,0 +1,174 @@
+"""End-to-end UNYCompassBot.answer_question benchmark against local stand-ins
+
+Usage (from ai-backend/):
+    python -m benchmarks.pipeline_bench --concurrency 1,4,16 --llm-latency 0.4 --token-rate 80
+    python -m benchmarks.pipeline_bench --baseline benchmarks/results/pipeline-latest.json
+    python -m benchmarks.pipeline_bench --budget 3 --llm-tail-latency 10 --query-tail-latency 2 --tail-every 10
+"""
+import argparse
+import contextlib
+import io
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fakes import FakeChatOpenAI, HashingEmbedder, build_local_bot, load_questions
+from benchmarks.reporting import compare_results, peak_rss_mb, summarize, write_results
+
+
+def run_question(bot, question: str, request_id: str, budget_s=None):
+    """Answer one question inside its own trace and return (total_seconds, {stage: seconds})"""
+    from telemetry import end_trace, start_trace
+
+    trace = start_trace(request_id)
+    started = time.perf_counter()
+    try:
+        bot.answer_question(question, budget_s=budget_s)
+    finally:
+        total = time.perf_counter() - started
+        end_trace(trace)
+    return total, trace.stage_totals()
+
+
+def clear_caches():
+    from hunter_ai import UNYCompassBot, UNYCompassDatabase
+    UNYCompassDatabase.search.cache_clear()
+    UNYCompassDatabase.embed_query.cache_clear()
+    UNYCompassBot.detect_question_type.cache_clear()
+
+
+def resilience_counters():
+    """Hedging / deadline counters accumulated so far (see deadline.py)"""
+    from deadline import DEADLINE_EXCEEDED, HEDGE_WINS, HEDGES
+    from hunter_ai import DEGRADED_ANSWERS
+
+    counters = {
+        stage: {
+            'hedges': HEDGES.value(stage=stage),
+            'hedge_wins': HEDGE_WINS.value(stage=stage),
+            'deadline_exceeded': DEADLINE_EXCEEDED.value(stage=stage)
+        }
+        for stage in ('vector_query', 'llm')
+    }
+    counters['degraded_answers'] = DEGRADED_ANSWERS.value()
+    return counters
+
+
+def expansion_counters():
+    """Adaptive query expansion decisions and what the expansions added (see UNYCompassDatabase.search)"""
+    from hunter_ai import EXPANSION_DECISIONS, EXPANSION_NEW_RESULTS, EXPANSION_QUERIES
+
+    decisions = {'/'.join(value for _, value in key): count for _, key, count in EXPANSION_DECISIONS.samples()}
+    return {
+        'decisions': decisions,
+        'expanded_queries': EXPANSION_QUERIES.value(),
+        'results_only_from_expansions': EXPANSION_NEW_RESULTS.value()
+    }
+
+
+def run_level(bot, questions, concurrency: int, repeat: int, budget_s=None):
+    """Replay the question set `repeat` times with `concurrency` worker threads"""
+    workload = [(q, f"bench-{concurrency}-{r}-{i}") for r in range(repeat) for i, q in enumerate(questions)]
+    totals, stages, errors = [], {}, 0
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(run_question, bot, q, rid, budget_s) for q, rid in workload]
+        for future in futures:
+            try:
+                total, stage_totals = future.result()
+            except Exception as e:
+                errors += 1
+                print(f"❌ Benchmark request failed: {e}", file=sys.stderr)
+                continue
+            totals.append(total)
+            for stage, seconds in stage_totals.items():
+                stages.setdefault(stage, []).append(seconds)
+    wall = time.perf_counter() - started
+
+    return {
+        'concurrency': concurrency,
+        'requests': len(workload),
+        'errors': errors,
+        'wall_seconds': round(wall, 3),
+        'throughput_qps': round(len(totals) / wall, 2) if wall > 0 else None,
+        'latency': summarize(totals),
+        'stages': {stage: summarize(values) for stage, values in stages.items()}
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark UNYCompassBot.answer_question with local stand-ins")
+    parser.add_argument('--concurrency', default='1,4,16', help='Comma-separated worker counts')
+    parser.add_argument('--repeat', type=int, default=1, help='Replays of the question set per level')
+    parser.add_argument('--llm-latency', type=float, default=0.4, help='Fake LLM time to first token (s)')
+    parser.add_argument('--token-rate', type=float, default=80.0, help='Fake LLM output tokens per second')
+    parser.add_argument('--output-tokens', type=int, default=120)
+    parser.add_argument('--embed-latency', type=float, default=0.0, help='Extra seconds per encode() call')
+    parser.add_argument('--query-latency', type=float, default=0.02, help='Injected vector query latency (s)')
+    parser.add_argument('--query-tail-latency', type=float, default=0.0, help='Extra latency for straggler queries (s)')
+    parser.add_argument('--llm-tail-latency', type=float, default=0.0, help='Extra latency for straggler LLM calls (s)')
+    parser.add_argument('--tail-every', type=int, default=0, help='Every Nth query/LLM call is a straggler')
+    parser.add_argument('--budget', type=float, default=None, help='Per-request answer budget (s); default from env')
+    parser.add_argument('--query-expansion', choices=['always', 'adaptive', 'off'],
+                        help='Query expansion mode; default from QUERY_EXPANSION')
+    parser.add_argument('--expansion-min-score', type=float,
+                        help='Adaptive expansion score threshold; the hashing embedder scores lower than the real model')
+    parser.add_argument('--warm', action='store_true', help='Keep caches between levels instead of clearing them')
+    parser.add_argument('--output', help='Results JSON path (default: benchmarks/results/)')
+    parser.add_argument('--baseline', help='Previous results JSON to flag latency regressions against')
+    parser.add_argument('--verbose', action='store_true', help='Show the bot\'s own log output')
+    args = parser.parse_args(argv)
+
+    llm = FakeChatOpenAI(latency_s=args.llm_latency, tokens_per_second=args.token_rate,
+                         output_tokens=args.output_tokens, tail_latency_s=args.llm_tail_latency,
+                         tail_every=args.tail_every)
+    embedder = HashingEmbedder(latency_s=args.embed_latency)
+
+    build_started = time.perf_counter()
+    bot = build_local_bot(llm=llm, embedder=embedder, query_latency_s=args.query_latency,
+                          tail_latency_s=args.query_tail_latency, tail_every=args.tail_every)
+    build_seconds = time.perf_counter() - build_started
+    if args.query_expansion:
+        bot.vector_db.query_expansion = args.query_expansion
+    if args.expansion_min_score is not None:
+        bot.vector_db.expansion_min_score = args.expansion_min_score
+    questions = load_questions()
+
+    levels = []
+    for concurrency in [int(c) for c in args.concurrency.split(',') if c.strip()]:
+        if not args.warm:
+            clear_caches()
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else io.StringIO()):
+            level = run_level(bot, questions, concurrency, args.repeat, args.budget)
+        levels.append(level)
+        print(f"⚡ concurrency={concurrency:<3} throughput={level['throughput_qps']} q/s "
+              f"p50={level['latency'].get('p50_ms')}ms p95={level['latency'].get('p95_ms')}ms "
+              f"p99={level['latency'].get('p99_ms')}ms errors={level['errors']}")
+
+    results = {
+        'config': vars(args),
+        'questions': len(questions),
+        'index_build_seconds': round(build_seconds, 3),
+        'llm_calls': llm.calls,
+        'levels': levels,
+        'resilience': resilience_counters(),
+        'query_expansion': expansion_counters(),
+        'peak_rss_mb': peak_rss_mb()
+    }
+    path = write_results('pipeline', results, args.output)
+    print(f"✅ Results written to {path} (peak RSS {results['peak_rss_mb']} MB)")
+
+    if args.baseline:
+        regressions = compare_results(results, args.baseline)
+        if regressions:
+            print("⚠️ Latency regressions vs baseline:")
+            for line in regressions:
+                print(f"   • {line}")
+            return 1
+        print("✅ No latency regressions vs baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
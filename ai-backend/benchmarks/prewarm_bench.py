@@ -0,0 +1,90 @@
+"""Post-deploy latency: cold caches vs caches prewarmed from the query log, against steady state
+
+Replays a skewed workload of the fixture questions (a few popular questions asked often, like real
+traffic) through answer_question with the query log on, then simulates a deploy by clearing every
+cache and replays it again, once cold and once after prewarm_from_log(). Reports answer and
+retrieval latency for the first requests after the "deploy" and for steady state.
+
+Usage (from ai-backend/):
+    python -m benchmarks.prewarm_bench
+    python -m benchmarks.prewarm_bench --requests 200 --top-n 10 --embed-latency 0.03
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+
+from benchmarks.fakes import FakeChatOpenAI, HashingEmbedder, build_local_bot, load_questions
+from benchmarks.pipeline_bench import clear_caches, run_question
+from benchmarks.reporting import summarize, write_results
+
+
+def workload(questions, count, seed):
+    """Zipf-like mix: question i is asked with weight 1/(i+1)"""
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) for i in range(len(questions))]
+    return rng.choices(questions, weights=weights, k=count)
+
+
+def replay(bot, requests, label):
+    totals, retrieval = [], []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i, question in enumerate(requests):
+            total, stages = run_question(bot, question, f"{label}-{i}")
+            totals.append(total)
+            retrieval.append(stages.get('retrieval', 0.0))
+    return {'answer': summarize(totals), 'retrieval': summarize(retrieval)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure post-deploy latency with and without cache prewarming")
+    parser.add_argument('--requests', type=int, default=150, help='Requests per phase')
+    parser.add_argument('--top-n', type=int, default=50, help='Questions to prewarm (PREWARM_TOP_N default)')
+    parser.add_argument('--embed-latency', type=float, default=0.02, help='Seconds per encode() call')
+    parser.add_argument('--query-latency', type=float, default=0.02, help='Injected vector query latency (s)')
+    parser.add_argument('--llm-latency', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', help='Results JSON path (default: benchmarks/results/)')
+    args = parser.parse_args(argv)
+
+    from query_log import QueryLog
+
+    log_path = os.path.join(tempfile.mkdtemp(prefix="prewarm_bench_"), "query_log.ndjson")
+    # Every request is logged: a short history, sampled at the 10% default, would rank too few questions
+    query_log = QueryLog(log_path, sample_rate=1.0)
+    bot = build_local_bot(llm=FakeChatOpenAI(latency_s=args.llm_latency, tokens_per_second=2000),
+                          embedder=HashingEmbedder(latency_s=args.embed_latency),
+                          query_latency_s=args.query_latency, query_log=query_log)
+    questions = load_questions()
+
+    results = {'config': vars(args)}
+    # Traffic before the deploy: fills the caches and the query log
+    clear_caches()
+    replay(bot, workload(questions, args.requests, args.seed), "history")
+    results['steady_state'] = replay(bot, workload(questions, args.requests, args.seed + 1), "steady")
+    query_log.close()
+
+    after_deploy = workload(questions, args.requests, args.seed + 2)
+    clear_caches()
+    results['cold'] = replay(bot, after_deploy, "cold")
+
+    clear_caches()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results['prewarm'] = bot.prewarm_from_log(args.top_n)
+    results['prewarmed'] = replay(bot, after_deploy, "prewarmed")
+
+    for phase in ('steady_state', 'cold', 'prewarmed'):
+        row = results[phase]
+        print(f"⚡ {phase:<12} answer mean={row['answer']['mean_ms']}ms p95={row['answer']['p95_ms']}ms  "
+              f"retrieval mean={row['retrieval']['mean_ms']}ms p95={row['retrieval']['p95_ms']}ms")
+    print(f"🔥 Prewarmed {results['prewarm']['questions']} questions in {results['prewarm']['seconds']}s")
+    path = write_results('prewarm', results, args.output)
+    print(f"✅ Results written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Cost of the /debug/profile sampler on live traffic
+
+Drives flask_api (with the stub backends, benchmarks/stub_app.py) from --concurrency client threads
+for --seconds per run, first with no profiler, then with /debug/profile sampling every
+--intervals milliseconds. Reports throughput and latency of the ask requests for each, and the
+profile's sample counts and leaf categories. The "off" run is the server as deployed: with no
+profile running there are no hooks, so it measures the baseline.
+
+Usage (from ai-backend/):
+    python -m benchmarks.profiler_bench
+    python -m benchmarks.profiler_bench --concurrency 8 --seconds 10 --intervals 1,5,20
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+
+from benchmarks.reporting import summarize, write_results
+
+TOKEN = "profiler-bench"
+
+
+def drive(client_factory, questions, concurrency: int, seconds: float):
+    """Closed-loop ask traffic; returns per-request latencies"""
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(number):
+        client = client_factory()
+        i = number
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            client.post('/api/chatbot/ask', json={'message': f"{questions[i % len(questions)]} #{i}",
+                                                  'ui_session_id': number})
+            with lock:
+                latencies.append(time.perf_counter() - started)
+            i += concurrency
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput and latency with and without the sampling profiler")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5.0, help='Length of each run')
+    parser.add_argument('--intervals', default='1,5', help='Comma-separated sampling intervals (ms)')
+    parser.add_argument('--llm-latency', type=float, default=0.05, help='Stub LLM latency (s)')
+    parser.add_argument('--output', help='Results JSON path (default: benchmarks/results/)')
+    args = parser.parse_args(argv)
+
+    os.environ["DEBUG_TOKEN"] = TOKEN
+    os.environ.setdefault("STUB_LLM_LATENCY", str(args.llm_latency))
+    os.environ.setdefault("STUB_OUTPUT_TOKENS", "10")
+    os.environ.setdefault("ADMISSION_CONTROL", "false")
+    with contextlib.redirect_stdout(io.StringIO()):
+        from benchmarks.stub_app import app
+    from benchmarks.fakes import load_questions
+
+    questions = load_questions()
+    runs = {'off': None, **{f"{interval}ms": float(interval) for interval in args.intervals.split(',') if interval.strip()}}
+    results = {'config': vars(args), 'runs': {}}
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Warm the caches so the first measured run isn't penalised
+        drive(app.test_client, questions, args.concurrency, args.seconds)
+    for name, interval in runs.items():
+        profile = {}
+
+        def profile_traffic():
+            response = app.test_client().get(
+                f"/debug/profile?seconds={args.seconds}&interval_ms={interval}&format=json",
+                headers={'X-Debug-Token': TOKEN})
+            profile.update(response.get_json())
+
+        profiler = threading.Thread(target=profile_traffic) if interval else None
+        with contextlib.redirect_stdout(io.StringIO()):
+            if profiler:
+                profiler.start()
+            latencies = drive(app.test_client, questions, args.concurrency, args.seconds)
+            if profiler:
+                profiler.join()
+        row = {'requests': len(latencies), 'rps': round(len(latencies) / args.seconds, 1),
+               'latency': summarize(latencies)}
+        if profile:
+            row['profile'] = {key: profile[key] for key in ('samples', 'thread_samples', 'leaf_categories',
+                                                            'sampler_lag_ms')}
+        results['runs'][name] = row
+        print(f"🔬 profiler {name:<6} {row['rps']:>7} req/s  p50 {row['latency']['p50_ms']:>7}ms  "
+              f"p99 {row['latency']['p99_ms']:>7}ms" +
+              (f"  ({profile['thread_samples']} thread samples)" if profile else ""))
+
+    path = write_results('profiler', results, args.output)
+    print(f"✅ Results written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
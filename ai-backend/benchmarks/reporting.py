@@ -0,0 +1,96 @@
+import json
+import math
+import resource
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks import RESULTS_DIR
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0-100)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(values: List[float], scale: float = 1000.0) -> Dict:
+    """p50/p95/p99/mean/max of a list of seconds, reported in milliseconds by default"""
+    if not values:
+        return {'count': 0}
+    return {
+        'count': len(values),
+        'p50_ms': round(percentile(values, 50) * scale, 2),
+        'p95_ms': round(percentile(values, 95) * scale, 2),
+        'p99_ms': round(percentile(values, 99) * scale, 2),
+        'mean_ms': round(sum(values) / len(values) * scale, 2),
+        'max_ms': round(max(values) * scale, 2)
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return round(peak / (1024 * 1024), 1)
+    return round(peak / 1024, 1)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=Path(__file__).parent, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def write_results(name: str, results: Dict, output: Optional[str] = None) -> Path:
+    """Write results to benchmarks/results/<name>-<commit>.json and <name>-latest.json"""
+    commit = git_commit()
+    results = dict(results)
+    results.setdefault('benchmark', name)
+    results.setdefault('commit', commit)
+    results.setdefault('timestamp', datetime.now().isoformat())
+    results.setdefault('python', sys.version.split()[0])
+
+    if output:
+        paths = [Path(output)]
+    else:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        paths = [RESULTS_DIR / f"{name}-{commit}.json", RESULTS_DIR / f"{name}-latest.json"]
+
+    for path in paths:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return paths[0]
+
+
+def compare_results(current: Dict, baseline_path: str, threshold: float = 0.10) -> List[str]:
+    """List latency metrics that regressed by more than `threshold` versus a baseline results file"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = []
+
+    def walk(cur, base, path):
+        if isinstance(cur, dict) and isinstance(base, dict):
+            for key, value in cur.items():
+                if key in base:
+                    walk(value, base[key], f"{path}.{key}" if path else key)
+        elif isinstance(cur, list) and isinstance(base, list):
+            for i, (cur_item, base_item) in enumerate(zip(cur, base)):
+                walk(cur_item, base_item, f"{path}[{i}]")
+        elif isinstance(cur, (int, float)) and isinstance(base, (int, float)):
+            if path.endswith('_ms') and base > 0 and (cur - base) / base > threshold:
+                regressions.append(f"{path}: {base:.2f} -> {cur:.2f} ms (+{(cur - base) / base * 100:.0f}%)")
+
+    walk(current, baseline, "")
+    return regressions
@@ -0,0 +1,133 @@
+"""Reduced-precision LocalVectorIndex storage: float16 / int8 / PCA first pass plus float32 rescoring
+
+Loads a set of vectors into one namespace, then for each storage mode measures the first-pass
+memory (the codes kept resident, against the float32 matrix), the time to encode them, query
+latency, and recall@k against exact float32 search on the same vectors at each --rescore factor
+(1 means no rescoring: the codes alone pick the top k). Modes are "float32" (the exact baseline),
+"float16", "int8", "pca<d>" and "pca<d>+int8" / "pca<d>+float16".
+
+With --snapshot the vectors are a corpus snapshot's real all-mpnet-base-v2 embeddings (see
+snapshot.py) and the queries are held-out rows of it; otherwise they are clustered synthetic
+vectors as in ann_bench.py. --spectrum-decay makes the synthetic topics anisotropic, like sentence
+embeddings, whose variance is concentrated in their leading principal directions.
+
+Usage (from ai-backend/):
+    python -m benchmarks.storage_bench
+    python -m benchmarks.storage_bench --size 1000000 --modes float32,int8,pca256+int8 --rescore 1,4,10
+    python -m benchmarks.storage_bench --snapshot chatbot/corpus.snapshot --queries 200
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.ann_bench import draw, recall
+from benchmarks.reporting import peak_rss_mb, summarize, write_results
+
+NAMESPACE = "bench"
+
+
+def parse_mode(mode: str):
+    """'pca256+int8' -> {'storage': 'int8', 'pca_dimension': 256}"""
+    options = {'storage': "float32", 'pca_dimension': None}
+    for part in mode.split('+'):
+        if part.startswith('pca'):
+            options['pca_dimension'] = int(part[3:])
+        else:
+            options['storage'] = part
+    return options
+
+
+def load_vectors(args, rng):
+    """(matrix, queries) from a snapshot or synthetic topics"""
+    if args.snapshot:
+        from snapshot import Snapshot
+
+        vectors = np.asarray(Snapshot(args.snapshot).vectors, dtype=np.float32)
+        held_out = rng.choice(len(vectors), size=min(args.queries, len(vectors) // 10), replace=False)
+        keep = np.ones(len(vectors), dtype=bool)
+        keep[held_out] = False
+        return vectors[keep], vectors[held_out]
+    scale = (1.0 + np.arange(args.dimension, dtype=np.float32)) ** -args.spectrum_decay
+    centres = rng.standard_normal((max(1, args.size // 100), args.dimension), dtype=np.float32) * scale
+    centres /= np.linalg.norm(centres, axis=1, keepdims=True)
+    return draw(centres, args.size, rng), draw(centres, args.queries, rng)
+
+
+def time_queries(index, queries, k: int, **kwargs):
+    latencies, results = [], []
+    for query in queries:
+        started = time.perf_counter()
+        matches = index.query(query, top_k=k, namespace=NAMESPACE, **kwargs)['matches']
+        latencies.append(time.perf_counter() - started)
+        results.append({m['id'] for m in matches})
+    return latencies, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory, latency and recall of reduced-precision vector storage")
+    parser.add_argument('--size', type=int, default=200000, help='Synthetic vectors to index')
+    parser.add_argument('--dimension', type=int, default=768)
+    parser.add_argument('--snapshot', help='Use the embeddings in this corpus snapshot instead of synthetic vectors')
+    parser.add_argument('--spectrum-decay', type=float, default=0.0,
+                        help='Synthetic topic centres scale dimension i by (1+i)^-decay (0: isotropic)')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=8, help='top_k (recall@k against exact float32 search)')
+    parser.add_argument('--modes', default='float32,float16,int8,pca256,pca256+int8,pca128+int8')
+    parser.add_argument('--rescore', default='1,4,10', help='Comma-separated rescore factors (candidates = factor * k)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Results JSON path (default: benchmarks/results/)')
+    args = parser.parse_args(argv)
+    rescore_factors = [int(n) for n in args.rescore.split(',') if n.strip()]
+
+    from local_index import LocalVectorIndex
+
+    rng = np.random.default_rng(args.seed)
+    matrix, queries = load_vectors(args, rng)
+    size, dimension = matrix.shape
+    ids = [f"v{i}" for i in range(size)]
+    full_mb = matrix.nbytes / 1e6
+    print(f"📦 {size:,} x {dimension} vectors ({full_mb:.0f} MB as float32), {len(queries)} queries")
+
+    results = {'config': vars(args), 'vectors': size, 'dimension': dimension, 'float32_mb': round(full_mb, 1),
+               'modes': {}}
+    exact_index = LocalVectorIndex(dimension=dimension)
+    exact_index.attach(NAMESPACE, ids, matrix, [{}] * size)
+    exact_latency, exact = time_queries(exact_index, queries, args.k)
+    baseline_p50 = summarize(exact_latency)['p50_ms']
+
+    for mode in args.modes.split(','):
+        options = parse_mode(mode)
+        index = LocalVectorIndex(dimension=dimension, compress_min_vectors=1, **options)
+        index.attach(NAMESPACE, ids, matrix, [{}] * size)
+        started = time.perf_counter()
+        index.build_ann(NAMESPACE)
+        encode_seconds = time.perf_counter() - started
+        codes = index._namespaces[NAMESPACE]['codes']
+        first_pass_mb = codes.nbytes / 1e6 if codes is not None else full_mb
+        row = {'first_pass_mb': round(first_pass_mb, 1), 'memory_saved': round(1 - first_pass_mb / full_mb, 3),
+               'encode_seconds': round(encode_seconds, 2), 'rescore': {}}
+        print(f"🗜️ {mode:<14} first pass {first_pass_mb:>8.1f} MB ({row['memory_saved']:.0%} saved), "
+              f"encoded in {encode_seconds:.1f}s")
+        for factor in (rescore_factors if index.compressed else [1]):
+            latency, approximate = time_queries(index, queries, args.k, rescore=factor)
+            stats = summarize(latency)
+            row['rescore'][factor] = {
+                'latency': stats,
+                'speedup': round(baseline_p50 / stats['p50_ms'], 2) if stats['p50_ms'] else None,
+                f'recall@{args.k}': recall(approximate, exact, args.k),
+            }
+            print(f"   rescore x{factor:<3} recall@{args.k} {row['rescore'][factor][f'recall@{args.k}']:.3f}  "
+                  f"p50 {stats['p50_ms']:>8}ms  p95 {stats['p95_ms']:>8}ms  "
+                  f"({row['rescore'][factor]['speedup']}x float32)")
+        results['modes'][mode] = row
+
+    results['peak_rss_mb'] = peak_rss_mb()
+    path = write_results('storage', results, args.output)
+    print(f"✅ Results written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
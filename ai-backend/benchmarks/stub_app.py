@@ -0,0 +1,68 @@
+"""flask_api.app wired to local stand-ins (fake LLM, hashing embedder, LocalVectorIndex)
+
+Importing this module patches hunter_ai before flask_api runs its startup initialisation, so it
+works as a WSGI target for any server:
+    python -m benchmarks.stub_app --port 5001               # threaded Werkzeug server (development mode)
+    python api/serve.py --app benchmarks.stub_app:app       # production launcher (api/gunicorn.conf.py)
+    gunicorn -w 4 --preload benchmarks.stub_app:app         # pre-fork
+    uvicorn benchmarks.stub_app:asgi_app --workers 4        # ASGI (needs asgiref + uvicorn)
+
+Stub latencies come from STUB_LLM_LATENCY, STUB_TOKEN_RATE, STUB_OUTPUT_TOKENS and STUB_QUERY_LATENCY;
+STUB_LLM_CAPACITY caps concurrent LLM calls like an upstream rate limit; STUB_MODEL_MB adds resident ballast standing in for the embedding model's weights. Questions are
+logged (and prewarmed at startup) only with QUERY_LOG=true and QUERY_LOG_PATH set.
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import benchmarks  # noqa: F401  (puts the chatbot directory on sys.path)
+import hunter_ai
+from benchmarks.fakes import FakeChatOpenAI, HashingEmbedder, build_local_bot
+from query_log import QueryLog
+
+API_DIR = Path(__file__).parent.parent / "api"
+if str(API_DIR) not in sys.path:
+    sys.path.append(str(API_DIR))
+
+
+def create_stub_bot():
+    llm = FakeChatOpenAI(
+        latency_s=float(os.getenv("STUB_LLM_LATENCY", "0.4")),
+        tokens_per_second=float(os.getenv("STUB_TOKEN_RATE", "80")),
+        output_tokens=int(os.getenv("STUB_OUTPUT_TOKENS", "120")),
+        jitter=float(os.getenv("STUB_LLM_JITTER", "0.2")),
+        capacity=int(os.getenv("STUB_LLM_CAPACITY", "0"))
+    )
+    return build_local_bot(
+        llm=llm,
+        embedder=HashingEmbedder(latency_s=float(os.getenv("STUB_EMBED_LATENCY", "0.005")),
+                                 weights_mb=float(os.getenv("STUB_MODEL_MB", "0"))),
+        query_latency_s=float(os.getenv("STUB_QUERY_LATENCY", "0.03")),
+        query_log=QueryLog.from_env()  # only with QUERY_LOG=true and QUERY_LOG_PATH set
+    )
+
+
+_stub_bot = create_stub_bot()
+
+# flask_api constructs UNYCompassDatabase() and UNYCompassBot(db) at import time
+hunter_ai.UNYCompassDatabase = lambda *args, **kwargs: _stub_bot.vector_db
+hunter_ai.UNYCompassBot = lambda *args, **kwargs: _stub_bot
+
+import flask_api  # noqa: E402
+
+app = flask_api.app
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+    asgi_app = WsgiToAsgi(app)
+except ImportError:
+    asgi_app = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve flask_api.app with stubbed backends")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5001)
+    args = parser.parse_args()
+    app.run(host=args.host, port=args.port, debug=False, threaded=True)
@@ -0,0 +1,186 @@
+"""Admission control for the ask endpoints: a concurrency limit with a bounded, per-session fair queue
+
+At most `max_concurrent` questions are answered at once. Requests beyond that wait in a queue
+served round-robin across sessions, so one chatty session cannot starve the others. A request
+is shed with Overloaded (a fast 503 + Retry-After in the API) instead of queueing when:
+    - the queue is full (`max_queue`) or its session already has `max_queued_per_session` waiting
+    - the expected wait, from the recent answer time and the queue ahead of it, exceeds `queue_budget_s`
+    - it has actually waited `queue_budget_s` without getting a slot
+
+Limits are per process: under gunicorn each worker admits `max_concurrent` on its own.
+"""
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Hashable, Optional
+
+from telemetry import REGISTRY, current_trace
+
+QUEUE_TIME = REGISTRY.histogram(
+    "unycompass_admission_queue_seconds",
+    "Time admitted requests waited for an answer slot"
+)
+REJECTED = REGISTRY.counter(
+    "unycompass_admission_rejected_total",
+    "Requests shed by admission control, by reason (queue_full, session_queue_full, over_budget, timed_out)"
+)
+IN_FLIGHT = REGISTRY.gauge("unycompass_admission_in_flight", "Questions currently holding an answer slot")
+QUEUED = REGISTRY.gauge("unycompass_admission_queued", "Requests waiting for an answer slot")
+
+
+class Overloaded(Exception):
+    """Request shed by admission control; retry_after is a whole number of seconds"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Server overloaded ({reason}), retry in {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    def __init__(self, session: Hashable):
+        self.session = session
+        self.granted = False
+        self.event = threading.Event()
+
+
+class AdmissionController:
+    """Concurrency limiter with a bounded wait queue, round-robin across sessions"""
+
+    def __init__(self, max_concurrent: int = 6, max_queue: int = 8, queue_budget_s: float = 10.0,
+                 max_queued_per_session: int = 2, initial_service_s: Optional[float] = None):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_budget_s = queue_budget_s
+        self.max_queued_per_session = max(1, max_queued_per_session)
+        self._service_s = initial_service_s  # EWMA of how long a request holds its slot
+        self._in_flight = 0
+        self._queued = 0
+        self._sessions = OrderedDict()  # session -> deque of waiters; iteration order is the round-robin
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["AdmissionController"]:
+        """ADMISSION_CONTROL=false disables; ASK_MAX_CONCURRENCY, ASK_MAX_QUEUE,
+        ASK_QUEUE_BUDGET_SECONDS and ASK_MAX_QUEUED_PER_SESSION configure"""
+        if os.getenv("ADMISSION_CONTROL", "true").lower() != "true":
+            return None
+        return cls(max_concurrent=int(os.getenv("ASK_MAX_CONCURRENCY", "6")),
+                   max_queue=int(os.getenv("ASK_MAX_QUEUE", "8")),
+                   queue_budget_s=float(os.getenv("ASK_QUEUE_BUDGET_SECONDS", "10")),
+                   max_queued_per_session=int(os.getenv("ASK_MAX_QUEUED_PER_SESSION", "2")))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'in_flight': self._in_flight,
+                'queued': self._queued,
+                'sessions_waiting': len(self._sessions),
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'queue_budget_s': self.queue_budget_s,
+                'service_time_s': round(self._service_s, 3) if self._service_s is not None else None,
+            }
+
+    def _expected_wait(self, position: int) -> float:
+        """Seconds until the request at queue `position` (0 = next) gets a slot; caller holds the lock"""
+        if self._service_s is None:
+            return 0.0
+        # A slot frees every service_s / max_concurrent on average
+        return (position + 1) * self._service_s / self.max_concurrent
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self._expected_wait(self._queued) or 1))
+
+    def _reject(self, reason: str, retry_after: int):
+        REJECTED.inc(reason=reason)
+        raise Overloaded(reason, retry_after)
+
+    @contextmanager
+    def admit(self, session: Hashable = None, retry_until: Optional[float] = None):
+        """Hold an answer slot for the duration of the block; raises Overloaded when shedding
+
+        With `retry_until` (a time.perf_counter() value) a shed request sleeps for its Retry-After
+        and tries again until then, for background work such as batch questions that should give
+        way to interactive requests rather than fail.
+        """
+        queued_at = time.perf_counter()
+        while True:
+            try:
+                attempt_at = time.perf_counter()
+                waiter = self._acquire(session)
+                if waiter is not None:
+                    self._wait(waiter, attempt_at)
+                break
+            except Overloaded as e:
+                if retry_until is None or time.perf_counter() + e.retry_after > retry_until:
+                    raise
+                time.sleep(e.retry_after)
+        waited = time.perf_counter() - queued_at
+        QUEUE_TIME.observe(waited)
+        trace = current_trace()
+        if trace is not None and waiter is not None:
+            trace.add_span("queue", queued_at, waited)
+
+        IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            yield waited
+        finally:
+            IN_FLIGHT.dec()
+            self._release(time.perf_counter() - started)
+
+    def _acquire(self, session) -> Optional[_Waiter]:
+        """Take a free slot (returns None) or join the queue (returns the waiter)"""
+        with self._lock:
+            if self._in_flight < self.max_concurrent and not self._queued:
+                self._in_flight += 1
+                return None
+            if self._queued >= self.max_queue:
+                self._reject("queue_full", self._retry_after())
+            waiting = self._sessions.get(session)
+            if waiting is not None and len(waiting) >= self.max_queued_per_session:
+                self._reject("session_queue_full", self._retry_after())
+            if self._expected_wait(self._queued) > self.queue_budget_s:
+                self._reject("over_budget", self._retry_after())
+
+            waiter = _Waiter(session)
+            self._sessions.setdefault(session, deque()).append(waiter)
+            self._queued += 1
+            QUEUED.inc()
+            return waiter
+
+    def _wait(self, waiter: _Waiter, queued_at: float):
+        remaining = self.queue_budget_s - (time.perf_counter() - queued_at)
+        if waiter.event.wait(max(0.0, remaining)):
+            return
+        with self._lock:
+            if waiter.granted:
+                return  # slot handed over just as the wait timed out
+            waiting = self._sessions[waiter.session]
+            waiting.remove(waiter)
+            if not waiting:
+                del self._sessions[waiter.session]
+            self._queued -= 1
+            QUEUED.dec()
+            retry_after = self._retry_after()
+        self._reject("timed_out", retry_after)
+
+    def _release(self, held_s: float):
+        with self._lock:
+            self._service_s = held_s if self._service_s is None else 0.8 * self._service_s + 0.2 * held_s
+            if not self._sessions:
+                self._in_flight -= 1
+                return
+            # Hand the slot straight to the next session in round-robin order
+            session, waiting = self._sessions.popitem(last=False)
+            waiter = waiting.popleft()
+            if waiting:
+                self._sessions[session] = waiting
+            self._queued -= 1
+            QUEUED.dec()
+            waiter.granted = True
+            waiter.event.set()
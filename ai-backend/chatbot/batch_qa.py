@@ -0,0 +1,107 @@
+"""Answer a file of questions in bulk, for advisor review and regression checks
+
+Questions come from a .txt file (one per line), a .json list (or {"questions": [...]}) or a
+.jsonl file with a "question" field per line. Answers are written as NDJSON, one line per
+question as it completes, with per-item timings (see UNYCompassBot.answer_batch).
+
+Usage:
+    python batch_qa.py questions.txt --output answers.ndjson
+    python batch_qa.py questions.json --concurrency 16 --budget 30
+    UNYCOMPASS_SNAPSHOT=../docs/hunter.snapshot python batch_qa.py questions.txt --stub-llm   # no OpenAI calls
+"""
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+
+class StubMessage:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class StubLLM:
+    """Deterministic stand-in for ChatOpenAI: echoes a digest of the prompt after latency_s"""
+
+    def __init__(self, latency_s: float = 0.0):
+        self.latency_s = latency_s
+
+    def invoke(self, prompt):
+        if self.latency_s > 0:
+            time.sleep(self.latency_s)
+        prompt = str(prompt)
+        digest = hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:8]
+        return StubMessage(f"[stub-{digest}] {len(prompt)} prompt chars")
+
+
+def load_questions(path) -> List[str]:
+    path = Path(path)
+    text = path.read_text(encoding='utf-8')
+    if path.suffix == '.json':
+        data = json.loads(text)
+        questions = data.get('questions', []) if isinstance(data, dict) else data
+    elif path.suffix in ('.jsonl', '.ndjson'):
+        questions = [json.loads(line)['question'] for line in text.splitlines() if line.strip()]
+    else:
+        questions = [line.strip() for line in text.splitlines() if line.strip() and not line.startswith('#')]
+    return [str(question) for question in questions]
+
+
+def run_batch(bot, questions: List[str], output, concurrency=None, budget_s=None, batch_size: int = 32) -> int:
+    """Write one NDJSON line per answer to `output`; returns the number of failed questions"""
+    failed = 0
+    started = time.perf_counter()
+    for done, result in enumerate(bot.answer_batch(questions, max_concurrency=concurrency, budget_s=budget_s,
+                                                   batch_size=batch_size), 1):
+        output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        output.flush()
+        if 'error' in result:
+            failed += 1
+        if done % 10 == 0 or done == len(questions):
+            print(f"📦 {done}/{len(questions)} answered ({time.perf_counter() - started:.1f}s)", file=sys.stderr)
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Answer a file of questions with UNYCompassBot")
+    parser.add_argument('questions', help='.txt (one per line), .json list or .jsonl with a "question" field')
+    parser.add_argument('--output', help='NDJSON output path (default: stdout)')
+    parser.add_argument('--concurrency', type=int, help='Concurrent LLM calls (default: BATCH_LLM_CONCURRENCY or 8)')
+    parser.add_argument('--budget', type=float, help='Per-question answer budget in seconds')
+    parser.add_argument('--batch-size', type=int, default=32, help='Questions embedded and retrieved together')
+    parser.add_argument('--stub-llm', action='store_true', help='Answer with a deterministic stub instead of OpenAI')
+    parser.add_argument('--stub-latency', type=float, default=0.0, help='Seconds per stub LLM call')
+    args = parser.parse_args(argv)
+
+    questions = load_questions(args.questions)
+    if not questions:
+        print(f"❌ No questions in {args.questions}", file=sys.stderr)
+        return 1
+
+    from hunter_ai import UNYCompassBot, UNYCompassDatabase
+
+    # The database and bot log to stdout; keep it clean when answers go there
+    log_target = sys.stderr if not args.output else sys.stdout
+    stdout = sys.stdout
+    sys.stdout = log_target
+    try:
+        db = UNYCompassDatabase()
+        bot = UNYCompassBot(db, llm=StubLLM(args.stub_latency) if args.stub_llm else None)
+        output = open(args.output, 'w', encoding='utf-8') if args.output else stdout
+        try:
+            failed = run_batch(bot, questions, output, args.concurrency, args.budget, args.batch_size)
+        finally:
+            if args.output:
+                output.close()
+    finally:
+        sys.stdout = stdout
+
+    print(f"✅ {len(questions) - failed}/{len(questions)} questions answered", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+import os
+import re
+from collections import deque
+from typing import Callable, List, Optional, Sequence
+
+DEFAULT_SEPARATORS = ["\n\n--- PAGE:", "\n\n", "\n", ". ", " ", ""]
+
+_WORD_PIECE = re.compile(r"\w+|[^\w\s]")
+
+
+def approximate_token_length(text: str) -> int:
+    """Cheap token estimate (words + punctuation) for token-aware sizing without a tokenizer"""
+    return len(_WORD_PIECE.findall(text))
+
+
+class TokenLength:
+    """Picklable length function counting tokens with a HuggingFace tokenizer"""
+
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+
+    def __call__(self, text: str) -> int:
+        return len(self.tokenizer.encode(text, add_special_tokens=False))
+
+
+class RecursiveChunker:
+    """Dependency-free drop-in for LangChain's RecursiveCharacterTextSplitter
+
+    Produces the same chunk boundaries as RecursiveCharacterTextSplitter(keep_separator=True,
+    strip_whitespace=True): split on the first separator present in the text (keeping the
+    separator at the start of the following piece), recurse into pieces that are still too
+    long, then greedily merge pieces back up to chunk_size with chunk_overlap carried over.
+
+    length_unit="tokens" sizes chunks in tokens instead of characters, using `tokenizer`
+    (e.g. SentenceTransformer.tokenizer) when given and a word/punctuation estimate otherwise.
+    """
+
+    def __init__(self, chunk_size: int = 800, chunk_overlap: int = 100,
+                 separators: Optional[Sequence[str]] = None, length_function: Optional[Callable[[str], int]] = None,
+                 length_unit: str = "chars", tokenizer=None):
+        if chunk_overlap > chunk_size:
+            raise ValueError(f"chunk_overlap ({chunk_overlap}) must not exceed chunk_size ({chunk_size})")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = list(separators or DEFAULT_SEPARATORS)
+
+        if length_function is None:
+            if length_unit == "tokens":
+                length_function = TokenLength(tokenizer) if tokenizer is not None else approximate_token_length
+            elif length_unit == "chars":
+                length_function = len
+            else:
+                raise ValueError(f"Unknown length_unit '{length_unit}' (use 'chars' or 'tokens')")
+        self.length_function = length_function
+
+        # Pre-compile once instead of per recursion level
+        self._patterns = {sep: re.compile(f"({re.escape(sep)})") for sep in self.separators if sep}
+
+    def split_text(self, text: str) -> List[str]:
+        return self._split(text, self.separators)
+
+    def _split_keep_separator(self, text: str, separator: str) -> List[str]:
+        if not separator:
+            return list(text)
+        parts = self._patterns[separator].split(text)
+        # parts = [text0, sep, text1, sep, text2, ...] -> [text0, sep+text1, sep+text2, ...]
+        splits = [parts[0]] + [parts[i] + parts[i + 1] for i in range(1, len(parts) - 1, 2)]
+        return [s for s in splits if s != ""]
+
+    def _split(self, text: str, separators: List[str]) -> List[str]:
+        final_chunks = []
+        separator = separators[-1]
+        remaining = []
+        for i, candidate in enumerate(separators):
+            if candidate == "":
+                separator = candidate
+                break
+            if candidate in text:
+                separator = candidate
+                remaining = separators[i + 1:]
+                break
+
+        length = self.length_function
+        good_splits = []
+        for piece in self._split_keep_separator(text, separator):
+            if length(piece) < self.chunk_size:
+                good_splits.append(piece)
+                continue
+            if good_splits:
+                final_chunks.extend(self._merge(good_splits))
+                good_splits = []
+            if not remaining:
+                final_chunks.append(piece)
+            else:
+                final_chunks.extend(self._split(piece, remaining))
+        if good_splits:
+            final_chunks.extend(self._merge(good_splits))
+        return final_chunks
+
+    def _merge(self, splits: List[str]) -> List[str]:
+        """Greedy merge up to chunk_size, starting each new chunk with <= chunk_overlap of the previous one"""
+        # Separators are kept on the pieces themselves, so pieces are joined with ""
+        length = self.length_function
+        docs = []
+        current = deque()
+        lengths = deque()
+        total = 0
+        for piece in splits:
+            piece_length = length(piece)
+            if total + piece_length > self.chunk_size and current:
+                doc = "".join(current).strip()
+                if doc:
+                    docs.append(doc)
+                while total > self.chunk_overlap or (total + piece_length > self.chunk_size and total > 0):
+                    total -= lengths.popleft()
+                    current.popleft()
+            current.append(piece)
+            lengths.append(piece_length)
+            total += piece_length
+        doc = "".join(current).strip()
+        if doc:
+            docs.append(doc)
+        return docs
+
+    def split_pages(self, pages: Sequence[str], processes: Optional[int] = None,
+                    min_parallel_chars: int = 2_000_000) -> List[List[str]]:
+        """Chunk many pages, in a process pool when asked to and the corpus is big enough to amortise worker startup
+
+        processes defaults to CHUNK_PROCESSES, else 1 (serial): the pool is for offline indexing runs.
+        Workers are spawned, not forked, since callers such as the API server's background init
+        have other threads (and torch's) running.
+        """
+        if processes is None:
+            processes = int(os.getenv("CHUNK_PROCESSES", "1"))
+        total_chars = sum(len(page) for page in pages)
+        if processes <= 1 or len(pages) < 2 or total_chars < min_parallel_chars:
+            return [self.split_text(page) for page in pages]
+
+        # multiprocessing is slow to import; only load it when used
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        chunksize = max(1, len(pages) // (processes * 8))
+        with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(self,)) as pool:
+            return list(pool.map(_split_in_worker, pages, chunksize=chunksize))
+
+
+_worker_chunker = None
+
+
+def _init_worker(chunker: RecursiveChunker):
+    global _worker_chunker
+    _worker_chunker = chunker
+
+
+def _split_in_worker(page: str) -> List[str]:
+    return _worker_chunker.split_text(page)
@@ -0,0 +1,244 @@
+"""Compact dedup state for large crawls
+
+FingerprintSet stores 64-bit hashes of its keys in a flat open-addressing table (8 bytes per
+slot) instead of Python string objects, and BloomFilter answers membership in a fixed bit budget
+at a configurable false-positive rate. Both serialize to bytes so a crawl can checkpoint them.
+"""
+import hashlib
+import math
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Union
+
+Key = Union[str, bytes, int]
+
+_SET_HEADER = struct.Struct("<4sQQ")       # kind, entry count, capacity
+_BLOOM_HEADER = struct.Struct("<4sQQIQ")   # kind, bit count, expected items, hash count, items added
+_FILE_MAGIC = b"UNYSETS\0"
+_EMPTY = 0
+_MASK64 = (1 << 64) - 1
+
+
+def fingerprint64(key: Key) -> int:
+    """Non-zero 64-bit fingerprint of a string/bytes key (ints are taken as already hashed)"""
+    if isinstance(key, int):
+        value = key & _MASK64
+    else:
+        if isinstance(key, str):
+            key = key.encode('utf-8')
+        value = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+    return value or 1  # 0 marks an empty slot
+
+
+class FingerprintSet:
+    """Set of 64-bit key fingerprints with linear probing in an array('Q') table
+
+    Keys are hashed with fingerprint64, so membership is exact up to 64-bit collisions
+    (about 3e-8 odds of any collision among a million keys) and the keys themselves are not kept.
+    Not thread-safe: callers that share one across threads must lock around it.
+    """
+
+    MAX_LOAD = 0.7
+
+    def __init__(self, capacity: int = 1024):
+        self._capacity = 1 << max(4, math.ceil(math.log2(max(1, capacity) / self.MAX_LOAD)))
+        self._table = array('Q', bytes(8 * self._capacity))
+        self._count = 0
+
+    def _slot(self, fp: int) -> int:
+        mask = self._capacity - 1
+        table = self._table
+        # The low bits of blake2b output are uniform, so they index the table directly
+        slot = fp & mask
+        while True:
+            value = table[slot]
+            if value == fp or value == _EMPTY:
+                return slot
+            slot = (slot + 1) & mask
+
+    def add(self, key: Key) -> bool:
+        """Insert the key; True if it was not already present"""
+        fp = fingerprint64(key)
+        table, mask = self._table, self._capacity - 1
+        slot = fp & mask
+        value = table[slot]
+        while value != _EMPTY:
+            if value == fp:
+                return False
+            slot = (slot + 1) & mask
+            value = table[slot]
+        table[slot] = fp
+        self._count += 1
+        if self._count > self._capacity * self.MAX_LOAD:
+            self._grow()
+        return True
+
+    def update(self, keys: Iterable[Key]):
+        for key in keys:
+            self.add(key)
+
+    def _grow(self):
+        old = self._table
+        self._capacity *= 2
+        self._table = array('Q', bytes(8 * self._capacity))
+        for fp in old:
+            if fp != _EMPTY:
+                self._table[self._slot(fp)] = fp
+
+    def __contains__(self, key: Key) -> bool:
+        fp = fingerprint64(key)
+        table, mask = self._table, self._capacity - 1
+        slot = fp & mask
+        value = table[slot]
+        while value != _EMPTY:
+            if value == fp:
+                return True
+            slot = (slot + 1) & mask
+            value = table[slot]
+        return False
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        return self._capacity * 8
+
+    def to_bytes(self) -> bytes:
+        return _SET_HEADER.pack(b"FSET", self._count, self._capacity) + self._table.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "FingerprintSet":
+        kind, count, capacity = _SET_HEADER.unpack_from(data, 0)
+        if kind != b"FSET":
+            raise ValueError("Not a serialized FingerprintSet")
+        instance = cls.__new__(cls)
+        instance._capacity = capacity
+        instance._count = count
+        instance._table = array('Q')
+        instance._table.frombytes(data[_SET_HEADER.size:_SET_HEADER.size + capacity * 8])
+        if len(instance._table) != capacity:
+            raise ValueError("Truncated FingerprintSet")
+        return instance
+
+
+class BloomFilter:
+    """Bloom filter sized for `expected_items` keys at `error_rate` false positives
+
+    Never reports a present key as absent; an absent key is reported present with probability
+    error_rate while at most expected_items keys have been added (higher once over capacity).
+    """
+
+    def __init__(self, expected_items: int, error_rate: float = 0.001):
+        if not 0.0 < error_rate < 1.0:
+            raise ValueError(f"error_rate must be in (0, 1), got {error_rate}")
+        expected_items = max(1, expected_items)
+        self._bits = max(64, math.ceil(-expected_items * math.log(error_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._bits / expected_items * math.log(2)))
+        self._filter = bytearray((self._bits + 7) // 8)
+        self.expected_items = expected_items
+        self._count = 0
+
+    def _positions(self, key: Key):
+        if isinstance(key, int):
+            key = (key & _MASK64).to_bytes(8, 'little')
+        elif isinstance(key, str):
+            key = key.encode('utf-8')
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        # Kirsch-Mitzenmacher double hashing: k positions from two independent 64-bit hashes
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self._bits for i in range(self._hashes)]
+
+    def add(self, key: Key) -> bool:
+        """Insert the key; True if it was (definitely) not present before"""
+        new = False
+        bits = self._filter
+        for position in self._positions(key):
+            byte, bit = position >> 3, 1 << (position & 7)
+            if not bits[byte] & bit:
+                bits[byte] |= bit
+                new = True
+        if new:
+            self._count += 1
+        return new
+
+    def update(self, keys: Iterable[Key]):
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: Key) -> bool:
+        bits = self._filter
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def __len__(self) -> int:
+        """Keys added that were not already (reported) present"""
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._filter)
+
+    def estimated_error_rate(self) -> float:
+        """False-positive probability at the current fill"""
+        return (1 - math.exp(-self._hashes * self._count / self._bits)) ** self._hashes
+
+    def to_bytes(self) -> bytes:
+        return _BLOOM_HEADER.pack(b"BLOM", self._bits, self.expected_items, self._hashes, self._count) + bytes(self._filter)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        kind, bits, expected_items, hashes, count = _BLOOM_HEADER.unpack_from(data, 0)
+        if kind != b"BLOM":
+            raise ValueError("Not a serialized BloomFilter")
+        instance = cls.__new__(cls)
+        instance._bits = bits
+        instance._hashes = hashes
+        instance.expected_items = expected_items
+        instance._count = count
+        instance._filter = bytearray(data[_BLOOM_HEADER.size:_BLOOM_HEADER.size + (bits + 7) // 8])
+        if len(instance._filter) != (bits + 7) // 8:
+            raise ValueError("Truncated BloomFilter")
+        return instance
+
+
+_KINDS = {b"FSET": FingerprintSet, b"BLOM": BloomFilter}
+
+
+def save_sets(path, sets: Dict[str, Union[FingerprintSet, BloomFilter]]) -> Path:
+    """Checkpoint named sets into one file, atomically (temp file + rename)"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(_FILE_MAGIC + struct.pack("<I", len(sets)))
+        for name, dedup_set in sets.items():
+            encoded_name = name.encode('utf-8')
+            payload = dedup_set.to_bytes()
+            f.write(struct.pack("<HQ", len(encoded_name), len(payload)) + encoded_name)
+            f.write(payload)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_sets(path) -> Dict[str, Union[FingerprintSet, BloomFilter]]:
+    data = Path(path).read_bytes()
+    if data[:len(_FILE_MAGIC)] != _FILE_MAGIC:
+        raise ValueError(f"{path} is not a dedup checkpoint")
+    offset = len(_FILE_MAGIC)
+    (count,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    sets = {}
+    for _ in range(count):
+        name_length, payload_length = struct.unpack_from("<HQ", data, offset)
+        offset += struct.calcsize("<HQ")
+        name = data[offset:offset + name_length].decode('utf-8')
+        offset += name_length
+        payload = data[offset:offset + payload_length]
+        offset += payload_length
+        kind = bytes(payload[:4])
+        if kind not in _KINDS:
+            raise ValueError(f"Unknown set type {kind!r} for {name} in {path}")
+        sets[name] = _KINDS[kind].from_bytes(payload)
+    return sets
@@ -0,0 +1,109 @@
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+
+from telemetry import DEFAULT_BUCKETS, MetricsRegistry
+
+# Parsing a page takes about a millisecond, so start the buckets lower than the API's
+CRAWL_BUCKETS = (0.0005, 0.001, 0.0025) + DEFAULT_BUCKETS
+
+# connect = DNS + TCP/TLS connect + time to the response headers (requests does not separate them)
+NETWORK_STAGES = ('discovery', 'connect', 'download')
+PROCESSING_STAGES = ('parse', 'extract', 'paragraph_dedup', 'page_dedup', 'program_detection', 'link_scoring')
+
+
+class CrawlMetrics:
+    """Per-crawl timings and counters, kept in the crawler's own telemetry registry"""
+
+    def __init__(self):
+        self.registry = MetricsRegistry()
+        self.stage_latency = self.registry.histogram(
+            "unycompass_crawl_stage_duration_seconds",
+            "Time per crawl stage (connect, download, parse, extract, paragraph_dedup, link_scoring, ...)",
+            buckets=CRAWL_BUCKETS
+        )
+        self.responses = self.registry.counter("unycompass_crawl_responses_total", "HTTP responses by status code")
+        self.bytes_received = self.registry.counter("unycompass_crawl_bytes_total", "Response bytes received")
+        self.retries = self.registry.counter("unycompass_crawl_retries_total", "Fetch retries by reason")
+        self.waits = self.registry.counter("unycompass_crawl_wait_seconds_total",
+                                           "Seconds slept: politeness delay and retry backoff")
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._stages = []
+
+    def start(self):
+        self.started_at = datetime.now()
+        self.finished_at = None
+
+    def finish(self):
+        self.finished_at = datetime.now()
+
+    def wall_seconds(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return ((self.finished_at or datetime.now()) - self.started_at).total_seconds()
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if name not in self._stages:
+                self._stages.append(name)
+            self.stage_latency.observe(time.perf_counter() - started, stage=name)
+
+    def record_response(self, status: int, size: int):
+        self.responses.inc(status=status)
+        self.bytes_received.inc(size)
+
+    def record_retry(self, reason: str):
+        self.retries.inc(reason=reason)
+
+    def wait(self, seconds: float, reason: str = 'politeness'):
+        """Sleep and account for it"""
+        if seconds <= 0:
+            return
+        time.sleep(seconds)
+        self.waits.inc(seconds, reason=reason)
+
+    def report(self) -> Dict:
+        wall = self.wall_seconds()
+        stages = {}
+        for name in self._stages:
+            count = self.stage_latency.count(stage=name)
+            total = self.stage_latency.total(stage=name)
+            p50 = self.stage_latency.quantile(0.5, stage=name)
+            p95 = self.stage_latency.quantile(0.95, stage=name)
+            stages[name] = {
+                'count': count,
+                'total_seconds': round(total, 3),
+                'mean_ms': round(total / count * 1000, 2) if count else None,
+                'p50_ms': round(p50 * 1000, 2) if p50 is not None else None,
+                'p95_ms': round(p95 * 1000, 2) if p95 is not None else None,
+                'share_of_wall': round(total / wall, 3) if wall else None,
+            }
+
+        waits = {key[0][1]: value for _, key, value in self.waits.samples()}
+        retries = {key[0][1]: value for _, key, value in self.retries.samples()}
+        responses = {key[0][1]: value for _, key, value in self.responses.samples()}
+        totals = {
+            'network': sum(stages.get(name, {}).get('total_seconds', 0) for name in NETWORK_STAGES),
+            'processing': sum(stages.get(name, {}).get('total_seconds', 0) for name in PROCESSING_STAGES),
+            'waiting': sum(waits.values()),
+        }
+        return {
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'wall_seconds': round(wall, 3) if wall is not None else None,
+            'requests': int(sum(responses.values())),
+            'responses_by_status': dict(sorted(responses.items())),
+            'bytes_received': int(self.bytes_received.value()),
+            'retries': int(sum(retries.values())),
+            'retries_by_reason': retries,
+            'wait_seconds': {reason: round(seconds, 3) for reason, seconds in waits.items()},
+            'stages': stages,
+            'time_by_category_seconds': {name: round(value, 3) for name, value in totals.items()},
+            'bound_by': max(totals, key=totals.get) if any(totals.values()) else None,
+        }
@@ -0,0 +1,326 @@
+"""Crawl many college sites at once on one worker pool, polite to each domain
+
+HybridWebCrawler crawls one site with one global delay, so crawling N colleges back to back takes
+the sum of their crawl times, nearly all of it spent sleeping between requests. The orchestrator
+keeps one crawler per site and a DomainScheduler that hands sites (never URLs) to a shared pool of
+worker threads:
+
+    - a site is held by at most one worker at a time, so each domain sees one request at a time;
+    - after each page the site goes back with ready_at = now + its delay (robots.txt Crawl-delay
+      included), and no worker may take it before then;
+    - a free worker takes whichever site has been ready longest, so while one domain is cooling
+      down the workers fetch from the others.
+
+With enough workers the total crawl time is roughly that of the largest site, not the sum.
+Each site writes its own outputs under <output-dir>/<name>/ and, with --index, is indexed into
+its own namespace. The crawler's hand-listed seeds are hunter.cuny.edu pages, so other sites start
+from their sitemaps and home page only.
+
+Usage:
+    python crawl_orchestrator.py --site hunter=https://hunter.cuny.edu --site baruch=https://www.baruch.cuny.edu
+    python crawl_orchestrator.py --sites-file sites.json --workers 8 --max-pages 200 --index
+"""
+import argparse
+import heapq
+import itertools
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+HUNTER_DOMAINS = ("hunter.cuny.edu", "www.hunter.cuny.edu")
+
+
+class CrawlSite:
+    """One college site: where to crawl, where its outputs go and its crawl progress"""
+
+    def __init__(self, name: str, base_url: str, output_dir: str = "../docs/sites", namespace: Optional[str] = None,
+                 max_pages: int = 200, delay: float = 1.0, hand_listed_seeds: Optional[bool] = None):
+        self.name = name
+        self.base_url = base_url
+        self.domain = urlparse(base_url).netloc
+        # HybridWebCrawler's hand-listed seeds only exist on hunter.cuny.edu (None: decide by domain)
+        if hand_listed_seeds is None:
+            hand_listed_seeds = self.domain in HUNTER_DOMAINS
+        self.hand_listed_seeds = hand_listed_seeds
+        self.namespace = namespace or name
+        self.max_pages = max_pages
+        self.delay = delay
+        self.output = Path(output_dir) / name / f"{name}.txt"
+
+        self.crawler = None
+        self.pipeline = None
+        self.error = None
+        self.busy_seconds = 0.0  # time workers spent on this site (discovery, fetching, parsing)
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def report(self) -> Dict:
+        crawler = self.crawler
+        seconds = (self.finished_at or time.monotonic()) - self.started_at if self.started_at else 0.0
+        pages = len(crawler.pages_data) if crawler else 0
+        row = {
+            'base_url': self.base_url,
+            'namespace': self.namespace,
+            'output': str(self.output),
+            'pages': pages,
+            'failed': len(crawler.failed_urls) if crawler else 0,
+            'delay': crawler.delay if crawler else self.delay,
+            'seconds': round(seconds, 2),
+            'busy_seconds': round(self.busy_seconds, 2),
+            'pages_per_minute': round(pages / seconds * 60, 1) if seconds > 0 else 0.0,
+        }
+        if self.pipeline is not None:
+            row['indexed'] = self.pipeline.report()['chunks_indexed']
+        if self.error:
+            row['error'] = self.error
+        return row
+
+
+class DomainScheduler:
+    """Hands out sites whose politeness delay has passed, at most one worker per site
+
+    Sites wait in a heap keyed by the time they may next be fetched from. acquire() blocks until
+    the earliest one is due; release() puts a site back with its next ready time, or retires it.
+    """
+
+    def __init__(self):
+        self._ready = []  # (ready_at, sequence, site)
+        self._sequence = itertools.count()
+        self._held = 0
+        self._condition = threading.Condition()
+
+    def add(self, site, ready_at: float = 0.0):
+        with self._condition:
+            heapq.heappush(self._ready, (ready_at, next(self._sequence), site))
+            self._condition.notify()
+
+    def acquire(self):
+        """The next due site, or None once every site is retired"""
+        with self._condition:
+            while True:
+                if not self._ready:
+                    if self._held == 0:
+                        return None
+                    self._condition.wait()
+                    continue
+                wait = self._ready[0][0] - time.monotonic()
+                if wait <= 0:
+                    self._held += 1
+                    return heapq.heappop(self._ready)[2]
+                self._condition.wait(wait)
+
+    def release(self, site, ready_at: Optional[float] = None):
+        """Return a held site, due again at `ready_at` (monotonic), or retire it with None"""
+        with self._condition:
+            self._held -= 1
+            if ready_at is not None:
+                heapq.heappush(self._ready, (ready_at, next(self._sequence), site))
+            # Wake everyone: a waiter may now have an earlier site, or nothing left to wait for
+            self._condition.notify_all()
+
+
+class CrawlOrchestrator:
+    """Crawl `sites` concurrently on `max_workers` threads; pass `db` to index each into its namespace"""
+
+    def __init__(self, sites: List[CrawlSite], max_workers: int = 8, db=None, crawler_options: Optional[Dict] = None):
+        domains = [site.domain for site in sites]
+        duplicates = sorted({domain for domain in domains if domains.count(domain) > 1})
+        if duplicates:
+            # Two crawlers on one domain would each keep their own delay and double its request rate
+            raise ValueError(f"More than one site for domain(s): {', '.join(duplicates)}")
+        names = [site.name for site in sites]
+        if len(set(names)) != len(names):
+            raise ValueError("Site names must be unique (they name the output directories)")
+        self.sites = sites
+        self.max_workers = max_workers
+        self.db = db
+        self.crawler_options = crawler_options or {}
+        self.scheduler = DomainScheduler()
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def run(self) -> Dict:
+        """Crawl every site to completion, save their outputs and return report()"""
+        print(f"🌐 Crawling {len(self.sites)} sites with {self.max_workers} workers")
+        self.started_at = time.monotonic()
+        for site in self.sites:
+            self.scheduler.add(site)
+        workers = [threading.Thread(target=self._worker, name=f"crawl-{i}", daemon=True)
+                   for i in range(min(self.max_workers, len(self.sites)) or 1)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.finished_at = time.monotonic()
+        report = self.report()
+        print_report(report)
+        return report
+
+    def _worker(self):
+        while True:
+            site = self.scheduler.acquire()
+            if site is None:
+                return
+            started = time.monotonic()
+            try:
+                ready_at = self._step(site)
+            except Exception as e:
+                print(f"❌ {site.name}: {e}")
+                site.error = str(e)
+                self._finish(site)
+                ready_at = None
+            busy = time.monotonic() - started
+            site.busy_seconds += busy
+            with self._lock:
+                self.busy_seconds += busy
+            self.scheduler.release(site, ready_at)
+
+    def _step(self, site: CrawlSite) -> Optional[float]:
+        """Advance one site by one request; when it may next be fetched from, or None when done"""
+        if site.crawler is None:
+            self._start(site)
+            return time.monotonic() + site.crawler.delay
+
+        crawler = site.crawler
+        current_url = crawler.next_url()
+        if current_url is None:
+            self._finish(site)
+            return None
+        try:
+            result, status = crawler.crawl_page(current_url)
+            crawler.record_page(current_url, result, status)
+        except Exception as e:
+            print(f"  ❌ Error: {e}")
+            crawler.failed_urls.append({'url': current_url, 'reason': str(e)})
+        return time.monotonic() + crawler.delay
+
+    def _start(self, site: CrawlSite):
+        """Build the site's crawler; its robots.txt and sitemap discovery runs on this worker"""
+        from hunter_main import HybridWebCrawler
+
+        site.started_at = time.monotonic()
+        site.output.parent.mkdir(parents=True, exist_ok=True)
+        stem = site.output.stem
+        options = {'hand_listed_seeds': site.hand_listed_seeds, **self.crawler_options}
+        site.crawler = HybridWebCrawler(
+            site.base_url, max_pages=site.max_pages, delay=site.delay,
+            negative_cache_path=str(site.output.with_name(f"{stem}_negative_cache.json")),
+            page_records_path=str(site.output.with_name(f"{stem}_pages.ndjson")),
+            **options
+        )
+        if self.db is not None:
+            from ingest import IngestPipeline
+
+            site.pipeline = IngestPipeline(self.db, id_prefix=stem, pages_prefix=f"{stem}_pages",
+                                           namespace=site.namespace)
+            site.crawler.on_page = site.pipeline.submit
+            site.pipeline.start()
+        site.crawler.start_crawl()
+        print(f"🏁 {site.name}: started {site.base_url} (delay {site.crawler.delay}s)")
+
+    def _finish(self, site: CrawlSite):
+        crawler = site.crawler
+        try:
+            if crawler is not None and site.error is None:
+                crawler.finish_crawl()
+                crawler.save_results(str(site.output))
+                if site.pipeline is not None:
+                    for suffix in ('_urls.json', '_analytics.json'):
+                        json_file = site.output.with_name(f"{site.output.stem}{suffix}")
+                        if json_file.exists():
+                            site.pipeline.submit_records(self.db.json_file_records(str(json_file)))
+        finally:
+            if site.pipeline is not None:
+                site.pipeline.close()
+                crawler.on_page = None
+            if crawler is not None:
+                # finish_crawl does these too, but a failed site skips it: still release the
+                # page records file and keep the failures this crawl learned for the next run
+                if crawler.page_writer is not None:
+                    crawler.page_writer.close()
+                crawler.negative_cache.save()
+            site.finished_at = time.monotonic()
+            print(f"🏁 {site.name}: done ({len(crawler.pages_data) if crawler else 0} pages)")
+
+    def report(self) -> Dict:
+        """Per-site outcomes plus aggregate throughput and how busy the worker pool was"""
+        wall = ((self.finished_at or time.monotonic()) - self.started_at) if self.started_at else 0.0
+        sites = {site.name: site.report() for site in self.sites}
+        pages = sum(row['pages'] for row in sites.values())
+        workers = min(self.max_workers, len(self.sites)) or 1
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'workers': workers,
+            'wall_seconds': round(wall, 2),
+            # What crawling the sites one after another would have taken
+            'sum_site_seconds': round(sum(row['seconds'] for row in sites.values()), 2),
+            'pages': pages,
+            'failed': sum(row['failed'] for row in sites.values()),
+            'pages_per_minute': round(pages / wall * 60, 1) if wall > 0 else 0.0,
+            'worker_utilization': round(self.busy_seconds / (workers * wall), 3) if wall > 0 else 0.0,
+            'sites': sites,
+        }
+
+
+def print_report(report: Dict):
+    print(f"\n🌐 {len(report['sites'])} sites, {report['pages']} pages in {report['wall_seconds']:.1f}s "
+          f"({report['pages_per_minute']} pages/min, one after another: ~{report['sum_site_seconds']:.1f}s)")
+    for name, row in report['sites'].items():
+        status = f"  ❌ {row['error']}" if 'error' in row else ''
+        print(f"   {name:<16} {row['pages']:>5} pages  {row['failed']:>4} failed  {row['seconds']:>7.1f}s  "
+              f"{row['pages_per_minute']:>6} pages/min  delay {row['delay']}s{status}")
+    print(f"   👷 Worker utilization: {report['worker_utilization']:.0%}")
+
+
+def load_sites(args) -> List[CrawlSite]:
+    """Sites from --site name=url flags and a --sites-file JSON list of {name, base_url, ...}"""
+    entries = []
+    if args.sites_file:
+        with open(args.sites_file, 'r', encoding='utf-8') as f:
+            entries.extend(json.load(f))
+    for value in args.site or []:
+        name, _, base_url = value.partition('=')
+        if not base_url:
+            raise SystemExit(f"--site expects name=url, got {value!r}")
+        entries.append({'name': name, 'base_url': base_url})
+    return [CrawlSite(entry['name'], entry['base_url'], output_dir=args.output_dir,
+                      namespace=entry.get('namespace'), max_pages=entry.get('max_pages', args.max_pages),
+                      delay=entry.get('delay', args.delay), hand_listed_seeds=entry.get('hand_listed_seeds'))
+            for entry in entries]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawl several college sites in parallel, politely per domain")
+    parser.add_argument('--site', action='append', help='name=base_url (repeatable)')
+    parser.add_argument('--sites-file', help='JSON list of {"name", "base_url", optional "max_pages", "delay", "namespace", "hand_listed_seeds"}')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--max-pages', type=int, default=200, help='Per-site page limit')
+    parser.add_argument('--delay', type=float, default=1.0, help='Per-domain delay between requests (s)')
+    parser.add_argument('--output-dir', default="../docs/sites")
+    parser.add_argument('--index', action='store_true', help="Index each site into its own namespace as it is crawled")
+    args = parser.parse_args(argv)
+
+    sites = load_sites(args)
+    if not sites:
+        parser.error("no sites given (use --site or --sites-file)")
+    db = None
+    if args.index:
+        from hunter_ai import UNYCompassDatabase
+        db = UNYCompassDatabase()
+
+    report = CrawlOrchestrator(sites, max_workers=args.workers, db=db).run()
+    report_file = Path(args.output_dir) / "crawl_orchestrator_report.json"
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Report: {report_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,175 @@
+import contextvars
+import math
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from telemetry import REGISTRY
+
+HEDGES = REGISTRY.counter("unycompass_hedged_requests_total", "Duplicate requests issued after the hedge delay, by stage")
+HEDGE_WINS = REGISTRY.counter("unycompass_hedge_wins_total", "Hedged duplicates that finished before the original, by stage")
+DEADLINE_EXCEEDED = REGISTRY.counter("unycompass_deadline_exceeded_total", "Stage calls abandoned because the request budget ran out")
+
+
+class DeadlineExceeded(TimeoutError):
+    """Request budget ran out; `partial` carries whatever the stage had produced so far"""
+
+    def __init__(self, stage: str = "", partial=None):
+        super().__init__(f"Deadline exceeded during {stage or 'request'}")
+        self.stage = stage
+        self.partial = partial
+
+
+class Deadline:
+    """Absolute per-request time budget shared by every stage of answer_question"""
+
+    def __init__(self, budget_s: float):
+        self.budget_s = budget_s
+        self.expires_at = time.monotonic() + budget_s
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+_current_deadline = contextvars.ContextVar("unycompass_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]):
+    """Make `deadline` visible to nested stages (including lru_cached ones that can't take it as an argument)"""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies for one stage"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float, min_samples: int = 20) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class Hedger:
+    """Run a call with a deadline; if it is slower than the stage's recent p95, race a duplicate
+
+    The duplicate is issued once, after `hedge delay` = p95 of recent latencies (clamped to
+    [min_delay, max_delay], `initial_delay` until enough samples exist). The first successful
+    result wins. Losing calls cannot be cancelled and finish in the background on a bounded pool.
+    """
+
+    def __init__(self, stage: str, max_workers: int = 16, percentile: float = 95,
+                 initial_delay: float = 1.0, min_delay: float = 0.05, max_delay: float = 10.0,
+                 enabled: bool = True):
+        self.stage = stage
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.enabled = enabled
+        self.latency = LatencyTracker()
+        self.max_workers = max_workers
+        self._executor = self._new_executor()
+        _hedgers.add(self)
+
+    def _new_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"hedge-{self.stage}")
+
+    def hedge_delay(self) -> float:
+        observed = self.latency.percentile(self.percentile)
+        if observed is None:
+            return self.initial_delay
+        return min(self.max_delay, max(self.min_delay, observed))
+
+    def _timed(self, fn, args, kwargs):
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.latency.record(time.perf_counter() - started)
+        return result
+
+    def _submit(self, fn, args, kwargs):
+        # Copy the caller's context so tracing spans and the deadline follow the call into the pool
+        context = contextvars.copy_context()
+        return self._executor.submit(context.run, self._timed, fn, args, kwargs)
+
+    def call(self, fn: Callable, *args, deadline: Optional[Deadline] = None, **kwargs):
+        if deadline is None:
+            deadline = current_deadline()
+        if deadline is not None and deadline.expired():
+            DEADLINE_EXCEEDED.inc(stage=self.stage)
+            raise DeadlineExceeded(self.stage)
+
+        primary = self._submit(fn, args, kwargs)
+        pending = {primary}
+        hedged = None
+
+        def time_left():
+            return None if deadline is None else deadline.remaining()
+
+        # Phase 1: give the primary call until the hedge delay
+        first_wait = self.hedge_delay() if self.enabled else None
+        if deadline is not None:
+            first_wait = deadline.remaining() if first_wait is None else min(first_wait, deadline.remaining())
+        done, _ = wait(pending, timeout=first_wait)
+
+        if not done and self.enabled and (deadline is None or not deadline.expired()):
+            hedged = self._submit(fn, args, kwargs)
+            pending.add(hedged)
+            HEDGES.inc(stage=self.stage)
+
+        # Phase 2: first success wins; an error only propagates once nothing else is outstanding
+        last_error = None
+        while pending:
+            done, pending = wait(pending, timeout=time_left(), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    if future is hedged:
+                        HEDGE_WINS.inc(stage=self.stage)
+                    return future.result()
+                last_error = future.exception()
+
+        if last_error is not None and not pending:
+            raise last_error
+        DEADLINE_EXCEEDED.inc(stage=self.stage)
+        raise DeadlineExceeded(self.stage)
+
+
+# Pool threads don't survive fork(): a pre-fork server (api/serve.py) forks workers from a master
+# whose hedgers may already have started threads, so each child gets fresh executors
+_hedgers = weakref.WeakSet()
+
+
+def _reset_executors_after_fork():
+    for hedger in list(_hedgers):
+        hedger._executor = hedger._new_executor()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_executors_after_fork)
@@ -0,0 +1,194 @@
+import io
+import mmap
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+MAGIC = b"UNYDOCS\0"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sII")   # magic, format version, dictionary length
+_RECORD = struct.Struct("<HII")    # id length, compressed length, raw length
+_DICTIONARY_SIZE = 32 * 1024
+
+
+def train_dictionary(texts: Sequence[str], size: int = _DICTIONARY_SIZE) -> bytes:
+    """Preset zlib dictionary: evenly spaced sample chunks, so boilerplate shared by the corpus compresses away
+
+    zlib favours matches near the end of the dictionary, and each sample is a whole chunk,
+    so repeated navigation text and headings end up well represented.
+    """
+    if not texts:
+        return b""
+    budget = size
+    samples = []
+    step = max(1, len(texts) // 64)
+    for text in texts[::step]:
+        encoded = text.encode('utf-8')[:2048]
+        if len(encoded) > budget:
+            break
+        samples.append(encoded)
+        budget -= len(encoded)
+    return b"".join(samples)
+
+
+class ChunkStore:
+    """Append-only local store of chunk texts keyed by chunk (vector) ID
+
+    Each record is zlib-compressed on its own against a preset dictionary stored in the file
+    header, so single chunks decompress independently yet still compress well. Reads come from
+    a read-only mmap of the file; rewriting an ID appends a new record that wins over the old one.
+    path=None keeps the store in memory (benchmarks, tools).
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self._lock = threading.RLock()
+        self._records: Dict[str, Tuple[int, int, int]] = {}  # id -> (offset, compressed length, raw length)
+        self._zdict = b""
+        self._size = 0
+        self._mmap = None
+        self._mapped_size = 0
+        if self.path is None:
+            self._file = None
+            self._buffer = bytearray()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a+b')
+            self._load()
+
+    def _load(self):
+        self._file.seek(0, io.SEEK_END)
+        self._size = self._file.tell()
+        if self._size == 0:
+            return
+        if self._size < _HEADER.size:
+            self._file.seek(0)
+            if not MAGIC.startswith(self._file.read(len(MAGIC))):
+                raise ValueError(f"{self.path} is not a version {FORMAT_VERSION} chunk store")
+            # Torn header from an interrupted first write; start over
+            self._truncate(0)
+            return
+        view = self._view()
+        magic, version, dictionary_length = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{self.path} is not a version {FORMAT_VERSION} chunk store")
+        offset = _HEADER.size
+        if offset + dictionary_length > self._size:
+            self._truncate(0)
+            return
+        self._zdict = bytes(view[offset:offset + dictionary_length])
+        offset += dictionary_length
+
+        while offset + _RECORD.size <= self._size:
+            id_length, compressed_length, raw_length = _RECORD.unpack_from(view, offset)
+            data_offset = offset + _RECORD.size + id_length
+            if data_offset + compressed_length > self._size:
+                break
+            chunk_id = bytes(view[offset + _RECORD.size:data_offset]).decode('utf-8')
+            self._records[chunk_id] = (data_offset, compressed_length, raw_length)
+            offset = data_offset + compressed_length
+        if offset != self._size:
+            # Torn final record from an interrupted write: cut it off so later appends
+            # start on a record boundary
+            self._truncate(offset)
+
+    def _truncate(self, size: int):
+        """Drop everything past size (only while loading, before any reader holds the map)"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.truncate(size)
+        self._file.flush()
+        self._size = size
+        if size == 0:
+            self._zdict = b""
+
+    def _view(self):
+        """Read-only mapping covering everything written so far (remapped after appends)"""
+        if self.path is None:
+            return self._buffer
+        with self._lock:
+            if self._mmap is None or self._mapped_size != self._size:
+                self._file.flush()
+                # Superseded maps are left to the GC so concurrent readers holding them stay valid
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._mapped_size = self._size
+            return self._mmap
+
+    def put_many(self, items: Iterable[Tuple[str, str]]) -> int:
+        items = list(items)
+        if not items:
+            return 0
+        with self._lock:
+            buffer = bytearray()
+            if self._size == 0:
+                self._zdict = train_dictionary([text for _, text in items])
+                buffer += _HEADER.pack(MAGIC, FORMAT_VERSION, len(self._zdict)) + self._zdict
+
+            offset = self._size + len(buffer)
+            pending = {}
+            for chunk_id, text in items:
+                encoded_id = chunk_id.encode('utf-8')
+                raw = text.encode('utf-8')
+                compressor = zlib.compressobj(level=6, zdict=self._zdict) if self._zdict else zlib.compressobj(level=6)
+                data = compressor.compress(raw) + compressor.flush()
+                buffer += _RECORD.pack(len(encoded_id), len(data), len(raw)) + encoded_id + data
+                pending[chunk_id] = (offset + _RECORD.size + len(encoded_id), len(data), len(raw))
+                offset += _RECORD.size + len(encoded_id) + len(data)
+
+            if self._file is None:
+                self._buffer += buffer
+            else:
+                self._file.seek(0, io.SEEK_END)
+                self._file.write(buffer)
+                self._file.flush()
+            self._size += len(buffer)
+            self._records.update(pending)
+        return len(items)
+
+    def _decode(self, view, record) -> str:
+        offset, compressed_length, _ = record
+        decompressor = zlib.decompressobj(zdict=self._zdict) if self._zdict else zlib.decompressobj()
+        return (decompressor.decompress(view[offset:offset + compressed_length]) + decompressor.flush()).decode('utf-8')
+
+    def get(self, chunk_id: str) -> Optional[str]:
+        return self.get_many([chunk_id]).get(chunk_id)
+
+    def get_many(self, chunk_ids: Iterable[str]) -> Dict[str, str]:
+        records = [(chunk_id, self._records.get(chunk_id)) for chunk_id in chunk_ids]
+        records = [(chunk_id, record) for chunk_id, record in records if record is not None]
+        if not records:
+            return {}
+        view = self._view()
+        return {chunk_id: self._decode(view, record) for chunk_id, record in records}
+
+    def clear(self):
+        with self._lock:
+            if self._file is None:
+                self._buffer = bytearray()
+            else:
+                self._file.seek(0)
+                self._file.truncate()
+            self._records.clear()
+            self._zdict = b""
+            self._size = 0
+            self._mmap = None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            raw = sum(record[2] for record in self._records.values())
+            compressed = sum(record[1] for record in self._records.values())
+            return {
+                'chunks': len(self._records),
+                'file_bytes': self._size,
+                'text_bytes': raw,
+                'compression_ratio': round(raw / compressed, 2) if compressed else None
+            }
+
+    def __contains__(self, chunk_id: str) -> bool:
+        return chunk_id in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
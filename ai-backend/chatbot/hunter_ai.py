@@ -1,27 +1,55 @@
 import os
 import json
 import hashlib
-import numpy as np
-from sentence_transformers import SentenceTransformer
-from langchain_openai import ChatOpenAI  
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from dotenv import load_dotenv
 import re
-from pinecone import Pinecone, ServerlessSpec
 import time
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple
 from functools import lru_cache
 import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from telemetry import REGISTRY, span
+from singleflight import SingleFlight
+from chunker import RecursiveChunker
+from docstore import ChunkStore
+from page_records import iter_page_records
+from query_log import QueryLog, top_questions
+from deadline import Deadline, DeadlineExceeded, Hedger, current_deadline, deadline_scope
+
+# Heavy dependencies (sentence_transformers/torch, langchain_openai, pinecone) are imported
+# inside the components that need them, so importing this module stays cheap for tooling
+# (extract_metadata, chunking) and for fast-start health checks.
 
 # Load environment variables
 current_dir = Path(__file__).parent
 load_dotenv(dotenv_path=current_dir / "../api/hunter_api-key.env")
 load_dotenv(dotenv_path=current_dir / "../api/pinecone_api-key.env")
 
+class SearchResults(list):
+    """Chunk texts from UNYCompassDatabase.search, with the vector IDs they came from"""
+
+    def __init__(self, texts=(), chunk_ids=()):
+        super().__init__(texts)
+        self.chunk_ids = list(chunk_ids)
+
+EXPANSION_DECISIONS = REGISTRY.counter(
+    "unycompass_query_expansion_decisions_total",
+    "Adaptive retrieval: searches that ran or skipped their query expansions, by reason"
+)
+EXPANSION_QUERIES = REGISTRY.counter(
+    "unycompass_expansion_queries_total", "Expanded (synonym) queries issued"
+)
+EXPANSION_NEW_RESULTS = REGISTRY.counter(
+    "unycompass_expansion_new_results_total", "Search results that only an expanded query found"
+)
+
 class UNYCompassDatabase:
     """OPTIMIZED: Singleton pattern with connection pooling and lazy loading"""
     
+    MODEL_NAME = 'all-mpnet-base-v2'
+    
     _instance = None
     _lock = threading.Lock()
     
@@ -50,20 +78,79 @@ class UNYCompassDatabase:
         # OPTIMIZATION: Load model once and cache
         print("📦 Loading SentenceTransformer model...")
         model_start = time.time()
-        self.model = SentenceTransformer('all-mpnet-base-v2')
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(self.MODEL_NAME)
         print(f"✅ Model loaded in {time.time() - model_start:.2f}s")
         
         # Smart text splitter for better chunking
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=800,
-            chunk_overlap=100,
-            separators=["\n\n--- PAGE:", "\n\n", "\n", ". ", " ", ""],
-            length_function=len
-        )
+        self.text_splitter = self.create_text_splitter(getattr(self.model, 'tokenizer', None),
+                                                       getattr(self.model, 'max_seq_length', None))
+
+        # UNYCOMPASS_SNAPSHOT: serve a prebuilt, memory-mapped snapshot (see snapshot.py)
+        # instead of Pinecone - no network calls, no docs hashing, no re-embedding at boot.
+        # VECTOR_STORE=local keeps the vectors in an on-disk LocalVectorIndex instead (see open_local_index)
+        self.snapshot = None
+        self.local_index_path = None
+        snapshot_path = os.getenv("UNYCOMPASS_SNAPSHOT")
+        if snapshot_path:
+            self.load_snapshot(snapshot_path)
+        elif os.getenv("VECTOR_STORE", "pinecone").lower() == "local":
+            self.open_local_index(os.getenv("LOCAL_INDEX_PATH") or current_dir / "local_index")
+        else:
+            self.connect_pinecone(index_name)
+        
+        # Slow vector queries get a duplicate request after the recent p95
+        self.query_hedger = self.create_query_hedger()
+        self.load_expansion_settings()
+        
+        # Chunk texts live in a local docstore keyed by vector ID; vectors only carry small fields.
+        # A snapshot already holds its texts memory-mapped, so it serves as the docstore.
+        self.docstore = self.snapshot if self.snapshot is not None else self.open_docstore()
+        self.store_text_in_metadata = os.getenv("PINECONE_STORE_TEXT", "false").lower() == "true"
+        
+        # Track indexed files to handle updates
+        self.indexed_files_record = current_dir / "indexed_files.json"
+        self.indexed_files = self.load_indexed_files()
 
+        # OPTIMIZATION: Quick data check - don't reprocess if data exists
+        if self.snapshot is None:
+            self.check_and_update_data()
+
+        self._initialized = True
+        total_time = time.time() - start_time
+        print(f"🎉 UNYCompassDatabase initialized in {total_time:.2f}s")
+
+    @classmethod
+    def from_components(cls, model, index, namespace="hunter-intermediate", index_name="local", docstore=None):
+        """Build a database around an existing embedding model and index (no Pinecone, no data check)
+
+        Bypasses the singleton so benchmarks and tools can run several isolated instances.
+        Without a docstore, chunk texts are kept in an in-memory ChunkStore.
+        """
+        db = object.__new__(cls)
+        db.index_name = index_name
+        db.namespace = namespace
+        db.model = model
+        db.text_splitter = cls.create_text_splitter(getattr(model, 'tokenizer', None),
+                                                    getattr(model, 'max_seq_length', None))
+        db.pc = None
+        db.snapshot = None
+        db.local_index_path = None
+        db.index = index
+        db.docstore = docstore if docstore is not None else ChunkStore()
+        db.store_text_in_metadata = False
+        db.query_hedger = cls.create_query_hedger()
+        db.load_expansion_settings()
+        db.indexed_files_record = current_dir / "indexed_files.json"
+        db.indexed_files = {}
+        db._initialized = True
+        return db
+
+    def connect_pinecone(self, index_name: str):
         # OPTIMIZATION: Persistent Pinecone connection
         print("🔌 Connecting to Pinecone...")
         pinecone_start = time.time()
+        from pinecone import Pinecone, ServerlessSpec
         self.pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
         
         # Create index with new dimensions for better model
@@ -81,17 +168,98 @@ class UNYCompassDatabase:
 
         self.index = self.pc.Index(index_name)
         print(f"✅ Pinecone connected in {time.time() - pinecone_start:.2f}s")
-        
-        # Track indexed files to handle updates
-        self.indexed_files_record = current_dir / "indexed_files.json"
-        self.indexed_files = self.load_indexed_files()
 
-        # OPTIMIZATION: Quick data check - don't reprocess if data exists
-        self.check_and_update_data()
+    def load_snapshot(self, path):
+        """Serve searches from a read-only memory-mapped snapshot; worker processes share its pages"""
+        from local_index import LocalVectorIndex
+        from snapshot import Snapshot
+        
+        print(f"🗺️ Loading snapshot {path}...")
+        snapshot_start = time.time()
+        snapshot = Snapshot(path)
+        snapshot.check_compatible(self.MODEL_NAME, self.model.get_sentence_embedding_dimension())
+        self.pc = None
+        self.snapshot = snapshot
+        self.namespace = snapshot.namespace
+        self.index = snapshot.to_index(**LocalVectorIndex.options_from_env())
+        # Train any ANN partition now: in the preloaded master, before workers fork
+        self.index.build_ann()
+        print(f"✅ Snapshot with {snapshot.count} chunks (built {snapshot.created_at}) "
+              f"mapped in {time.time() - snapshot_start:.2f}s")
 
-        self._initialized = True
-        total_time = time.time() - start_time
-        print(f"🎉 UNYCompassDatabase initialized in {total_time:.2f}s")
+    def open_local_index(self, path):
+        """Keep vectors in a LocalVectorIndex persisted at `path` (.npz + .json), saved with indexed_files.json
+
+        Namespaces past LOCAL_INDEX_ANN_MIN_VECTORS are searched with an IVF partition (LOCAL_INDEX_ANN=ivf,
+        the default) instead of brute force. LOCAL_INDEX_STORAGE=int8 / LOCAL_INDEX_PCA_DIMENSION keep only
+        compact codes resident and rescore candidates from the memory-mapped float32 rows; see
+        LocalVectorIndex.options_from_env.
+        """
+        from local_index import LocalVectorIndex
+
+        path = Path(path)
+        print(f"💽 Opening local vector index {path}...")
+        index_start = time.time()
+        options = LocalVectorIndex.options_from_env()
+        if path.with_suffix('.json').exists():
+            self.index = LocalVectorIndex.load(path, **options)
+        else:
+            self.index = LocalVectorIndex(dimension=self.model.get_sentence_embedding_dimension(), **options)
+        self.index.build_ann()
+        self.pc = None
+        self.local_index_path = path
+        stats = self.index.describe_index_stats()
+        print(f"✅ Local index with {stats.total_vector_count} vectors ready in {time.time() - index_start:.2f}s")
+
+    @staticmethod
+    def open_docstore():
+        """Local compressed chunk text store (CHUNK_DOCSTORE, default chatbot/chunk_docstore.bin)"""
+        path = os.getenv("CHUNK_DOCSTORE") or current_dir / "chunk_docstore.bin"
+        docstore = ChunkStore(path)
+        print(f"📚 Chunk docstore {path}: {len(docstore)} chunks")
+        return docstore
+
+    @staticmethod
+    def create_text_splitter(tokenizer=None, max_tokens=None):
+        """Same boundaries as LangChain's RecursiveCharacterTextSplitter, without importing LangChain
+
+        CHUNK_SIZE / CHUNK_OVERLAP default to 800/100 characters. CHUNK_LENGTH_UNIT=tokens sizes
+        chunks in tokens instead (default 256/32), capped so a chunk plus the special tokens fits
+        in max_tokens (the model's max_seq_length; longer input is truncated, not embedded).
+        """
+        length_unit = os.getenv("CHUNK_LENGTH_UNIT", "chars")
+        tokens = length_unit == "tokens"
+        chunk_size = int(os.getenv("CHUNK_SIZE", "256" if tokens else "800"))
+        chunk_overlap = int(os.getenv("CHUNK_OVERLAP", "32" if tokens else "100"))
+        if tokens and max_tokens and chunk_size > max_tokens - 2:
+            print(f"⚠️ CHUNK_SIZE {chunk_size} exceeds the model's {max_tokens}-token input; using {max_tokens - 2}")
+            chunk_size = max_tokens - 2
+            chunk_overlap = min(chunk_overlap, chunk_size // 4)
+        return RecursiveChunker(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            separators=["\n\n--- PAGE:", "\n\n", "\n", ". ", " ", ""],
+            length_unit=length_unit,
+            tokenizer=tokenizer
+        )
+
+    @staticmethod
+    def create_query_hedger():
+        return Hedger(
+            "vector_query",
+            max_workers=int(os.getenv("VECTOR_QUERY_WORKERS", "32")),
+            initial_delay=float(os.getenv("VECTOR_HEDGE_INITIAL_DELAY", "0.5")),
+            enabled=os.getenv("VECTOR_HEDGING", "true").lower() == "true"
+        )
+
+    def load_expansion_settings(self):
+        """QUERY_EXPANSION: always (every synonym rewrite), adaptive (only when the original
+        query's results look weak) or off"""
+        self.query_expansion = os.getenv("QUERY_EXPANSION", "adaptive").lower()
+        # adaptive: expand when the best match scores below this...
+        self.expansion_min_score = float(os.getenv("EXPANSION_MIN_SCORE", "0.55"))
+        # ...or fewer than this many distinct chunks clear the quality cutoff
+        self.expansion_min_results = int(os.getenv("EXPANSION_MIN_RESULTS", "4"))
 
     def load_indexed_files(self) -> Dict[str, str]:
         """Load record of what files have been indexed with their hashes"""
@@ -101,14 +269,38 @@ class UNYCompassDatabase:
         return {}
 
     def save_indexed_files(self):
-        """Save record of indexed files"""
+        """Save record of indexed files (and the local vector index that now holds them)"""
+        if self.local_index_path is not None:
+            self.index.save(self.local_index_path)
         with open(self.indexed_files_record, 'w') as f:
             json.dump(self.indexed_files, f, indent=2)
 
-    def get_file_hash(self, file_path: Path) -> str:
-        """Get hash of file to detect changes"""
+    @staticmethod
+    def get_file_hash(file_path: Path) -> str:
+        """Get hash of file to detect changes (streamed, so large crawl outputs aren't read into memory)"""
+        digest = hashlib.md5()
         with open(file_path, 'rb') as f:
-            return hashlib.md5(f.read()).hexdigest()
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def corpus_files(docs_dir: Optional[Path] = None) -> List[Path]:
+        """Crawler outputs that make up the searchable corpus, in indexing order"""
+        docs_dir = Path(docs_dir) if docs_dir else current_dir / "../docs"
+        return [
+            docs_dir / "hunter_hybrid.txt",
+            docs_dir / "hunter_hybrid_urls.json",
+            docs_dir / "hunter_hybrid_analytics.json",
+            docs_dir / "hunter_hybrid_pages.ndjson"
+        ]
+
+    def file_records(self, file_path: Path) -> List[Tuple[str, str, Dict]]:
+        if Path(file_path).suffix == '.ndjson':
+            return list(self.page_records_file_records(str(file_path)))
+        if Path(file_path).suffix == '.json':
+            return self.json_file_records(str(file_path))
+        return self.text_file_records(str(file_path))
 
     def check_and_update_data(self):
         """OPTIMIZED: Check vector DB first, skip file processing if data exists"""
@@ -130,6 +322,9 @@ class UNYCompassDatabase:
             if namespace_vectors > 0:
                 print(f"✅ Found {namespace_vectors} vectors in database - using existing data")
                 print("💡 To force reindexing, set CLEAR_PINECONE_INDEX=true")
+                if len(self.docstore) < namespace_vectors:
+                    print(f"⚠️ Local docstore has {len(self.docstore)} chunk texts for {namespace_vectors} vectors - "
+                          "missing texts are fetched from vector metadata (reindex to populate the docstore)")
                 return  # EXIT HERE - we have data!
             else:
                 print("📁 No data in vector database, checking for local files...")
@@ -151,11 +346,7 @@ class UNYCompassDatabase:
             return
         
         # Rest of file processing logic
-        possible_files = [
-            docs_dir / "hunter_hybrid.txt",              
-            docs_dir / "hunter_hybrid_urls.json",        
-            docs_dir / "hunter_hybrid_analytics.json"    
-        ]
+        possible_files = self.corpus_files(docs_dir)
         
         files_to_process = []
         
@@ -177,6 +368,7 @@ class UNYCompassDatabase:
                     if stats.total_vector_count > 0:
                         print("CLEAR_PINECONE_INDEX=true → Deleting existing data from Pinecone index...")
                         self.index.delete(delete_all=True, namespace=self.namespace)
+                        self.docstore.clear()
                         time.sleep(5)
                     else:
                         print("Index is empty, proceeding with fresh indexing...")
@@ -187,7 +379,9 @@ class UNYCompassDatabase:
 
             # Process all new/updated files
             for file_path, file_hash in files_to_process:
-                if file_path.suffix == '.json':
+                if file_path.suffix == '.ndjson':
+                    self.upload_page_records(str(file_path), file_hash)
+                elif file_path.suffix == '.json':
                     self.upload_json_file(str(file_path), file_hash)
                 else:
                     self.upload_text_file(str(file_path), file_hash)
@@ -196,16 +390,35 @@ class UNYCompassDatabase:
 
     def upload_text_file(self, file_path: str, file_hash: str = None):
         """Enhanced upload with better chunking and metadata"""
+        records = self.text_file_records(file_path)
+        if not records:
+            return
+        
+        self.upsert_records(records, unit="chunks")
+        
+        # Record this file as indexed with its hash
+        if file_hash:
+            self.indexed_files[file_path] = file_hash
+            self.save_indexed_files()
+        
+        print(f"Upload complete: {len(records)} chunks from {Path(file_path).name}")
+
+    def text_file_records(self, file_path: str) -> List[Tuple[str, str, Dict]]:
+        """Chunk a crawled text file into (vector_id, text, metadata) records
+
+        Shared by upload_text_file and the offline snapshot builder (snapshot.py), so both
+        produce the same chunk boundaries, vector IDs and metadata.
+        """
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 text = f.read()
         except FileNotFoundError:
             print(f"Error: File {file_path} not found")
-            return
+            return []
         
         if not text.strip():
             print("No content to upload")
-            return
+            return []
 
         print(f"Processing {Path(file_path).name} with intermediate RAG...")
         
@@ -216,6 +429,7 @@ class UNYCompassDatabase:
             # Split by pages first to preserve page boundaries
             pages = text.split("--- PAGE:")
             
+            parsed_pages = []  # (page_number, url, content)
             for i, page in enumerate(pages[1:], 1):  # Skip first empty part
                 lines = page.strip().split('\n', 1)  # Split on first newline only
                 
@@ -224,23 +438,17 @@ class UNYCompassDatabase:
                     page_content = lines[1].strip()
                     
                     if page_content:
-                        # Extract rich metadata from URL and content
-                        metadata = self.extract_metadata(url_line, page_content)
-                        
-                        # Use smart text splitter on each page
-                        page_chunks = self.text_splitter.split_text(page_content)
-                        
-                        for j, chunk in enumerate(page_chunks):
-                            if chunk.strip():
-                                chunk_metadata = metadata.copy()
-                                chunk_metadata.update({
-                                    'chunk_id': f"page_{i}_chunk_{j}",
-                                    'page_number': i,
-                                    'chunk_number': j,
-                                    'source_file': Path(file_path).name
-                                })
-                                
-                                chunks_with_metadata.append((chunk, chunk_metadata))
+                        parsed_pages.append((i, url_line, page_content))
+            
+            # Chunk all pages at once (process pool for large corpora)
+            chunk_start = time.time()
+            page_chunk_lists = self.text_splitter.split_pages([content for _, _, content in parsed_pages])
+            print(f"✂️ Chunked {len(parsed_pages)} pages in {time.time() - chunk_start:.2f}s")
+            
+            for (i, url_line, page_content), page_chunks in zip(parsed_pages, page_chunk_lists):
+                chunks_with_metadata.extend(
+                    self.page_chunks_with_metadata(i, url_line, page_content, page_chunks, Path(file_path).name)
+                )
         else:
             # Single document - split normally
             chunks = self.text_splitter.split_text(text)
@@ -256,53 +464,187 @@ class UNYCompassDatabase:
         
         if not chunks_with_metadata:
             print("No chunks created")
-            return
+            return []
         
-        # Create embeddings with better model and upload in batches
-        vectors = []
+        return self.build_records(Path(file_path).stem, chunks_with_metadata)
+
+    def page_chunks_with_metadata(self, page_number: int, url: str, page_content: str, page_chunks: List[str],
+                                  source_file: str) -> List[Tuple[str, Dict]]:
+        """(chunk, metadata) pairs for one crawled page, numbered as in the crawler's text file"""
+        # Extract rich metadata from URL and content
+        metadata = self.extract_metadata(url, page_content)
+        
+        chunks_with_metadata = []
+        for j, chunk in enumerate(page_chunks):
+            if chunk.strip():
+                chunk_metadata = metadata.copy()
+                chunk_metadata.update({
+                    'chunk_id': f"page_{page_number}_chunk_{j}",
+                    'page_number': page_number,
+                    'chunk_number': j,
+                    'source_file': source_file
+                })
+                
+                chunks_with_metadata.append((chunk, chunk_metadata))
+        return chunks_with_metadata
+
+    @staticmethod
+    def build_records(id_prefix: str, chunks_with_metadata) -> List[Tuple[str, str, Dict]]:
+        """Attach stable vector IDs and the stored text to (chunk, metadata) pairs"""
+        return list(UNYCompassDatabase.iter_records(id_prefix, chunks_with_metadata))
+
+    @staticmethod
+    def iter_records(id_prefix: str, chunks_with_metadata) -> Iterator[Tuple[str, str, Dict]]:
         for i, (chunk, metadata) in enumerate(chunks_with_metadata):
+            yield UNYCompassDatabase.make_record(f'{id_prefix}_{i}', chunk, metadata)
+
+    @staticmethod
+    def make_record(vector_id: str, chunk: str, metadata: Dict) -> Tuple[str, str, Dict]:
+        # Store more text in metadata
+        metadata['text'] = chunk[:8000]
+        metadata['text_length'] = len(chunk)
+        return vector_id, chunk, metadata
+
+    def upsert_records(self, records: Iterable[Tuple[str, str, Dict]], unit: str = "chunks") -> int:
+        """Embed records and upload them to the index in batches; returns how many records were read"""
+        vectors = []
+        processed = 0
+        for i, (vector_id, chunk, metadata) in enumerate(records):
+            processed = i + 1
             try:
                 embedding = self.model.encode([chunk])[0]
                 
-                # Store more text in metadata
-                metadata['text'] = chunk[:8000]
-                metadata['text_length'] = len(chunk)
-                
                 vectors.append({
-                    'id': f'{Path(file_path).stem}_{i}',
+                    'id': vector_id,
                     'values': embedding.tolist(),
                     'metadata': metadata
                 })
                 
                 # Upload in smaller batches for stability
                 if len(vectors) == 50:
-                    self.index.upsert(vectors=vectors, namespace=self.namespace)
+                    self.upsert_batch(vectors)
                     vectors = []
-                    print(f"Uploaded batch, processed {i+1} chunks...")
+                    print(f"Uploaded batch, processed {i+1} {unit}...")
                     
             except Exception as e:
-                print(f"Error processing chunk {i}: {e}")
+                print(f"Error processing {vector_id}: {e}")
                 continue
         
         # Upload remaining vectors
         if vectors:
-            self.index.upsert(vectors=vectors, namespace=self.namespace)
+            self.upsert_batch(vectors)
+        return processed
+
+    def upsert_batch(self, vectors: List[Dict], namespace: Optional[str] = None):
+        """Store chunk texts locally first, then upsert vectors carrying only IDs and small fields
+
+        `namespace` defaults to the one the bot searches (e.g. crawl_orchestrator indexes each site into its own).
+        """
+        self.docstore.put_many((vector['id'], vector['metadata']['text']) for vector in vectors)
+        if not self.store_text_in_metadata:
+            vectors = [
+                dict(vector, metadata={k: v for k, v in vector['metadata'].items() if k != 'text'})
+                for vector in vectors
+            ]
+        self.index.upsert(vectors=vectors, namespace=namespace or self.namespace)
+
+    def upload_page_records(self, file_path: str, file_hash: str = None):
+        """Index an NDJSON page-records file, streaming it record by record"""
+        count = self.upsert_records(self.page_records_file_records(file_path), unit="pages")
         
-        # Record this file as indexed with its hash
         if file_hash:
             self.indexed_files[file_path] = file_hash
             self.save_indexed_files()
         
-        print(f"Upload complete: {len(chunks_with_metadata)} chunks from {Path(file_path).name}")
+        print(f"Page records upload complete: {count} pages from {Path(file_path).name}")
 
     def upload_json_file(self, file_path: str, file_hash: str = None):
         """Process JSON files with structured Hunter data"""
+        records = self.json_file_records(file_path)
+        if not records:
+            return
+        
+        self.upsert_records(records, unit="items")
+        
+        # Record this file as processed
+        if file_hash:
+            self.indexed_files[file_path] = file_hash
+            self.save_indexed_files()
+        
+        print(f"JSON upload complete: {len(records)} items from {Path(file_path).name}")
+
+    @staticmethod
+    def page_record_chunk(page_data: Dict, source_file: str) -> Optional[Tuple[str, Dict]]:
+        """(text, metadata) describing one crawled page record, or None if it has nothing to index"""
+        # Create rich content from page metadata
+        content_parts = []
+        
+        if page_data.get('title'):
+            content_parts.append(f"Page Title: {page_data['title']}")
+        
+        if page_data.get('url'):
+            content_parts.append(f"URL: {page_data['url']}")
+        
+        if page_data.get('programs'):
+            programs_text = ', '.join(page_data['programs'])
+            content_parts.append(f"Programs: {programs_text}")
+        
+        if page_data.get('degrees'):
+            degrees_text = ', '.join(page_data['degrees'])
+            content_parts.append(f"Degrees: {degrees_text}")
+        
+        if page_data.get('departments'):
+            depts_text = ', '.join(page_data['departments'])
+            content_parts.append(f"Departments: {depts_text}")
+        
+        if page_data.get('schools'):
+            schools_text = ', '.join(page_data['schools'])
+            content_parts.append(f"Schools: {schools_text}")
+        
+        if page_data.get('categories'):
+            categories_text = ', '.join(page_data['categories'])
+            content_parts.append(f"Categories: {categories_text}")
+        
+        content = '\n'.join(content_parts)
+        
+        if content.strip():
+            metadata = {
+                'content_type': 'page_metadata',
+                'url': page_data.get('url', ''),
+                'title': page_data.get('title', ''),
+                'data_type': 'analytics',
+                'source_file': source_file
+            }
+            
+            # Add structured data to metadata
+            if page_data.get('programs'):
+                metadata['programs_mentioned'] = page_data['programs']
+            if page_data.get('degrees'):
+                metadata['degrees_mentioned'] = page_data['degrees']
+            if page_data.get('departments'):
+                metadata['departments_mentioned'] = page_data['departments']
+            
+            return content, metadata
+        return None
+
+    def page_records_file_records(self, file_path: str) -> Iterator[Tuple[str, str, Dict]]:
+        """Stream (vector_id, text, metadata) records from an NDJSON page-records file
+
+        Reads one page record at a time, so memory stays flat however large the crawl was.
+        """
+        source_file = Path(file_path).name
+        print(f"Processing page records: {source_file}")
+        chunks = (self.page_record_chunk(page_data, source_file) for page_data in iter_page_records(file_path))
+        yield from self.iter_records(Path(file_path).stem, (chunk for chunk in chunks if chunk))
+
+    def json_file_records(self, file_path: str) -> List[Tuple[str, str, Dict]]:
+        """Turn a crawler JSON output file into (vector_id, text, metadata) records"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             print(f"Error reading JSON file {file_path}: {e}")
-            return
+            return []
         
         print(f"Processing JSON file: {Path(file_path).name}")
         
@@ -352,56 +694,15 @@ class UNYCompassDatabase:
         elif 'pages_data' in data:
             print("Processing analytics file...")
             
-            for page_data in data.get('pages_data', []):
-                # Create rich content from page metadata
-                content_parts = []
-                
-                if page_data.get('title'):
-                    content_parts.append(f"Page Title: {page_data['title']}")
-                
-                if page_data.get('url'):
-                    content_parts.append(f"URL: {page_data['url']}")
-                
-                if page_data.get('programs'):
-                    programs_text = ', '.join(page_data['programs'])
-                    content_parts.append(f"Programs: {programs_text}")
-                
-                if page_data.get('degrees'):
-                    degrees_text = ', '.join(page_data['degrees'])
-                    content_parts.append(f"Degrees: {degrees_text}")
-                
-                if page_data.get('departments'):
-                    depts_text = ', '.join(page_data['departments'])
-                    content_parts.append(f"Departments: {depts_text}")
-                
-                if page_data.get('schools'):
-                    schools_text = ', '.join(page_data['schools'])
-                    content_parts.append(f"Schools: {schools_text}")
-                
-                if page_data.get('categories'):
-                    categories_text = ', '.join(page_data['categories'])
-                    content_parts.append(f"Categories: {categories_text}")
-                
-                content = '\n'.join(content_parts)
-                
-                if content.strip():
-                    metadata = {
-                        'content_type': 'page_metadata',
-                        'url': page_data.get('url', ''),
-                        'title': page_data.get('title', ''),
-                        'data_type': 'analytics',
-                        'source_file': Path(file_path).name
-                    }
-                    
-                    # Add structured data to metadata
-                    if page_data.get('programs'):
-                        metadata['programs_mentioned'] = page_data['programs']
-                    if page_data.get('degrees'):
-                        metadata['degrees_mentioned'] = page_data['degrees']
-                    if page_data.get('departments'):
-                        metadata['departments_mentioned'] = page_data['departments']
-                    
-                    chunks_with_metadata.append((content, metadata))
+            pages_file = Path(file_path).with_name(Path(file_path).name.replace('_analytics.json', '_pages.ndjson'))
+            if pages_file.exists():
+                # Legacy analytics written alongside the NDJSON page records: index the pages once, from NDJSON
+                print(f"Skipping pages_data (indexed from {pages_file.name})")
+            else:
+                for page_data in data.get('pages_data', []):
+                    chunk = self.page_record_chunk(page_data, Path(file_path).name)
+                    if chunk:
+                        chunks_with_metadata.append(chunk)
         
         # Process crawl metadata
         elif 'crawl_metadata' in data:
@@ -430,46 +731,12 @@ class UNYCompassDatabase:
         
         if not chunks_with_metadata:
             print(f"No processable data found in {Path(file_path).name}")
-            return
+            return []
         
-        # Create embeddings and upload
-        vectors = []
-        for i, (chunk, metadata) in enumerate(chunks_with_metadata):
-            try:
-                embedding = self.model.encode([chunk])[0]
-                
-                # Store the content and metadata
-                metadata['text'] = chunk[:8000]
-                metadata['text_length'] = len(chunk)
-                
-                vectors.append({
-                    'id': f'{Path(file_path).stem}_json_{i}',
-                    'values': embedding.tolist(),
-                    'metadata': metadata
-                })
-                
-                # Upload in batches
-                if len(vectors) == 50:
-                    self.index.upsert(vectors=vectors, namespace=self.namespace)
-                    vectors = []
-                    print(f"Uploaded JSON batch, processed {i+1} items...")
-                    
-            except Exception as e:
-                print(f"Error processing JSON chunk {i}: {e}")
-                continue
-        
-        # Upload remaining vectors
-        if vectors:
-            self.index.upsert(vectors=vectors, namespace=self.namespace)
-        
-        # Record this file as processed
-        if file_hash:
-            self.indexed_files[file_path] = file_hash
-            self.save_indexed_files()
-        
-        print(f"JSON upload complete: {len(chunks_with_metadata)} items from {Path(file_path).name}")
+        return self.build_records(f'{Path(file_path).stem}_json', chunks_with_metadata)
 
-    def extract_metadata(self, url: str, content: str) -> Dict:
+    @staticmethod
+    def extract_metadata(url: str, content: str) -> Dict:
         """Extract rich metadata for better filtering and search"""
         metadata = {
             'url': url if url.startswith('http') else '',
@@ -572,49 +839,208 @@ class UNYCompassDatabase:
         
         return expanded_queries[:3]  # Limit total queries
 
+    def fetch_texts(self, chunk_ids: List[str]) -> Dict[str, str]:
+        """Chunk texts by vector ID from the local docstore
+
+        Vectors uploaded before the docstore existed still carry their text in metadata,
+        so IDs the docstore doesn't know are fetched from the index in one call.
+        """
+        texts = self.docstore.get_many(chunk_ids)
+        missing = [chunk_id for chunk_id in chunk_ids if chunk_id not in texts]
+        if missing:
+            try:
+                with span("metadata_fetch"):
+                    fetched = self.index.fetch(ids=missing, namespace=self.namespace)
+                for chunk_id, vector in fetched['vectors'].items():
+                    metadata = vector['metadata'] or {}
+                    if metadata.get('text'):
+                        texts[chunk_id] = metadata['text']
+            except Exception as e:
+                print(f"Chunk text fetch error: {e}")
+        return texts
+
+    def query_matches(self, query: str, top_k: int, deadline, query_vector=None) -> List[Dict]:
+        """Embed one query (unless its vector is given) and return its matches above the quality cutoff"""
+        if query_vector is None:
+            with span("embed"):
+                query_vector = self.embed_query(query)
+        
+        with span("vector_query"):
+            results = self.query_hedger.call(
+                self.index.query,
+                vector=query_vector.tolist(),
+                top_k=top_k,
+                include_metadata=False,  # Texts come from the local docstore below
+                namespace=self.namespace,
+                deadline=deadline
+            )
+        
+        # Collect results with scores
+        return [
+            {'id': match['id'], 'score': match['score']}
+            for match in results['matches']
+            if match['score'] > 0.3  # Higher threshold for better quality
+        ]
+
+    @lru_cache(maxsize=2048)  # Popular questions and their synonym rewrites repeat
+    def embed_query(self, query: str):
+        return self.model.encode([query])[0]
+
+    def planned_queries(self, query: str) -> List[str]:
+        """The original query followed by the expansions search may run for it"""
+        expanded_queries = self.expand_query(query)
+        if self.query_expansion == 'off':
+            return expanded_queries[:1]
+        return expanded_queries
+
+    def expansion_reason(self, matches: List[Dict]) -> Optional[str]:
+        """Why the original query's matches need expanding (adaptive mode), or None if they are good enough"""
+        if not matches or max(match['score'] for match in matches) < self.expansion_min_score:
+            return 'low_score'
+        if len({match['id'] for match in matches}) < self.expansion_min_results:
+            return 'low_diversity'
+        return None
+
+    def should_expand(self, matches: List[Dict]) -> bool:
+        if self.query_expansion != 'adaptive':
+            return True
+        reason = self.expansion_reason(matches)
+        if reason is None:
+            EXPANSION_DECISIONS.inc(decision='skipped', reason='good_results')
+            return False
+        EXPANSION_DECISIONS.inc(decision='expanded', reason=reason)
+        return True
+
     @lru_cache(maxsize=500)  # Cache recent searches
-    def search(self, query: str, top_k: int = 8) -> List[str]:
-        """OPTIMIZED: Enhanced search with query expansion and deduplication"""
+    def search(self, query: str, top_k: int = 8) -> SearchResults:
+        """OPTIMIZED: Enhanced search with query expansion and deduplication
+
+        In adaptive mode the original query runs first and the synonym expansions only run
+        when its matches are weak (see expansion_reason).
+        """
         
         # Expand query for better results
-        expanded_queries = self.expand_query(query)
+        expanded_queries = self.planned_queries(query)
         all_results = []
+        original_ids = set()
+        expanded = False
+        
+        deadline = current_deadline()
+        truncated = False
         
-        for expanded_query in expanded_queries:
+        for i, expanded_query in enumerate(expanded_queries):
+            # Out of budget: stop issuing expansions and return what we have
+            if deadline is not None and deadline.expired():
+                truncated = True
+                break
+            if i == 1 and not self.should_expand(all_results):
+                break
             try:
-                query_vector = self.model.encode([expanded_query])[0]
-                
-                results = self.index.query(
-                    vector=query_vector.tolist(),
-                    top_k=top_k,
-                    include_metadata=True,
-                    namespace=self.namespace
-                )
-                
-                # Collect results with scores
-                for match in results['matches']:
-                    if match['score'] > 0.3:  # Higher threshold for better quality
-                        all_results.append({
-                            'text': match['metadata']['text'],
-                            'score': match['score'],
-                            'metadata': match['metadata']
-                        })
-                        
+                matches = self.query_matches(expanded_query, top_k, deadline)
+            except DeadlineExceeded:
+                truncated = True
+                break
             except Exception as e:
                 print(f"Search error for query '{expanded_query}': {e}")
                 continue
+            if i == 0:
+                original_ids = {match['id'] for match in matches}
+            else:
+                expanded = True
+                EXPANSION_QUERIES.inc()
+            all_results.extend(matches)
         
+        unique_results = self.rank_texts(all_results, top_k, original_ids, expanded)
+        
+        if truncated:
+            # Raising keeps incomplete results out of the lru_cache; callers use e.partial
+            raise DeadlineExceeded("vector_query", partial=unique_results)
+        
+        return unique_results
+
+    def search_batch(self, queries: List[str], top_k: int = 8, max_workers: int = 16) -> List[SearchResults]:
+        """search() for many queries at once, without the per-query cache or deadline
+
+        The original queries are embedded in one encode() call and sent to the index
+        concurrently; then the expansions the weak ones need go out the same way.
+        """
+        plans = [self.planned_queries(query) for query in queries]
+        all_results = [[] for _ in queries]
+        original_ids = [set() for _ in queries]
+        expanded = [False] * len(queries)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            first_matches = self.query_matches_many([plan[0] for plan in plans], top_k, pool)
+            for i, matches in enumerate(first_matches):
+                all_results[i] = matches or []
+                original_ids[i] = {match['id'] for match in all_results[i]}
+            
+            pending = [
+                (i, expanded_query)
+                for i, plan in enumerate(plans)
+                if len(plan) > 1 and self.should_expand(all_results[i])
+                for expanded_query in plan[1:]
+            ]
+            expansion_matches = self.query_matches_many([query for _, query in pending], top_k, pool)
+            for (i, _), matches in zip(pending, expansion_matches):
+                if matches is not None:
+                    expanded[i] = True
+                    EXPANSION_QUERIES.inc()
+                    all_results[i].extend(matches)
+        
+        return [self.rank_texts(all_results[i], top_k, original_ids[i], expanded[i]) for i in range(len(queries))]
+
+    def query_matches_many(self, queries: List[str], top_k: int, pool) -> List[Optional[List[Dict]]]:
+        """Matches for each query (None where it failed): one batched encode, concurrent index queries"""
+        if not queries:
+            return []
+        with span("embed"):
+            vectors = self.model.encode(queries, batch_size=len(queries))
+        futures = [pool.submit(self.query_matches, query, top_k, None, vector) for query, vector in zip(queries, vectors)]
+        matches = []
+        for query, future in zip(queries, futures):
+            try:
+                matches.append(future.result())
+            except Exception as e:
+                print(f"Search error for query '{query}': {e}")
+                matches.append(None)
+        return matches
+
+    def rank_texts(self, all_results: List[Dict], top_k: int, original_ids=frozenset(),
+                   expanded: bool = False) -> SearchResults:
+        """Best-scoring distinct chunk texts across a search's queries"""
         # Remove duplicates and sort by score
         seen_texts = set()
         unique_results = []
-        
-        for result in sorted(all_results, key=lambda x: x['score'], reverse=True):
-            text_hash = hashlib.md5(result['text'].encode()).hexdigest()
-            if text_hash not in seen_texts:
-                seen_texts.add(text_hash)
-                unique_results.append(result['text'])
-        
-        return unique_results[:top_k]
+        unique_ids = []
+        
+        with span("context_build"):
+            # Best score per chunk ID across expansions; texts are fetched only for what we keep
+            best_scores = {}
+            for result in all_results:
+                if result['score'] > best_scores.get(result['id'], float('-inf')):
+                    best_scores[result['id']] = result['score']
+            ranked_ids = sorted(best_scores, key=best_scores.get, reverse=True)
+            
+            # Fetch top_k at a time; more only if different IDs turn out to share a text
+            for start in range(0, len(ranked_ids), top_k):
+                if len(unique_results) >= top_k:
+                    break
+                window = ranked_ids[start:start + top_k]
+                texts = self.fetch_texts(window)
+                for chunk_id in window:
+                    text = texts.get(chunk_id)
+                    if text is None:
+                        continue
+                    text_hash = hashlib.md5(text.encode()).hexdigest()
+                    if text_hash not in seen_texts:
+                        seen_texts.add(text_hash)
+                        unique_results.append(text)
+                        unique_ids.append(chunk_id)
+                        if expanded and chunk_id not in original_ids and len(unique_results) <= top_k:
+                            EXPANSION_NEW_RESULTS.inc()
+        
+        return SearchResults(unique_results[:top_k], unique_ids[:top_k])
 
 class ConversationMemory:
     """Enhanced conversation memory with context tracking"""
@@ -723,23 +1149,46 @@ class ConversationMemory:
         
         return context
 
+DEGRADED_ANSWERS = REGISTRY.counter(
+    "unycompass_degraded_answers_total", "Answers served retrieval-only because the request budget ran out"
+)
+
 class UNYCompassBot:
     """OPTIMIZED: Bot with session management and persistent connections"""
     
-    def __init__(self, vector_db):
+    def __init__(self, vector_db, llm=None, query_log=None):
         print("🤖 Initializing UNYCompassBot...")
         self.vector_db = vector_db
         
-        # OPTIMIZATION: Reuse OpenAI client connection
-        self.llm = ChatOpenAI(
-            model='gpt-4o-mini', 
-            temperature=0.8,
-            max_retries=2,  # Faster failure
-            request_timeout=30  # 30s timeout instead of default 60s
+        # OPTIMIZATION: Reuse OpenAI client connection (any object with .invoke(prompt).content works)
+        if llm is None:
+            from langchain_openai import ChatOpenAI
+            llm = ChatOpenAI(
+                model='gpt-4o-mini', 
+                temperature=0.8,
+                max_retries=1,  # Hedging + the request deadline cover slow calls
+                request_timeout=30  # 30s timeout instead of default 60s
+            )
+        self.llm = llm
+        
+        # Per-request time budget; past it we answer from retrieved text without the LLM
+        self.answer_budget_s = float(os.getenv("ANSWER_BUDGET_SECONDS", "25"))
+        self.llm_hedger = Hedger(
+            "llm",
+            max_workers=int(os.getenv("LLM_MAX_CONCURRENCY", "64")),
+            initial_delay=float(os.getenv("LLM_HEDGE_INITIAL_DELAY", "8")),
+            max_delay=30.0,
+            enabled=os.getenv("LLM_HEDGING", "true").lower() == "true"
         )
         
         # Store multiple memories by session ID
         self.session_memories = {}  # Dictionary: {session_id: ConversationMemory}
+        
+        # Coalesces concurrent identical questions into one retrieval + LLM call
+        self.inflight_answers = SingleFlight("answer")
+        
+        # Sampled record of real questions, replayed by prewarm() after the next deploy
+        self.query_log = query_log if query_log is not None else QueryLog.from_env(current_dir / "query_log.ndjson")
         print("✅ UNYCompassBot ready!")
     
     def get_memory_for_session(self, session_id):
@@ -793,6 +1242,39 @@ class UNYCompassBot:
             
         return 'general'
 
+    def invoke_llm(self, prompt):
+        """Call the LLM within the current request deadline, hedging unusually slow calls"""
+        return self.llm_hedger.call(self.llm.invoke, prompt).content
+
+    def extractive_answer(self, question, chunks, max_sentences=5):
+        """Retrieval-only fallback: the retrieved sentences that best overlap the question"""
+        if not chunks:
+            return ("I'm sorry - I couldn't look that up in time. Please try again in a moment, "
+                    "or reach out to Hunter College's Office of Advising for help.")
+        
+        stopwords = {'what', 'which', 'where', 'when', 'does', 'have', 'about', 'with', 'that', 'this',
+                     'there', 'their', 'from', 'hunter', 'college', 'can', 'the', 'and', 'for', 'are', 'how'}
+        terms = {word for word in re.findall(r"[a-z]{3,}", question.lower()) if word not in stopwords}
+        
+        candidates = []
+        seen = set()
+        for chunk_rank, chunk in enumerate(chunks):
+            for sentence in re.split(r'(?<=[.!?])\s+|\n+', chunk):
+                sentence = sentence.strip()
+                key = sentence.lower()
+                if len(sentence) < 30 or key in seen:
+                    continue
+                seen.add(key)
+                overlap = len(terms & set(re.findall(r"[a-z]{3,}", key)))
+                # Prefer term overlap, then higher-ranked chunks
+                candidates.append((overlap, -chunk_rank, sentence))
+        
+        best = [c for c in sorted(candidates, reverse=True)[:max_sentences] if c[0] > 0] or \
+            sorted(candidates, reverse=True)[:2]
+        bullet_points = "\n".join(f"- {sentence}" for _, _, sentence in best)
+        return ("I'm taking longer than usual to put together a full answer, so here is the most relevant "
+                f"information I found:\n\n{bullet_points}")
+
     def handle_direct_info(self, question, context, memory):
         """Handle direct informational questions with comprehensive answers"""
         conversation_context = memory.get_conversation_context()
@@ -814,7 +1296,7 @@ Student's question: {question}
 
 Provide a thorough, organized response about Hunter College's academic offerings."""
 
-        return self.llm.invoke(prompt).content
+        return self.invoke_llm(prompt)
 
     def handle_exploration_question(self, question, context, memory):
         """Handle exploration questions - ask questions to understand their interests first"""
@@ -838,7 +1320,7 @@ Student's question: {question}
 
 Help them explore their interests and goals before suggesting specific majors."""
 
-        return self.llm.invoke(prompt).content
+        return self.invoke_llm(prompt)
 
     def handle_frustration(self, question, context, memory):
         """Handle frustrated responses - acknowledge and redirect constructively"""
@@ -861,7 +1343,7 @@ Student's frustrated response: {question}
 
 Respond with understanding and then provide what they're actually looking for."""
 
-        return self.llm.invoke(prompt).content
+        return self.invoke_llm(prompt)
 
     def handle_specific_program(self, question, context, memory):
         """Handle questions about specific programs/majors"""
@@ -884,7 +1366,7 @@ Student's question: {question}
 
 Provide detailed information about the specific program they're interested in."""
 
-        return self.llm.invoke(prompt).content
+        return self.invoke_llm(prompt)
 
     def handle_general_question(self, question, context, memory):
         """Handle general questions"""
@@ -900,54 +1382,216 @@ Student question: {question}
 
 Be helpful, friendly, and conversational. Avoid excessive formatting."""
 
-        return self.llm.invoke(prompt).content
+        return self.invoke_llm(prompt)
 
-    def answer_question(self, question, session_id=None):
-        """Updated to use session-specific memory with timing"""
+    @staticmethod
+    def normalize_question(question: str) -> str:
+        """Canonical form used to recognise identical questions (case, spacing, trailing punctuation)"""
+        return re.sub(r'\s+', ' ', question.lower()).strip().rstrip('?!. ')
+
+    def generate_response(self, question, question_type, memory):
+        """Retrieve context and route to the handler for this question type"""
+        return self.retrieve_and_respond(question, question_type, memory)[0]
+
+    def retrieve_and_respond(self, question, question_type, memory):
+        """generate_response, also returning the retrieved chunks (for the query log)"""
         start_time = time.time()
         
-        # Get session-specific memory
-        if session_id:
-            memory = self.get_memory_for_session(session_id)
-        else:
-            # Fallback for backward compatibility
-            memory = ConversationMemory()
-        
         # Enhanced search with better retrieval
         search_start = time.time()
-        chunks = self.vector_db.search(question, top_k=8)
+        with span("retrieval"):
+            try:
+                chunks = self.vector_db.search(question, top_k=8)
+            except DeadlineExceeded as e:
+                chunks = e.partial or []
         search_time = time.time() - search_start
         
-        context = "\n\n".join(chunks) if chunks else "Limited information available."
-        
-        # Detect what type of question this is
-        question_type = self.detect_question_type(question)
-        
         # Route to appropriate handler with session-specific memory
         llm_start = time.time()
-        
-        if question_type == 'direct_info':
-            response = self.handle_direct_info(question, context, memory)
-        elif question_type == 'exploration':
-            response = self.handle_exploration_question(question, context, memory)
-        elif question_type == 'frustration':
-            response = self.handle_frustration(question, context, memory)
-        elif question_type == 'specific_program':
-            response = self.handle_specific_program(question, context, memory)
-        else:
-            # General response with session memory
-            response = self.handle_general_question(question, context, memory)
-        
+        response = self.respond(question, question_type, chunks, memory)
         llm_time = time.time() - llm_start
         total_time = time.time() - start_time
         
         print(f"⚡ Answer generated - Search: {search_time:.2f}s, LLM: {llm_time:.2f}s, Total: {total_time:.2f}s")
+        return response, chunks
+
+    def respond(self, question, question_type, chunks, memory):
+        """Answer from already-retrieved chunks with the handler for this question type"""
+        with span("context_build"):
+            context = "\n\n".join(chunks) if chunks else "Limited information available."
+        
+        with span("llm"):
+            try:
+                if question_type == 'direct_info':
+                    response = self.handle_direct_info(question, context, memory)
+                elif question_type == 'exploration':
+                    response = self.handle_exploration_question(question, context, memory)
+                elif question_type == 'frustration':
+                    response = self.handle_frustration(question, context, memory)
+                elif question_type == 'specific_program':
+                    response = self.handle_specific_program(question, context, memory)
+                else:
+                    # General response with session memory
+                    response = self.handle_general_question(question, context, memory)
+            except DeadlineExceeded:
+                print(f"⏱️ Answer budget exhausted - falling back to retrieval-only answer")
+                DEGRADED_ANSWERS.inc()
+                response = self.extractive_answer(question, chunks)
+        return response
+
+    def answer_question(self, question, session_id=None, budget_s=None):
+        """Updated to use session-specific memory with timing"""
+        started = time.perf_counter()
+        # Every stage below shares one deadline derived from the request budget
+        deadline = Deadline(self.answer_budget_s if budget_s is None else budget_s)
+        with deadline_scope(deadline):
+            return self._answer_within_deadline(question, session_id, started)
+
+    def _answer_within_deadline(self, question, session_id, started):
+        # Get session-specific memory
+        if session_id:
+            memory = self.get_memory_for_session(session_id)
+        else:
+            # Fallback for backward compatibility
+            memory = ConversationMemory()
+        
+        # Detect what type of question this is
+        with span("analyze"):
+            question_type = self.detect_question_type(question)
+        
+        if memory.get_conversation_context():
+            # Prompt depends on this session's history - never share
+            response, chunks = self.retrieve_and_respond(question, question_type, memory)
+        else:
+            # Burst of identical context-free questions: one retrieval + LLM call serves them all
+            flight_key = (self.normalize_question(question), question_type)
+            (response, chunks), shared = self.inflight_answers.do(
+                flight_key, self.retrieve_and_respond, question, question_type, memory
+            )
+            if shared:
+                print(f"🔗 Joined in-flight answer for: {question[:50]}...")
         
         # Store this exchange in session-specific memory
         memory.add_exchange(question, response)
         
+        if self.query_log.sampled():
+            self.query_log.record({
+                'question': question.strip(),
+                'key': self.normalize_question(question),  # groups variants in top_questions()
+                'question_type': question_type,
+                'chunk_ids': getattr(chunks, 'chunk_ids', []),
+                'latency_ms': round((time.perf_counter() - started) * 1000, 1)
+            })
+        
         return response
 
+    def prewarm(self, questions: List[str]) -> Dict:
+        """Fill the question-type, embedding and retrieval caches for questions students ask often
+
+        Runs each question's retrieval (without the LLM) so the search and embedding caches hold
+        it and the index and docstore pages it reads are resident.
+        """
+        started = time.perf_counter()
+        warmed, failed = 0, 0
+        for question in questions:
+            try:
+                self.detect_question_type(question)
+                self.vector_db.search(question, top_k=8)
+                warmed += 1
+            except Exception as e:
+                failed += 1
+                print(f"⚠️ Prewarm failed for '{question[:50]}': {e}")
+        seconds = time.perf_counter() - started
+        print(f"🔥 Prewarmed {warmed} questions in {seconds:.2f}s")
+        return {'questions': warmed, 'failed': failed, 'seconds': round(seconds, 3)}
+
+    def prewarm_from_log(self, top_n: int) -> Dict:
+        """prewarm() the top_n most frequent questions in the query log"""
+        if not self.query_log.enabled or not self.query_log.path.exists() or top_n <= 0:
+            return {'questions': 0, 'failed': 0, 'seconds': 0.0}
+        return self.prewarm([question for question, _ in top_questions(self.query_log.path, top_n)])
+
+    def answer_batch(self, questions: List[str], max_concurrency: Optional[int] = None,
+                     budget_s: Optional[float] = None, batch_size: int = 32,
+                     llm_slot: Optional[Callable[[Deadline], ContextManager]] = None) -> Iterator[Dict]:
+        """Answer many context-free questions, yielding each result as soon as it is ready
+
+        Questions are retrieved batch_size at a time with search_batch (one encode() call, concurrent
+        vector queries), and their LLM calls run on at most max_concurrency threads
+        (BATCH_LLM_CONCURRENCY, default 8) while the next batch is retrieved. Results arrive in
+        completion order; 'index' is the question's position in the input.
+
+        llm_slot(deadline), if given, is held around each question's LLM call, e.g. an admission
+        slot shared with the ask endpoints. Closing the generator early (the client went away)
+        cancels the questions that haven't started.
+        """
+        max_concurrency = max_concurrency or int(os.getenv("BATCH_LLM_CONCURRENCY", "8"))
+        batch_started = time.perf_counter()
+        
+        pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="batch-llm")
+        futures = set()
+        try:
+            for start in range(0, len(questions), batch_size):
+                group = questions[start:start + batch_size]
+                retrieval_started = time.perf_counter()
+                with span("retrieval"):
+                    chunk_lists = self.vector_db.search_batch(group, top_k=8)
+                retrieval_s = time.perf_counter() - retrieval_started
+                
+                queued_at = time.perf_counter()
+                for offset, (question, chunks) in enumerate(zip(group, chunk_lists)):
+                    futures.add(pool.submit(self._answer_batch_item, start + offset, question, chunks,
+                                            retrieval_s, queued_at, batch_started, budget_s, llm_slot))
+                
+                # Hand back whatever finished while this batch was being retrieved
+                done = {future for future in futures if future.done()}
+                futures -= done
+                for future in done:
+                    yield future.result()
+            
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Normally everything is done by now; after GeneratorExit, drop the questions still queued
+            # rather than waiting for them (the ones already running finish in the background)
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _answer_batch_item(self, index, question, chunks, retrieval_s, queued_at, batch_started, budget_s,
+                           llm_slot=None):
+        started = time.perf_counter()
+        result = {'index': index, 'question': question}
+        deadline = Deadline(self.answer_budget_s if budget_s is None else budget_s)
+        slot_wait = None
+        try:
+            if not question.strip():
+                raise ValueError("Question cannot be empty")
+            with deadline_scope(deadline), (llm_slot(deadline) if llm_slot else nullcontext()) as slot_wait:
+                question_type = self.detect_question_type(question)
+                # Duplicate questions in the batch share one LLM call (live answers return more, so keyed apart)
+                flight_key = ('batch', self.normalize_question(question), question_type)
+                answer, _ = self.inflight_answers.do(
+                    flight_key, self.respond, question, question_type, chunks, ConversationMemory()
+                )
+            result.update(answer=answer, question_type=question_type)
+        except Exception as e:
+            print(f"❌ Batch question {index} failed: {e}")
+            result['error'] = str(e)
+        finished = time.perf_counter()
+        result['timings_ms'] = {
+            'retrieval': round(retrieval_s * 1000, 1),  # shared by the questions retrieved together
+            'queued': round((started - queued_at) * 1000, 1),
+            'llm': round((finished - started) * 1000, 1),
+            'elapsed': round((finished - batch_started) * 1000, 1)
+        }
+        if slot_wait is not None:
+            result['timings_ms']['slot_wait'] = round(slot_wait * 1000, 1)  # included in 'llm'
+        return result
+
+# Export cache effectiveness on /metrics
+REGISTRY.register_cache('search', UNYCompassDatabase.search)
+REGISTRY.register_cache('embedding', UNYCompassDatabase.embed_query)
+REGISTRY.register_cache('question_type', UNYCompassBot.detect_question_type)
+
 # Helper function for backwards compatibility
 def get_database():
     """Create and return a UNYCompassDatabase instance (optimized with singleton)"""
@@ -1,38 +1,83 @@
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse, parse_qs
-import time
 from collections import deque, defaultdict
 import json
 import re
-import hashlib
 import logging
 from datetime import datetime
+from pathlib import Path
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from chunker import RecursiveChunker
+from neardup import NearDuplicateIndex
+from compact_sets import FingerprintSet, fingerprint64, load_sets, save_sets
+from sitemaps import discover_site
+from negative_cache import NegativeCache
+from crawl_metrics import CrawlMetrics
+from page_records import PageRecordWriter
 
 class HybridWebCrawler:
-    def __init__(self, base_url, max_pages=200, delay=1.0, max_workers=3):
+    def __init__(self, base_url, max_pages=200, delay=1.0, max_workers=3, near_duplicate_threshold=0.9,
+                 use_sitemaps=True, negative_cache_path="crawler_negative_cache.json", page_records_path=None,
+                 on_page=None, rebase_seeds=False, hand_listed_seeds=True):
         self.base_url = base_url
         self.max_pages = max_pages
         self.delay = delay
         self.max_workers = max_workers
-        self.visited_urls = set()
+        # Dedup sets hold 64-bit fingerprints (8-16 bytes per entry) rather than URL / MD5 hex strings
+        self.visited_urls = FingerprintSet()
         self.to_visit = deque([base_url])
         self.all_text = ""
         self.page_count = 0
         self.base_domain = urlparse(base_url).netloc
         
         # Enhanced tracking from V2
-        self.content_hashes = set()
+        self.content_hashes = FingerprintSet()
         self.pages_data = []
         self.program_urls = {}
         self.department_urls = {}
         self.school_urls = {}
-        self.seen_paragraphs = set()
+        self.seen_paragraphs = FingerprintSet()
         self.duplicate_count = 0
+        
+        # Near-duplicate pages (same content, different sidebar/nav) via MinHash LSH.
+        # near_duplicate_threshold is the shingle Jaccard similarity; None disables the check
+        self.near_duplicate_index = NearDuplicateIndex(near_duplicate_threshold) if near_duplicate_threshold else None
+        self.near_duplicates = []  # {'url', 'duplicate_of', 'similarity', 'chars', 'chunks'}
+        # Same chunking as UNYCompassDatabase.create_text_splitter, to report chunks not embedded
+        self.chunk_estimator = RecursiveChunker(chunk_size=800, chunk_overlap=100)
         self.failed_urls = []
         self.url_metadata = {}
+        # URLs that failed in earlier runs (404s, downloads, thin pages) are skipped until their entry expires
+        self.negative_cache = NegativeCache(negative_cache_path)
+        # Per-stage timings, bytes, retries and sleeps for the crawl report
+        self.metrics = CrawlMetrics()
+        # Page records are streamed to this NDJSON file as pages are crawled (else written by save_results)
+        self.page_records_path = page_records_path
+        self.page_writer = None
+        # on_page(page_data, content) runs after each crawled page, e.g. ingest.IngestPipeline.submit;
+        # it may block, which slows the crawl down to what the consumer can keep up with
+        self.on_page = on_page
+        
+        self.request_headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Connection': 'keep-alive'
+        }
+        
+        # robots.txt rules and sitemap lastmod dates (filled by discover_sitemap_urls)
+        self.use_sitemaps = use_sitemaps
+        self.robots = None
+        self.sitemap_lastmod = {}
+        # The hand-listed seeds are hunter.cuny.edu URLs; rebase_seeds moves their paths onto base_url
+        # (a local stand-in for hunter.cuny.edu). Otherwise they only apply when crawling hunter.cuny.edu.
+        # hand_listed_seeds=False leaves them out (other colleges: sitemaps and base_url only)
+        self.rebase_seeds = rebase_seeds
+        self.hand_listed_seeds = hand_listed_seeds
+        self.frontier_stats = {'source': 'guessed', 'sitemap_urls': 0, 'sitemaps_fetched': 0,
+                               'discovery_requests': 0, 'crawl_delay': None, 'seeds': 0}
         
         # Enhanced categorization
         self.content_categories = {
@@ -52,11 +97,11 @@ class HybridWebCrawler:
         # Setup logging
         self.setup_logging()
         
+        # Enhanced program detection from V2 (subject areas also drive URL prioritization)
+        self.setup_program_patterns()
+        
         # HYBRID: Use both verified URLs AND comprehensive discovery
         self.setup_hybrid_urls()
-        
-        # Enhanced program detection from V2
-        self.setup_program_patterns()
 
     def setup_logging(self):
         """Setup comprehensive logging"""
@@ -70,9 +115,51 @@ class HybridWebCrawler:
         )
         self.logger = logging.getLogger(__name__)
 
+    def fetch_for_discovery(self, url):
+        """(status, body) for robots.txt / sitemap requests; status 0 on network errors"""
+        try:
+            response = requests.get(url, headers=self.request_headers, timeout=15)
+            self.metrics.record_response(response.status_code, len(response.content))
+            return response.status_code, response.content
+        except requests.RequestException:
+            return 0, b''
+
+    def discover_sitemap_urls(self):
+        """Read robots.txt and the site's sitemaps; return crawlable sitemap URLs, best first"""
+        with self.metrics.stage('discovery'):
+            discovery = discover_site(self.base_url, self.fetch_for_discovery)
+        self.robots = discovery.robots
+        self.frontier_stats['discovery_requests'] = discovery.requests
+        self.frontier_stats['sitemaps_fetched'] = discovery.sitemaps_fetched
+        
+        if discovery.crawl_delay is not None:
+            self.frontier_stats['crawl_delay'] = discovery.crawl_delay
+            if discovery.crawl_delay > self.delay:
+                self.logger.info(f"robots.txt Crawl-delay {discovery.crawl_delay}s overrides delay {self.delay}s")
+                self.delay = discovery.crawl_delay
+        
+        entries = [entry for entry in discovery.entries if self.is_valid_url(entry.url)]
+        for entry in entries:
+            if entry.lastmod is not None:
+                self.sitemap_lastmod[entry.url] = entry.lastmod.isoformat()
+        
+        # Subject/department relevance first, then the site's own <priority>, then most recently modified
+        entries.sort(key=lambda entry: (
+            self.calculate_link_priority(entry.url, ''),
+            entry.priority if entry.priority is not None else 0.5,
+            entry.lastmod.timestamp() if entry.lastmod else 0.0
+        ), reverse=True)
+        self.frontier_stats['sitemap_urls'] = len(entries)
+        self.logger.info(f"Sitemaps: {len(entries)} crawlable URLs from {discovery.sitemaps_fetched} sitemaps "
+                         f"({discovery.requests} requests)")
+        return [entry.url for entry in entries]
+
     def setup_hybrid_urls(self):
         """HYBRID: Combine verified URLs from V2 with comprehensive discovery from V1"""
         
+        # TIER 0: URLs the site publishes in its sitemaps (replace the guessed Tier 2 sub-pages)
+        sitemap_urls = self.discover_sitemap_urls() if self.use_sitemaps else []
+        
         # TIER 1: Verified working URLs (from V2 - high priority)
         verified_urls = [
             # Core academic structure
@@ -127,7 +214,7 @@ class HybridWebCrawler:
             'dance', 'film-media-studies', 'romance-languages'
         ]
         
-        for dept in base_departments:
+        for dept in base_departments if not sitemap_urls else []:
             for subpage in ['undergraduate', 'graduate', 'faculty-and-staff', 'courses', 'research', 'about', 'advising']:
                 department_subpages.append(f"https://hunter.cuny.edu/artsci/{dept}/{subpage}/")
         
@@ -157,18 +244,35 @@ class HybridWebCrawler:
         ]
         
         # Combine all tiers with priority ordering
-        all_priority_urls = verified_urls + department_subpages + specialized_programs + discovery_urls
+        hand_listed_urls = verified_urls + department_subpages + specialized_programs + discovery_urls
+        if not self.hand_listed_seeds:
+            hand_listed_urls = []
+        if self.rebase_seeds:
+            hand_listed_urls = [urljoin(self.base_url, urlparse(url).path) for url in hand_listed_urls]
+        if sitemap_urls:
+            # Hand-listed pages the sitemap confirms go first; ones it doesn't list may be gone, so they go last
+            listed = set(sitemap_urls)
+            all_priority_urls = ([url for url in hand_listed_urls if url in listed] + sitemap_urls +
+                                 [url for url in hand_listed_urls if url not in listed])
+        else:
+            all_priority_urls = hand_listed_urls
         
-        # Add to crawl queue with high priority
+        # Add to crawl queue with high priority, dropping invalid or robots-disallowed URLs
         priority_queue = deque()
+        queued = set()
         for url in all_priority_urls:
-            if url not in self.visited_urls:
-                priority_queue.append(url)
+            if url in queued or url in self.visited_urls or not self.is_valid_url(url):
+                continue
+            queued.add(url)
+            priority_queue.append(url)
+        self.frontier_stats['source'] = 'sitemap' if sitemap_urls else 'guessed'
+        self.frontier_stats['seeds'] = len(priority_queue)
         
         # Prepend priority URLs to main queue
         self.to_visit = priority_queue + self.to_visit
         
-        self.logger.info(f"HYBRID: Added {len(all_priority_urls)} URLs across 4 tiers")
+        self.logger.info(f"HYBRID: Added {len(priority_queue)} of {len(all_priority_urls)} URLs across 4 tiers + sitemaps")
+        self.logger.info(f"  Tier 0 (Sitemaps): {len(sitemap_urls)}")
         self.logger.info(f"  Tier 1 (Verified): {len(verified_urls)}")
         self.logger.info(f"  Tier 2 (Department pages): {len(department_subpages)}")
         self.logger.info(f"  Tier 3 (Specialized): {len(specialized_programs)}")
@@ -355,6 +459,14 @@ class HybridWebCrawler:
             if any(param in query_params for param in skip_params):
                 return False
         
+        # Honor robots.txt Disallow rules once discovery has read them
+        if self.robots is not None and not self.robots.can_fetch('*', url):
+            return False
+        
+        # Known-dead or non-HTML from a previous run
+        if self.negative_cache.is_blocked(url):
+            return False
+        
         return True
 
     def get_links(self, soup, current_url):
@@ -485,44 +597,125 @@ class HybridWebCrawler:
     def get_content_hash(self, text):
         """Generate hash for content deduplication"""
         normalized = re.sub(r'\s+', ' ', text.lower().strip())
-        return hashlib.md5(normalized.encode()).hexdigest()
+        return fingerprint64(normalized)
+
+    def save_dedup_state(self, path):
+        """Checkpoint visited URLs and seen content so a later crawl can resume without refetching"""
+        with self.lock:
+            return save_sets(path, {
+                'visited_urls': self.visited_urls,
+                'content_hashes': self.content_hashes,
+                'seen_paragraphs': self.seen_paragraphs
+            })
+
+    def load_dedup_state(self, path):
+        sets = load_sets(path)
+        with self.lock:
+            self.visited_urls = sets['visited_urls']
+            self.content_hashes = sets['content_hashes']
+            self.seen_paragraphs = sets['seen_paragraphs']
+        self.logger.info(f"Restored dedup state: {len(self.visited_urls)} URLs, "
+                         f"{len(self.content_hashes)} pages, {len(self.seen_paragraphs)} paragraphs")
+
+    def check_near_duplicate(self, url, clean_text):
+        """Record and return the near-duplicate match for this page, or index it as new content"""
+        if self.near_duplicate_index is None:
+            return None
+        fingerprint = self.near_duplicate_index.fingerprint(clean_text)
+        if fingerprint is None:
+            return None
+        with self.lock:
+            match = self.near_duplicate_index.find(fingerprint)
+            if match is None:
+                self.near_duplicate_index.add(url, fingerprint)
+                return None
+            duplicate = {
+                'url': url,
+                'duplicate_of': match[0],
+                'similarity': round(match[1], 3),
+                'chars': len(clean_text),
+                'chunks': len(self.chunk_estimator.split_text(clean_text))
+            }
+            self.near_duplicates.append(duplicate)
+        return duplicate
+
+    def near_duplicate_savings(self):
+        """Pages, characters and chunks kept out of the index by near-duplicate detection"""
+        return {
+            'threshold': self.near_duplicate_index.threshold if self.near_duplicate_index else None,
+            'pages_skipped': len(self.near_duplicates),
+            'chars_skipped': sum(d['chars'] for d in self.near_duplicates),
+            'chunks_saved': sum(d['chunks'] for d in self.near_duplicates)
+        }
+
+    def record_fetch_failure(self, url, failure_class, reason):
+        """Remember a failed URL in the negative cache and return crawl_page's failure result"""
+        self.negative_cache.record_failure(url, failure_class, reason)
+        return None, reason
+
+    @staticmethod
+    def response_bytes(response, content):
+        """Bytes read off the wire (compressed size), falling back to the decoded body length"""
+        try:
+            return int(response.raw.tell())
+        except Exception:
+            return len(content)
 
     def crawl_page(self, url):
         """HYBRID: V2's retry logic with V1's content threshold"""
         max_retries = 2
         for attempt in range(max_retries):
             try:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.5',
-                    'Connection': 'keep-alive'
-                }
+                # Headers first (stream=True), so error pages and downloads are never read
+                with self.metrics.stage('connect'):
+                    response = requests.get(url, headers=self.request_headers, timeout=30, stream=True)
+                if response.status_code >= 400:
+                    self.metrics.record_response(response.status_code, 0)
+                    response.close()
+                    response.raise_for_status()
                 
-                response = requests.get(url, headers=headers, timeout=30)
-                response.raise_for_status()
+                # PDFs, images and links that redirect to downloads
+                content_type = response.headers.get('Content-Type', 'text/html').lower()
+                if 'html' not in content_type:
+                    self.metrics.record_response(response.status_code, 0)
+                    response.close()
+                    return self.record_fetch_failure(url, 'non_html', f"Non-HTML content ({content_type.split(';')[0]})")
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                with self.metrics.stage('download'):
+                    content = response.content
+                self.metrics.record_response(response.status_code, self.response_bytes(response, content))
+                
+                with self.metrics.stage('parse'):
+                    soup = BeautifulSoup(content, 'html.parser')
                 
                 # Extract and process text
-                raw_text = self.extract_text(soup)
+                with self.metrics.stage('extract'):
+                    raw_text = self.extract_text(soup)
                 if raw_text.strip():
-                    clean_text = self.clean_and_deduplicate_text(raw_text)
+                    with self.metrics.stage('paragraph_dedup'):
+                        clean_text = self.clean_and_deduplicate_text(raw_text)
                     
                     # HYBRID: Lower threshold than V2 (150) but higher than V1 (50)
                     if clean_text and len(clean_text) > 100:
-                        content_hash = self.get_content_hash(clean_text)
-                        with self.lock:
-                            if content_hash in self.content_hashes:
-                                self.duplicate_count += 1
-                                return None, "Duplicate content"
-                            self.content_hashes.add(content_hash)
+                        with self.metrics.stage('page_dedup'):
+                            content_hash = self.get_content_hash(clean_text)
+                            with self.lock:
+                                if content_hash in self.content_hashes:
+                                    self.duplicate_count += 1
+                                    return None, "Duplicate content"
+                                self.content_hashes.add(content_hash)
+                            
+                            near_duplicate = self.check_near_duplicate(url, clean_text)
+                            if near_duplicate:
+                                return None, f"Near-duplicate of {near_duplicate['duplicate_of']} ({near_duplicate['similarity']:.2f})"
                         
                         # Extract program information (V2's superior detection)
-                        program_info = self.enhanced_program_detection(soup, url)
+                        with self.metrics.stage('program_detection'):
+                            program_info = self.enhanced_program_detection(soup, url)
                         
                         # Get new links (V1's aggressive discovery)
-                        new_links = self.get_links(soup, url)
+                        with self.metrics.stage('link_scoring'):
+                            new_links = self.get_links(soup, url)
                         
                         page_data = {
                             'url': url,
@@ -534,88 +727,133 @@ class HybridWebCrawler:
                             'schools': program_info['schools'],
                             'categories': program_info['categories'],
                             'timestamp': datetime.now().isoformat(),
+                            'lastmod': self.sitemap_lastmod.get(url),
                             'new_links_found': len(new_links)
                         }
                         
+                        self.negative_cache.record_success(url)
                         return {
                             'url': url,
                             'content': clean_text,
                             'page_data': page_data,
                             'new_links': new_links
                         }, "Success"
+
+                    if len(raw_text.strip()) > 100:
+                        # Enough text, but its paragraphs were all seen on earlier pages. That depends on
+                        # crawl order, not on the URL, so it isn't remembered in the negative cache
+                        return None, f"Duplicate paragraphs ({len(raw_text)} chars, all seen on earlier pages)"
+
+                return self.record_fetch_failure(url, 'thin_content', f"Insufficient content ({len(raw_text)} chars)")
                 
-                return None, f"Insufficient content ({len(raw_text)} chars)"
-                
+            except requests.HTTPError as e:
+                # 4xx answers won't change on an immediate retry; 5xx and 429 might
+                status = e.response.status_code if e.response is not None else 0
+                transient = status >= 500 or status == 429
+                if transient and attempt < max_retries - 1:
+                    self.metrics.record_retry(f"http_{status}")
+                    self.metrics.wait(1, reason='retry_backoff')
+                    continue
+                failure_class = 'server_error' if transient else 'not_found' if status in (404, 410) else 'client_error'
+                return self.record_fetch_failure(url, failure_class, f"Request error: {str(e)}")
             except requests.RequestException as e:
                 if attempt < max_retries - 1:
-                    time.sleep(1)
+                    self.metrics.record_retry(type(e).__name__)
+                    self.metrics.wait(1, reason='retry_backoff')
                     continue
-                return None, f"Request error: {str(e)}"
+                return self.record_fetch_failure(url, 'network', f"Request error: {str(e)}")
             except Exception as e:
                 return None, f"Processing error: {str(e)}"
 
     def crawl(self):
         """HYBRID: V1's aggressive coverage with V2's quality tracking"""
-        self.logger.info(f"🚀 Starting HYBRID crawl of {self.base_url}")
-        self.logger.info(f"📊 Target: {self.max_pages} pages with {self.max_workers} workers")
-        self.logger.info(f"🎯 HYBRID approach: Maximum coverage + Enhanced quality")
-        
-        start_time = datetime.now()
-        
-        while self.to_visit and self.page_count < self.max_pages:
-            current_url = self.to_visit.popleft()
-            
-            if current_url in self.visited_urls:
-                continue
-                
+        self.start_crawl()
+        while True:
+            current_url = self.next_url()
+            if current_url is None:
+                break
             try:
-                self.page_count += 1
-                progress = f"[{self.page_count}/{self.max_pages}]"
-                print(f"\n📄 {progress} {current_url}")
-                
                 result, status = self.crawl_page(current_url)
-                
-                if result:
-                    # Add content
-                    self.all_text += f"\n\n--- PAGE: {current_url} ---\n\n"
-                    self.all_text += result['content']
-                    self.pages_data.append(result['page_data'])
-                    
-                    # Add new links to queue
-                    links_added = 0
-                    for new_link in result['new_links']:
-                        if (new_link not in self.visited_urls and 
-                            new_link not in self.to_visit):
-                            self.to_visit.append(new_link)
-                            links_added += 1
-                    
-                    print(f"  ✅ Added content ({result['page_data']['text_length']} chars, +{links_added} links)")
-                else:
-                    self.failed_urls.append({'url': current_url, 'reason': status})
-                    print(f"  ⏭️ Skipped - {status}")
-                
-                self.visited_urls.add(current_url)
-                
-                # Progress update every 25 pages
-                if self.page_count % 25 == 0:
-                    elapsed = datetime.now() - start_time
-                    rate = self.page_count / elapsed.total_seconds() * 60
-                    queue_size = len(self.to_visit)
-                    
-                    print(f"📈 Progress: {self.page_count}/{self.max_pages} pages "
-                          f"({rate:.1f} pages/min, queue: {queue_size})")
-                    print(f"   🏫 Schools: {len(self.school_urls)}, 🎓 Departments: {len(self.department_urls)}")
+                self.record_page(current_url, result, status)
                 
                 # Be polite to the server
-                time.sleep(self.delay)
+                self.metrics.wait(self.delay, reason='politeness')
                 
             except Exception as e:
                 print(f"  ❌ Error: {e}")
                 self.failed_urls.append({'url': current_url, 'reason': str(e)})
                 continue
         
+        return self.finish_crawl()
+
+    # crawl() is built from the steps below; crawl_orchestrator.CrawlOrchestrator drives them
+    # directly to interleave many sites' crawlers on one worker pool
+
+    def start_crawl(self):
+        self.logger.info(f"🚀 Starting HYBRID crawl of {self.base_url}")
+        self.logger.info(f"📊 Target: {self.max_pages} pages with {self.max_workers} workers")
+        self.logger.info(f"🎯 HYBRID approach: Maximum coverage + Enhanced quality")
+        
+        self.crawl_started_at = datetime.now()
+        self.metrics.start()
+        if self.page_records_path:
+            self.page_writer = PageRecordWriter(self.page_records_path)
+
+    def next_url(self):
+        """Claim the next unvisited URL from the frontier; None once the crawl is done"""
+        while self.to_visit and self.page_count < self.max_pages:
+            current_url = self.to_visit.popleft()
+            if current_url in self.visited_urls:
+                continue
+            self.page_count += 1
+            print(f"\n📄 [{self.page_count}/{self.max_pages}] {current_url}")
+            return current_url
+        return None
+
+    def record_page(self, current_url, result, status):
+        """Store a crawl_page() result: content, page record, on_page callback and new frontier links"""
+        if result:
+            # Add content
+            self.all_text += f"\n\n--- PAGE: {current_url} ---\n\n"
+            self.all_text += result['content']
+            self.pages_data.append(result['page_data'])
+            if self.page_writer:
+                self.page_writer.write(result['page_data'])
+            if self.on_page:
+                self.on_page(result['page_data'], result['content'])
+            
+            # Add new links to queue
+            links_added = 0
+            for new_link in result['new_links']:
+                if (new_link not in self.visited_urls and 
+                    new_link not in self.to_visit):
+                    self.to_visit.append(new_link)
+                    links_added += 1
+            
+            print(f"  ✅ Added content ({result['page_data']['text_length']} chars, +{links_added} links)")
+        else:
+            self.failed_urls.append({'url': current_url, 'reason': status})
+            print(f"  ⏭️ Skipped - {status}")
+        
+        self.visited_urls.add(current_url)
+        
+        # Progress update every 25 pages
+        if self.page_count % 25 == 0:
+            elapsed = datetime.now() - self.crawl_started_at
+            rate = self.page_count / elapsed.total_seconds() * 60
+            queue_size = len(self.to_visit)
+            
+            print(f"📈 Progress: {self.page_count}/{self.max_pages} pages "
+                  f"({rate:.1f} pages/min, queue: {queue_size})")
+            print(f"   🏫 Schools: {len(self.school_urls)}, 🎓 Departments: {len(self.department_urls)}")
+
+    def finish_crawl(self):
+        """Close the page records, save the negative cache and print the crawl summary"""
         # Final statistics
-        elapsed = datetime.now() - start_time
+        self.metrics.finish()
+        if self.page_writer:
+            self.page_writer.close()
+        elapsed = datetime.now() - self.crawl_started_at
         print(f"\n🎉 HYBRID Crawling complete!")
         print(f"⏱️ Time elapsed: {elapsed}")
         print(f"📄 Successfully crawled: {len(self.pages_data)} pages")
@@ -623,13 +861,29 @@ class HybridWebCrawler:
         print(f"🎓 Departments found: {len(self.department_urls)}")
         print(f"📚 Programs found: {len(self.program_urls)}")
         print(f"🚫 Duplicates removed: {self.duplicate_count}")
+        savings = self.near_duplicate_savings()
+        print(f"🪞 Near-duplicates skipped: {savings['pages_skipped']} pages "
+              f"({savings['chars_skipped']:,} chars, ~{savings['chunks_saved']} chunks not embedded)")
         print(f"❌ Failed URLs: {len(self.failed_urls)}")
+        self.negative_cache.save()
+        negative = self.negative_cache.stats()
+        print(f"🪦 Known-dead URLs skipped: {negative['urls_skipped']} (~{negative['fetches_avoided']} fetches avoided, "
+              f"{negative['entries']} cached failures)")
         print(f"📝 Total content: {len(self.all_text):,} characters")
+        report = self.metrics.report()
+        by_category = report['time_by_category_seconds']
+        print(f"⏱️ Network {by_category['network']:.1f}s, processing {by_category['processing']:.1f}s, "
+              f"waiting {by_category['waiting']:.1f}s ({report['bytes_received'] / 1e6:.1f} MB, "
+              f"{report['retries']} retries) - bound by {report['bound_by']}")
         
         return self.all_text
 
-    def save_results(self, filename="../docs/hunter_hybrid.txt"):
-        """Save hybrid crawling results"""
+    def save_results(self, filename="../docs/hunter_hybrid.txt", legacy_analytics=False):
+        """Save hybrid crawling results
+
+        Page records go to <name>_pages.ndjson; legacy_analytics=True also embeds them (and the
+        URL mappings) in <name>_analytics.json, as older tooling expects.
+        """
         try:
             # Save main content
             with open(filename, 'w', encoding='utf-8') as f:
@@ -647,6 +901,14 @@ class HybridWebCrawler:
             with open(url_file, 'w', encoding='utf-8') as f:
                 json.dump(url_mappings, f, indent=2, sort_keys=True)
             
+            # Page records, unless the crawl already streamed them to this file
+            pages_file = filename.replace('.txt', '_pages.ndjson')
+            streamed = self.page_writer is not None and Path(self.page_records_path).resolve() == Path(pages_file).resolve()
+            if not streamed:
+                with PageRecordWriter(pages_file) as writer:
+                    for page_data in self.pages_data:
+                        writer.write(page_data)
+            
             # Save detailed analytics
             analytics = {
                 'crawl_metadata': {
@@ -656,6 +918,9 @@ class HybridWebCrawler:
                     'total_pages_crawled': len(self.pages_data),
                     'total_content_length': len(self.all_text),
                     'duplicates_removed': self.duplicate_count,
+                    'near_duplicates': self.near_duplicate_savings(),
+                    'frontier': self.frontier_stats,
+                    'negative_cache': self.negative_cache.stats(),
                     'failed_urls_count': len(self.failed_urls)
                 },
                 'findings': {
@@ -671,18 +936,27 @@ class HybridWebCrawler:
                         for degree in page.get('degrees', [])
                     ))
                 },
-                'url_mappings': url_mappings,
-                'pages_data': self.pages_data,
+                'page_records': Path(pages_file).name,
+                'near_duplicates': self.near_duplicates,
                 'performance_metrics': self.calculate_performance_metrics()
             }
+            if legacy_analytics:
+                analytics['url_mappings'] = url_mappings
+                analytics['pages_data'] = self.pages_data
             
             analytics_file = filename.replace('.txt', '_analytics.json')
             with open(analytics_file, 'w', encoding='utf-8') as f:
                 json.dump(analytics, f, indent=2)
             
+            report_file = filename.replace('.txt', '_crawl_report.json')
+            with open(report_file, 'w', encoding='utf-8') as f:
+                json.dump(self.crawl_report(), f, indent=2)
+            
             print(f"\n✅ Content saved to: {filename}")
             print(f"✅ URL mappings: {url_file}")
+            print(f"✅ Page records: {pages_file}")
             print(f"✅ Analytics: {analytics_file}")
+            print(f"✅ Crawl report: {report_file}")
             
             # Display summary
             self.display_hybrid_summary()
@@ -690,12 +964,33 @@ class HybridWebCrawler:
         except Exception as e:
             print(f"❌ Error saving: {e}")
 
+    def crawl_report(self):
+        """Where the crawl's time went (network, processing, sleeps) plus its outcome, for tooling"""
+        performance = self.calculate_performance_metrics()
+        return {
+            'base_url': self.base_url,
+            'max_pages': self.max_pages,
+            'delay': self.delay,
+            'pages_attempted': self.page_count,
+            'pages_crawled': len(self.pages_data),
+            'pages_failed': len(self.failed_urls),
+            'content_chars': len(self.all_text),
+            'pages_per_minute': performance.get('pages_per_minute'),
+            'content_per_minute': performance.get('content_per_minute'),
+            **self.metrics.report(),
+            'frontier': self.frontier_stats,
+            'negative_cache': self.negative_cache.stats(),
+            'near_duplicates': self.near_duplicate_savings(),
+        }
+
     def calculate_performance_metrics(self):
         """Calculate comprehensive performance metrics"""
         if not self.pages_data:
             return {}
         
         text_lengths = [page['text_length'] for page in self.pages_data]
+        wall_seconds = self.metrics.wall_seconds()
+        wall_minutes = wall_seconds / 60 if wall_seconds else None
         total_urls_processed = len(self.pages_data) + len(self.failed_urls)
         success_rate = len(self.pages_data) / total_urls_processed if total_urls_processed > 0 else 0
         
@@ -706,7 +1001,8 @@ class HybridWebCrawler:
             'max_page_length': max(text_lengths),
             'pages_with_programs': len([p for p in self.pages_data if p.get('programs')]),
             'pages_with_degrees': len([p for p in self.pages_data if p.get('degrees')]),
-            'content_per_minute': len(self.all_text) / max(1, (datetime.now() - datetime.now()).total_seconds() / 60),
+            'pages_per_minute': round(len(self.pages_data) / wall_minutes, 2) if wall_minutes else None,
+            'content_per_minute': round(len(self.all_text) / wall_minutes) if wall_minutes else None,
             'duplicate_rate': round(self.duplicate_count / (len(self.pages_data) + self.duplicate_count) * 100, 2) if (len(self.pages_data) + self.duplicate_count) > 0 else 0
         }
 
@@ -723,6 +1019,9 @@ class HybridWebCrawler:
         print(f"   • Content volume: {len(self.all_text):,} characters")
         print(f"   • Success rate: {metrics.get('success_rate', 0):.1f}%")
         print(f"   • Average page length: {metrics.get('avg_page_length', 0):.0f} characters")
+        savings = self.near_duplicate_savings()
+        print(f"   • Near-duplicates skipped: {savings['pages_skipped']} pages, ~{savings['chunks_saved']} chunks saved")
+        print(f"   • Fetches avoided by the negative cache: ~{self.negative_cache.stats()['fetches_avoided']}")
         
         print(f"\n🏫 INSTITUTIONAL COVERAGE:")
         print(f"   • Schools found: {len(self.school_urls)}")
@@ -814,7 +1113,8 @@ def crawl_hunter_hybrid():
         base_url="https://hunter.cuny.edu",
         max_pages=200,  # V1's aggressive target
         delay=1.0,      # V1's faster crawling
-        max_workers=3   # V1's parallel processing
+        max_workers=3,  # V1's parallel processing
+        page_records_path="../docs/hunter_hybrid_pages.ndjson"  # streamed as pages are crawled
     )
     
     # Execute hybrid crawl
@@ -0,0 +1,338 @@
+"""Streaming crawl -> chunk -> embed -> upsert pipeline
+
+Instead of crawling everything, writing docs/, and re-reading and re-splitting it when the API
+next starts, crawl_and_index() hands each crawled page to a chain of worker threads joined by
+bounded queues:
+
+    crawler (caller's thread) -> pages -> chunk -> records -> embed -> batches -> upsert
+
+Each stage blocks when its output queue is full, so the slowest stage sets the pace for all of
+them (the crawler included) and memory stays bounded. Pages become searchable a batch at a time
+while the crawl is still running. Vector IDs and metadata match what check_and_update_data would
+produce from the saved hunter_hybrid.txt / _pages.ndjson, so re-indexing those files overwrites
+rather than duplicates.
+
+Usage:
+    python ingest.py --max-pages 200
+"""
+import argparse
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+_STOP = object()
+
+
+class StageStats:
+    """Counters for one pipeline stage
+
+    busy: time spent doing the stage's work; starved: waiting for input; blocked: waiting for
+    room in the next queue (backpressure from downstream).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.starved_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.errors = 0
+
+    def report(self, wall_seconds: float) -> Dict:
+        return {
+            'items': self.items,
+            'errors': self.errors,
+            'busy_seconds': round(self.busy_seconds, 3),
+            'starved_seconds': round(self.starved_seconds, 3),
+            'blocked_seconds': round(self.blocked_seconds, 3),
+            'utilization': round(self.busy_seconds / wall_seconds, 3) if wall_seconds else None,
+            'items_per_second': round(self.items / wall_seconds, 2) if wall_seconds else None,
+        }
+
+
+class IngestPipeline:
+    """Chunk, embed and upsert crawled pages on background threads as they arrive
+
+    submit(page_data, content) is the crawler's on_page callback. Call start() before the crawl
+    and close() after it; close() drains the queues and returns report().
+    """
+
+    STAGES = ('crawl', 'chunk', 'embed', 'upsert')
+
+    def __init__(self, db, id_prefix: str = "hunter_hybrid", pages_prefix: str = "hunter_hybrid_pages",
+                 queue_size: int = 32, embed_batch_size: int = 64, upsert_batch_size: int = 50,
+                 progress_every: int = 25, namespace: Optional[str] = None):
+        self.db = db
+        self.namespace = namespace  # None: the database's own namespace
+        self.id_prefix = id_prefix
+        self.pages_prefix = pages_prefix
+        self.embed_batch_size = embed_batch_size
+        self.upsert_batch_size = upsert_batch_size
+        self.progress_every = progress_every
+
+        self.pages = queue.Queue(maxsize=queue_size)
+        self.records = queue.Queue(maxsize=queue_size * 4)
+        self.batches = queue.Queue(maxsize=max(2, queue_size // 8))
+        self.stats = {name: StageStats(name) for name in self.STAGES}
+        self.max_depth = {'pages': 0, 'records': 0, 'batches': 0}
+
+        # Same numbering as text_file_records / page_records_file_records on the saved files
+        self.page_number = 0
+        self.chunk_number = 0
+        self.page_record_number = 0
+
+        self._threads: List[threading.Thread] = []
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self.first_searchable_seconds: Optional[float] = None
+
+    def start(self):
+        self._started_at = time.perf_counter()
+        self._finished_at = None
+        for name, target in (('chunk', self._chunk_worker), ('embed', self._embed_worker),
+                             ('upsert', self._upsert_worker)):
+            thread = threading.Thread(target=target, name=f"ingest-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def submit(self, page_data: Dict, content: str):
+        """Queue one crawled page; blocks while the pipeline is full"""
+        self._put(self.pages, (page_data, content), self.stats['crawl'], 'pages')
+        self.stats['crawl'].items += 1
+
+    def submit_records(self, records):
+        """Queue ready-made (vector_id, text, metadata) records for embedding, e.g. json_file_records"""
+        for record in records:
+            self._put(self.records, record, self.stats['crawl'], 'records')
+
+    def close(self) -> Dict:
+        """Wait for every queued page to be indexed, stop the workers and return the report"""
+        self.pages.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self._finished_at = time.perf_counter()
+        return self.report()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        if self._threads:
+            self.close()
+
+    def _put(self, target: queue.Queue, item, stats: StageStats, queue_name: str):
+        started = time.perf_counter()
+        target.put(item)
+        stats.blocked_seconds += time.perf_counter() - started
+        self.max_depth[queue_name] = max(self.max_depth[queue_name], target.qsize())
+
+    def _get(self, source: queue.Queue, stats: StageStats):
+        started = time.perf_counter()
+        item = source.get()
+        stats.starved_seconds += time.perf_counter() - started
+        return item
+
+    def _drain(self, source: queue.Queue, first, limit: int):
+        """first plus whatever is already waiting, up to limit items (stops at the end marker)
+
+        Batches fill up when upstream is ahead and stay small when it is not, so pages are
+        indexed without waiting for a full batch.
+        """
+        items = [first]
+        while len(items) < limit:
+            try:
+                item = source.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return items, True
+            items.append(item)
+        return items, False
+
+    def _chunk_worker(self):
+        stats = self.stats['chunk']
+        while True:
+            item = self._get(self.pages, stats)
+            if item is _STOP:
+                self._put(self.records, _STOP, stats, 'records')
+                return
+            page_data, content = item
+            started = time.perf_counter()
+            records = []
+            try:
+                records = self.page_records(page_data, content)
+            except Exception as e:
+                stats.errors += 1
+                print(f"Error chunking {page_data.get('url')}: {e}")
+            stats.busy_seconds += time.perf_counter() - started
+            stats.items += 1
+            for record in records:
+                self._put(self.records, record, stats, 'records')
+
+    def page_records(self, page_data: Dict, content: str) -> List:
+        """(vector_id, text, metadata) records for one page: its text chunks and its metadata summary"""
+        self.page_number += 1
+        url = page_data.get('url', '')
+        content = content.strip()
+        records = []
+        if content:
+            chunks = self.db.text_splitter.split_text(content)
+            for chunk, metadata in self.db.page_chunks_with_metadata(
+                    self.page_number, url, content, chunks, f"{self.id_prefix}.txt"):
+                records.append(self.db.make_record(f"{self.id_prefix}_{self.chunk_number}", chunk, metadata))
+                self.chunk_number += 1
+        summary = self.db.page_record_chunk(page_data, f"{self.pages_prefix}.ndjson")
+        if summary:
+            records.append(self.db.make_record(f"{self.pages_prefix}_{self.page_record_number}", *summary))
+            self.page_record_number += 1
+        return records
+
+    def _embed_worker(self):
+        stats = self.stats['embed']
+        stopped = False
+        while not stopped:
+            first = self._get(self.records, stats)
+            if first is _STOP:
+                break
+            records, stopped = self._drain(self.records, first, self.embed_batch_size)
+            started = time.perf_counter()
+            vectors = []
+            try:
+                embeddings = self.db.model.encode([chunk for _, chunk, _ in records], batch_size=len(records))
+                vectors = [
+                    {'id': vector_id, 'values': embedding.tolist(), 'metadata': metadata}
+                    for (vector_id, _, metadata), embedding in zip(records, embeddings)
+                ]
+            except Exception as e:
+                stats.errors += len(records)
+                print(f"Error embedding {len(records)} chunks: {e}")
+            stats.busy_seconds += time.perf_counter() - started
+            stats.items += len(vectors)
+            if vectors:
+                self._put(self.batches, vectors, stats, 'batches')
+        self._put(self.batches, _STOP, stats, 'batches')
+
+    def _upsert_worker(self):
+        from hunter_ai import UNYCompassDatabase
+
+        stats = self.stats['upsert']
+        while True:
+            vectors = self._get(self.batches, stats)
+            if vectors is _STOP:
+                return
+            started = time.perf_counter()
+            for i in range(0, len(vectors), self.upsert_batch_size):
+                batch = vectors[i:i + self.upsert_batch_size]
+                try:
+                    self.db.upsert_batch(batch, namespace=self.namespace)
+                except Exception as e:
+                    stats.errors += len(batch)
+                    print(f"Error upserting {len(batch)} vectors: {e}")
+                    continue
+                stats.items += len(batch)
+            # Cached search results predate these vectors
+            UNYCompassDatabase.search.cache_clear()
+            stats.busy_seconds += time.perf_counter() - started
+            if self.first_searchable_seconds is None and stats.items:
+                self.first_searchable_seconds = time.perf_counter() - self._started_at
+            if self.progress_every and stats.items // self.progress_every != (stats.items - len(vectors)) // self.progress_every:
+                print(f"📥 Indexed {stats.items} chunks from {self.stats['chunk'].items} pages "
+                      f"(queued: {self.pages.qsize()} pages, {self.records.qsize()} chunks)")
+
+    def wall_seconds(self) -> Optional[float]:
+        if self._started_at is None:
+            return None
+        return (self._finished_at or time.perf_counter()) - self._started_at
+
+    def report(self) -> Dict:
+        wall = self.wall_seconds() or 0.0
+        stages = {name: stats.report(wall) for name, stats in self.stats.items()}
+        # The crawl stage's busy time is whatever it did not spend blocked on the pipeline
+        crawl = self.stats['crawl']
+        stages['crawl']['busy_seconds'] = round(max(wall - crawl.blocked_seconds, 0.0), 3)
+        stages['crawl']['utilization'] = round(stages['crawl']['busy_seconds'] / wall, 3) if wall else None
+        return {
+            'wall_seconds': round(wall, 3),
+            'pages': self.stats['chunk'].items,
+            'chunks_indexed': self.stats['upsert'].items,
+            'first_searchable_seconds': round(self.first_searchable_seconds, 3)
+            if self.first_searchable_seconds is not None else None,
+            'stages': stages,
+            'max_queue_depth': dict(self.max_depth),
+            'bottleneck': max(stages, key=lambda name: stages[name]['busy_seconds']),
+        }
+
+
+def print_report(report: Dict):
+    print(f"\n📥 Ingest pipeline: {report['pages']} pages, {report['chunks_indexed']} chunks indexed "
+          f"in {report['wall_seconds']:.1f}s (first searchable after {report['first_searchable_seconds']}s)")
+    for name, stage in report['stages'].items():
+        print(f"   {name:<7} {stage['items']:>6} items  busy {stage['busy_seconds']:>7.2f}s  "
+              f"blocked {stage['blocked_seconds']:>7.2f}s  starved {stage['starved_seconds']:>7.2f}s")
+    print(f"   🐢 Bottleneck: {report['bottleneck']}")
+
+
+def mark_indexed(db, saved_files: List[Path]):
+    """Record the crawl outputs the pipeline already indexed, so check_and_update_data skips them"""
+    saved = {Path(path).resolve() for path in saved_files}
+    marked = [file_path for file_path in db.corpus_files() if file_path.resolve() in saved and file_path.exists()]
+    for file_path in marked:
+        db.indexed_files[str(file_path)] = db.get_file_hash(file_path)
+    if marked:
+        db.save_indexed_files()
+
+
+def crawl_and_index(crawler, db, output: str = "../docs/hunter_hybrid.txt", **pipeline_options) -> Dict:
+    """Crawl with `crawler` while indexing its pages into `db`, then save the crawl outputs
+
+    The URL-mapping and analytics JSON files are written at the end of the crawl and go through
+    the same embed/upsert stages before the pipeline closes.
+    """
+    output = Path(output)
+    saved_files = [output, output.with_name(f"{output.stem}_pages.ndjson")]
+    pipeline = IngestPipeline(db, id_prefix=output.stem, pages_prefix=f"{output.stem}_pages", **pipeline_options)
+    crawler.on_page = pipeline.submit
+    pipeline.start()
+    try:
+        crawler.crawl()
+        crawler.save_results(str(output))
+        for name in (f"{output.stem}_urls.json", f"{output.stem}_analytics.json"):
+            json_file = output.with_name(name)
+            if json_file.exists():
+                pipeline.submit_records(db.json_file_records(str(json_file)))
+                saved_files.append(json_file)
+    finally:
+        report = pipeline.close()
+        crawler.on_page = None
+    print_report(report)
+    mark_indexed(db, saved_files)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawl Hunter College and index pages as they are crawled")
+    parser.add_argument('--base-url', default="https://hunter.cuny.edu")
+    parser.add_argument('--max-pages', type=int, default=200)
+    parser.add_argument('--delay', type=float, default=1.0)
+    parser.add_argument('--output', default="../docs/hunter_hybrid.txt")
+    parser.add_argument('--queue-size', type=int, default=32)
+    parser.add_argument('--embed-batch-size', type=int, default=64)
+    args = parser.parse_args(argv)
+
+    from hunter_ai import UNYCompassDatabase
+    from hunter_main import HybridWebCrawler
+
+    db = UNYCompassDatabase()
+    output = Path(args.output)
+    crawler = HybridWebCrawler(args.base_url, max_pages=args.max_pages, delay=args.delay,
+                               page_records_path=str(output.with_name(f"{output.stem}_pages.ndjson")))
+    crawl_and_index(crawler, db, str(output), queue_size=args.queue_size, embed_batch_size=args.embed_batch_size)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
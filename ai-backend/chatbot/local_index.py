@@ -0,0 +1,680 @@
+import json
+import math
+import os
+import threading
+import zipfile
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Rows scored per matrix product while assigning vectors to IVF lists (bounds temporary memory)
+_ASSIGN_BLOCK = 16384
+# Rows widened to float32 at a time when scoring float16 / int8 codes (small enough to stay in cache)
+_SCORE_BLOCK = 256
+# Rows sampled to fit a VectorCodec's PCA projection and int8 ranges
+_CODEC_SAMPLE = 20000
+
+STORAGE_MODES = ("float32", "float16", "int8")
+
+
+class VectorCodec:
+    """Compact copy of a namespace's rows for a fast first pass: optional PCA projection, then float16 or int8
+
+    A row x is stored as y = P x (P: the top `pca_dimension` principal directions, or identity), then
+    as float16 or as int8 with per-dimension ranges. Dot products with P q rank rows as x . q would, up
+    to the variance PCA drops and the rounding, so queries take the best candidates from the codes and
+    rescore those against the full-precision rows.
+    """
+
+    def __init__(self, storage: str, components: Optional[np.ndarray] = None, low: Optional[np.ndarray] = None,
+                 step: Optional[np.ndarray] = None, trained_size: int = 0):
+        self.storage = storage
+        self.components = components  # (pca_dimension, dimension) or None
+        self.low = low                # int8 only: per-dimension minimum and bucket width
+        self.step = step
+        self.trained_size = trained_size
+
+    @property
+    def dtype(self):
+        return {'float32': np.float32, 'float16': np.float16, 'int8': np.int8}[self.storage]
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return len(self.components) if self.components is not None else None
+
+    @classmethod
+    def fit(cls, storage: str, matrix: np.ndarray, size: int, pca_dimension: Optional[int] = None,
+            seed: int = 0) -> "VectorCodec":
+        """PCA directions and int8 ranges from a sample of the first `size` rows"""
+        rng = np.random.default_rng(seed)
+        sample_rows = np.sort(rng.choice(size, size=min(size, _CODEC_SAMPLE), replace=False))
+        sample = np.asarray(matrix[sample_rows], dtype=np.float32)
+        components = None
+        if pca_dimension and pca_dimension < sample.shape[1]:
+            centered = sample - sample.mean(axis=0)
+            eigenvalues, eigenvectors = np.linalg.eigh(centered.T @ centered)
+            components = np.ascontiguousarray(eigenvectors[:, ::-1][:, :pca_dimension].T, dtype=np.float32)
+        codec = cls(storage, components, trained_size=size)
+        if storage == "int8":
+            projected = codec.project(sample)
+            codec.low = projected.min(axis=0)
+            span = projected.max(axis=0) - codec.low
+            codec.step = np.where(span > 0, span / 255, 1.0).astype(np.float32)
+        return codec
+
+    def project(self, vectors: np.ndarray) -> np.ndarray:
+        return vectors @ self.components.T if self.components is not None else vectors
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        codes = np.empty((len(vectors), self.dimension or vectors.shape[1]), dtype=self.dtype)
+        for block in range(0, len(vectors), _ASSIGN_BLOCK):
+            projected = self.project(np.asarray(vectors[block:block + _ASSIGN_BLOCK], dtype=np.float32))
+            if self.storage == "int8":
+                projected = np.clip(np.rint((projected - self.low) / self.step) - 128, -128, 127)
+            codes[block:block + len(projected)] = projected
+        return codes
+
+    def prepare(self, query: np.ndarray) -> np.ndarray:
+        """Query vector to score codes against (constant offsets are dropped: they don't change the ranking)"""
+        projected = self.project(query)
+        return (projected * self.step).astype(np.float32) if self.storage == "int8" else projected
+
+    def score(self, codes: np.ndarray, prepared: np.ndarray) -> np.ndarray:
+        if self.storage == "float32":
+            return codes @ prepared
+        scores = np.empty(len(codes), dtype=np.float32)
+        for block in range(0, len(codes), _SCORE_BLOCK):
+            scores[block:block + _SCORE_BLOCK] = codes[block:block + _SCORE_BLOCK].astype(np.float32) @ prepared
+        return scores
+
+
+def _npz_memmap(npz_path, name: str) -> Optional[np.ndarray]:
+    """Read-only memory map of array `name` in an uncompressed .npz, or None if it can't be mapped"""
+    with zipfile.ZipFile(npz_path) as archive:
+        info = archive.getinfo(f"{name}.npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(npz_path, 'rb') as f:
+        f.seek(info.header_offset)
+        header = f.read(30)
+        # Local file header: the data follows the name and extra field, whose lengths end the header
+        f.seek(info.header_offset + 30 + int.from_bytes(header[26:28], 'little') + int.from_bytes(header[28:30], 'little'))
+        version = np.lib.format.read_magic(f)
+        if version not in ((1, 0), (2, 0)):
+            return None
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(f)
+        offset = f.tell()
+    if fortran_order or dtype != np.float32 or not all(shape):
+        return None
+    return np.memmap(npz_path, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+
+class IVFPartition:
+    """Inverted-file partition of a namespace's rows: spherical k-means centroids plus one row list each
+
+    A query scores the centroids, then only the rows in the `nprobe` closest lists. Inserts go to
+    their nearest centroid; deletes and the index's swap-removes update the lists in place, so
+    nothing is rebuilt until the namespace outgrows the size it was trained on.
+    """
+
+    def __init__(self, centroids: np.ndarray, assignments: np.ndarray, trained_size: int):
+        self.centroids = centroids
+        self.trained_size = trained_size
+        self.assign = np.array(assignments, dtype=np.int32)
+        self.lists = [[] for _ in range(len(centroids))]
+        order = np.argsort(self.assign, kind='stable')
+        bounds = np.searchsorted(self.assign[order], np.arange(len(centroids) + 1))
+        for list_id in range(len(centroids)):
+            self.lists[list_id] = order[bounds[list_id]:bounds[list_id + 1]].tolist()
+        self._arrays = {}  # list id -> cached np.array of its rows
+
+    @classmethod
+    def train(cls, matrix: np.ndarray, size: int, nlist: int, iterations: int = 10, seed: int = 0) -> "IVFPartition":
+        """k-means on a sample of the first `size` rows, then assign every row"""
+        rng = np.random.default_rng(seed)
+        nlist = max(1, min(nlist, size))
+        sample_rows = np.sort(rng.choice(size, size=min(size, nlist * 128), replace=False))
+        sample = np.asarray(matrix[sample_rows], dtype=np.float32)
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(labels, kind='stable')
+            starts = np.searchsorted(labels[order], np.arange(nlist))
+            counts = np.bincount(labels, minlength=nlist)
+            nonempty = counts > 0
+            sums = np.add.reduceat(sample[order], starts[nonempty], axis=0)
+            centroids[nonempty] = sums
+            # Reseed empty lists with random sample points
+            empty = np.flatnonzero(~nonempty)
+            if len(empty):
+                centroids[empty] = sample[rng.choice(len(sample), size=len(empty), replace=False)]
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids /= norms
+        return cls(centroids, cls.nearest(centroids, matrix, 0, size), trained_size=size)
+
+    @staticmethod
+    def nearest(centroids: np.ndarray, matrix: np.ndarray, start: int, stop: int) -> np.ndarray:
+        labels = np.empty(stop - start, dtype=np.int32)
+        for block in range(start, stop, _ASSIGN_BLOCK):
+            end = min(block + _ASSIGN_BLOCK, stop)
+            labels[block - start:end - start] = np.argmax(matrix[block:end] @ centroids.T, axis=1)
+        return labels
+
+    def _ensure_capacity(self, rows: int):
+        if rows > len(self.assign):
+            grown = np.full(max(rows, len(self.assign) * 2, 1024), -1, dtype=np.int32)
+            grown[:len(self.assign)] = self.assign
+            self.assign = grown
+
+    def add(self, rows: List[int], vectors: np.ndarray):
+        """Append rows (whose normalised vectors are `vectors`) to their nearest lists"""
+        if not rows:
+            return
+        self._ensure_capacity(max(rows) + 1)
+        for row, list_id in zip(rows, np.argmax(vectors @ self.centroids.T, axis=1).tolist()):
+            self.assign[row] = list_id
+            self.lists[list_id].append(row)
+            self._arrays.pop(list_id, None)
+
+    def remove(self, row: int):
+        list_id = int(self.assign[row])
+        self.lists[list_id].remove(row)
+        self.assign[row] = -1
+        self._arrays.pop(list_id, None)
+
+    def move(self, source: int, target: int):
+        """Row `source` now lives at `target` (the index swap-removed `target`'s old vector)"""
+        list_id = int(self.assign[source])
+        rows = self.lists[list_id]
+        rows[rows.index(source)] = target
+        self.assign[target] = list_id
+        self.assign[source] = -1
+        self._arrays.pop(list_id, None)
+
+    def refresh(self, rows: List[int], matrix: np.ndarray, size: int):
+        """Re-derive the lists of `rows` from `matrix` (rows written while this partition was trained)"""
+        self._ensure_capacity(size)
+        for row in rows:
+            if row < len(self.assign) and self.assign[row] >= 0:
+                self.remove(row)
+        live = [row for row in rows if row < size]
+        if live:
+            self.add(live, matrix[live])
+
+    def probe(self, query: np.ndarray, nprobe: int) -> List[np.ndarray]:
+        """Row arrays of the `nprobe` lists whose centroids are closest to the query"""
+        scores = self.centroids @ query
+        nprobe = min(nprobe, len(scores))
+        blocks = []
+        for list_id in np.argpartition(-scores, nprobe - 1)[:nprobe]:
+            rows = self._arrays.get(list_id)
+            if rows is None:
+                rows = self._arrays[list_id] = np.array(self.lists[list_id], dtype=np.int64)
+            blocks.append(rows)
+        return blocks
+
+
+class LocalVectorIndex:
+    """In-process cosine index exposing the subset of the Pinecone Index API that UNYCompassDatabase uses
+
+    Vectors are L2-normalised on insert so a query is a single matrix-vector product.
+    Used for offline benchmarks, snapshots and local development without network access.
+
+    ann="ivf" switches namespaces with at least `ann_min_vectors` vectors to approximate search:
+    an IVFPartition with `nlist` lists (default sqrt of the namespace size) is trained by
+    build_ann(), or in the background once an upsert or query finds it due, and queries score only
+    the `nprobe` closest lists. A namespace is retrained once it grows to `retrain_growth` times the
+    size it was trained on; until a background rebuild swaps in, queries keep using what they had.
+
+    storage="int8" / "float16" and/or pca_dimension keep a VectorCodec copy of namespaces with at
+    least `compress_min_vectors` vectors for the first pass, and rescore the best
+    `rescore` * top_k candidates against the float32 rows. load() memory-maps those float32 rows, so
+    only the codes stay resident; the rows a query rescores are paged in from the saved file.
+
+    Queries hold the lock only to snapshot the namespace and to look up their matches, so they
+    score concurrently with each other and with writes. A match whose row was rewritten meanwhile
+    is rescored (or dropped if deleted) when it is looked up.
+    """
+
+    def __init__(self, dimension: int = 768, ann: Optional[str] = None, nlist: Optional[int] = None,
+                 nprobe: int = 16, ann_min_vectors: int = 50000, retrain_growth: float = 4.0,
+                 storage: str = "float32", pca_dimension: Optional[int] = None, rescore: int = 10,
+                 compress_min_vectors: int = 10000):
+        if ann not in (None, "exact", "ivf"):
+            raise ValueError(f"Unknown ANN method '{ann}' (choose exact or ivf)")
+        if storage not in STORAGE_MODES:
+            raise ValueError(f"Unknown storage '{storage}' (choose {', '.join(STORAGE_MODES)})")
+        self.dimension = dimension
+        self.ann = ann if ann != "exact" else None
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.ann_min_vectors = ann_min_vectors
+        self.retrain_growth = retrain_growth
+        self.storage = storage
+        self.pca_dimension = pca_dimension if pca_dimension and pca_dimension < dimension else None
+        self.rescore = max(1, rescore)
+        self.compress_min_vectors = compress_min_vectors
+        self._namespaces = {}
+        self._lock = threading.RLock()
+        self._rebuilt = threading.Condition(self._lock)  # notified when a _rebuild() finishes
+
+    @classmethod
+    def options_from_env(cls) -> Dict:
+        """LOCAL_INDEX_ANN (exact or ivf), LOCAL_INDEX_NLIST, LOCAL_INDEX_NPROBE, LOCAL_INDEX_ANN_MIN_VECTORS,
+        LOCAL_INDEX_STORAGE (float32, float16 or int8), LOCAL_INDEX_PCA_DIMENSION, LOCAL_INDEX_RESCORE"""
+        nlist = os.getenv("LOCAL_INDEX_NLIST")
+        pca_dimension = os.getenv("LOCAL_INDEX_PCA_DIMENSION")
+        return {
+            'ann': os.getenv("LOCAL_INDEX_ANN", "ivf").lower(),
+            'nlist': int(nlist) if nlist else None,
+            'nprobe': int(os.getenv("LOCAL_INDEX_NPROBE", "16")),
+            'ann_min_vectors': int(os.getenv("LOCAL_INDEX_ANN_MIN_VECTORS", "50000")),
+            'storage': os.getenv("LOCAL_INDEX_STORAGE", "float32").lower(),
+            'pca_dimension': int(pca_dimension) if pca_dimension else None,
+            'rescore': int(os.getenv("LOCAL_INDEX_RESCORE", "10")),
+        }
+
+    @property
+    def compressed(self) -> bool:
+        return self.storage != "float32" or self.pca_dimension is not None
+
+    def _namespace(self, namespace: str, create: bool = False):
+        ns = self._namespaces.get(namespace)
+        if ns is None and create:
+            ns = {
+                'ids': [],
+                'rows': {},
+                'matrix': np.zeros((0, self.dimension), dtype=np.float32),
+                'size': 0,
+                'metadata': [],
+                'shared': False,
+                'ivf': None,
+                'codec': None,
+                'codes': None,
+                'version': 0,
+                'dirty': None,
+                'rebuilding': False
+            }
+            self._namespaces[namespace] = ns
+        return ns
+
+    @staticmethod
+    def _make_private(ns):
+        """Copy an attached (possibly read-only, memory-mapped) namespace before its first write"""
+        if ns.get('shared'):
+            ns['matrix'] = np.array(ns['matrix'][:ns['size']], dtype=np.float32)
+            ns['metadata'] = list(ns['metadata'])
+            ns['shared'] = False
+
+    def attach(self, namespace: str, ids: List[str], matrix: np.ndarray, metadata: Sequence[Dict],
+               shared: bool = True):
+        """Serve `namespace` straight from existing arrays without copying them
+
+        `matrix` rows must already be L2-normalised; it may be a read-only np.memmap (see snapshot.py),
+        in which case processes attaching the same file share its pages. `metadata` can be any
+        sequence of dicts, e.g. one that decodes text lazily. The first write copies the namespace,
+        unless shared=False hands a writable matrix and a metadata list over to the index (bulk loads).
+        """
+        if matrix.shape != (len(ids), self.dimension):
+            raise ValueError(f"Expected a {len(ids)}x{self.dimension} matrix, got {matrix.shape}")
+        with self._lock:
+            self._namespaces[namespace] = {
+                'ids': list(ids),
+                'rows': {vector_id: row for row, vector_id in enumerate(ids)},
+                'matrix': matrix,
+                'size': len(ids),
+                'metadata': metadata,
+                'shared': shared,
+                'ivf': None,
+                'codec': None,
+                'codes': None,
+                'version': 0,
+                'dirty': None,
+                'rebuilding': False
+            }
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _ivf(self, ns) -> Optional[IVFPartition]:
+        """The namespace's IVF partition, or None for exact search"""
+        if self.ann != "ivf" or ns['size'] < self.ann_min_vectors:
+            return None
+        return ns['ivf']
+
+    def _codec(self, ns) -> Optional[VectorCodec]:
+        """The namespace's VectorCodec, or None for full-precision search"""
+        if not self.compressed or ns['size'] < self.compress_min_vectors:
+            return None
+        return ns['codec']
+
+    def _ivf_due(self, ns) -> bool:
+        return (self.ann == "ivf" and ns['size'] >= self.ann_min_vectors and
+                (ns['ivf'] is None or ns['size'] > ns['ivf'].trained_size * self.retrain_growth))
+
+    def _codec_due(self, ns) -> bool:
+        return (self.compressed and ns['size'] >= self.compress_min_vectors and
+                (ns['codec'] is None or ns['size'] > ns['codec'].trained_size * self.retrain_growth))
+
+    def _schedule_rebuild(self, namespace: str, ns):
+        """Start a background _rebuild() of the namespace if one is due; caller holds the lock"""
+        if ns['rebuilding'] or not (self._ivf_due(ns) or self._codec_due(ns)):
+            return
+        ns['rebuilding'] = True
+        threading.Thread(target=self._rebuild, args=(namespace, ns), name=f"local-index-rebuild-{namespace}",
+                         daemon=True).start()
+
+    def _rebuild(self, namespace: str, ns):
+        """Train the namespace's due IVF partition and codes without holding the lock, then swap them in
+
+        Rows written during training are recorded in ns['dirty'] and re-derived at the swap.
+        """
+        try:
+            with self._lock:
+                train_ivf, train_codec = self._ivf_due(ns), self._codec_due(ns)
+                if not (train_ivf or train_codec):
+                    return
+                matrix, size = ns['matrix'], ns['size']
+                ns['dirty'] = set()
+            ivf = codec = codes = None
+            if train_ivf:
+                ivf = IVFPartition.train(matrix, size, self.nlist or int(math.sqrt(size)))
+            if train_codec:
+                codec = VectorCodec.fit(self.storage, matrix, size, self.pca_dimension)
+                codes = codec.encode(matrix[:size])
+            with self._lock:
+                if self._namespaces.get(namespace) is not ns:
+                    return  # deleted or replaced meanwhile
+                dirty = sorted(ns['dirty'])
+                if ivf is not None:
+                    ivf.refresh(dirty, ns['matrix'], ns['size'])
+                    ns['ivf'] = ivf
+                if codec is not None:
+                    ns['codec'], ns['codes'] = codec, codes
+                    rows = [row for row in dirty if row < ns['size']]
+                    if rows or ns['size'] > len(codes):
+                        self._encode_rows(ns, rows)
+        finally:
+            with self._lock:
+                ns['dirty'] = None
+                ns['rebuilding'] = False
+                self._rebuilt.notify_all()
+
+    def build_ann(self, namespace: Optional[str] = None):
+        """Train IVF partitions and encode compressed codes now (e.g. at startup) instead of in the background"""
+        with self._lock:
+            names = [namespace] if namespace is not None else list(self._namespaces)
+            pending = []
+            for name in names:
+                ns = self._namespace(name)
+                if ns is None:
+                    continue
+                while ns['rebuilding']:
+                    self._rebuilt.wait()  # a background rebuild is under way; it may leave nothing due
+                ns['rebuilding'] = True
+                pending.append((name, ns))
+        for name, ns in pending:
+            self._rebuild(name, ns)
+
+    def _encode_rows(self, ns, rows: List[int]):
+        """Refresh the codes of rows just written to the matrix"""
+        codes = ns['codes']
+        if ns['size'] > len(codes):
+            grown = np.zeros((max(ns['size'], len(codes) * 2), codes.shape[1]), dtype=codes.dtype)
+            grown[:len(codes)] = codes
+            codes = ns['codes'] = grown
+        codes[rows] = ns['codec'].encode(ns['matrix'][rows])
+
+    def upsert(self, vectors: List[Dict], namespace: str = ""):
+        if not vectors:
+            return {'upserted_count': 0}
+
+        values = self._normalize(np.asarray([v['values'] for v in vectors], dtype=np.float32))
+        with self._lock:
+            ns = self._namespace(namespace, create=True)
+            self._make_private(ns)
+            changed = {}  # rows written by this call, in order (an ID may repeat within a batch)
+            for vector, row_values in zip(vectors, values):
+                vector_id = vector['id']
+                row = ns['rows'].get(vector_id)
+                if row is None:
+                    row = ns['size']
+                    if row >= ns['matrix'].shape[0]:
+                        # Grow geometrically so bulk loads stay O(n)
+                        new_capacity = max(1024, ns['matrix'].shape[0] * 2)
+                        grown = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+                        grown[:ns['size']] = ns['matrix'][:ns['size']]
+                        ns['matrix'] = grown
+                    ns['rows'][vector_id] = row
+                    ns['ids'].append(vector_id)
+                    ns['metadata'].append(None)
+                    ns['size'] += 1
+                elif ns['ivf'] is not None and row not in changed:
+                    ns['ivf'].remove(row)
+                ns['matrix'][row] = row_values
+                ns['metadata'][row] = dict(vector.get('metadata') or {})
+                changed[row] = None
+            rows = list(changed)
+            if ns['ivf'] is not None:
+                ns['ivf'].add(rows, ns['matrix'][rows])
+            if ns['codec'] is not None:
+                self._encode_rows(ns, rows)
+            if ns['dirty'] is not None:
+                ns['dirty'].update(rows)
+            ns['version'] += 1
+            self._schedule_rebuild(namespace, ns)
+        return {'upserted_count': len(vectors)}
+
+    def query(self, vector, top_k: int = 10, include_metadata: bool = False,
+              namespace: str = "", include_values: bool = False, **kwargs):
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        # Snapshot the namespace under the lock; score outside it
+        with self._lock:
+            ns = self._namespace(namespace)
+            if ns is None or ns['size'] == 0:
+                return {'matches': [], 'namespace': namespace}
+            self._schedule_rebuild(namespace, ns)
+            matrix, size, version = ns['matrix'], ns['size'], ns['version']
+            ivf, codec, codes = self._ivf(ns), self._codec(ns), ns['codes']
+            blocks = ivf.probe(query, kwargs.get('nprobe') or self.nprobe) if ivf is not None else []
+
+        k = min(top_k, size)
+        rows = np.concatenate(blocks) if blocks else None
+        if rows is None or len(rows) < k:
+            rows, blocks = None, None
+        if codec is None:
+            if blocks:
+                # One list at a time: small gathers stay in cache, unlike one large fancy-index copy
+                scores = np.concatenate([matrix[block] @ query for block in blocks])
+            else:
+                scores = matrix[:size] @ query
+        else:
+            prepared = codec.prepare(query)
+            if blocks:
+                approximate = np.concatenate([codec.score(codes[block], prepared) for block in blocks])
+            else:
+                approximate = codec.score(codes[:size], prepared)
+            # Rescore the best candidates at full precision (in row order, for memory-mapped rows)
+            candidates = min(len(approximate), k * (kwargs.get('rescore') or self.rescore))
+            best = np.argpartition(-approximate, candidates - 1)[:candidates]
+            rows = np.sort(rows[best] if rows is not None else best)
+            scores = matrix[rows] @ query
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        top_rows = [int(rows[position] if rows is not None else position) for position in top]
+        top_scores = [float(scores[position]) for position in top]
+
+        with self._lock:
+            if self._namespaces.get(namespace) is not ns:
+                # Deleted or replaced (e.g. re-attached) while scoring: search what is there now
+                return self.query(vector, top_k=top_k, include_metadata=include_metadata, namespace=namespace,
+                                  include_values=include_values, **kwargs)
+            if ns['version'] != version:
+                # Written while scoring: rows may have been rewritten, swapped or deleted
+                live = [row for row in top_rows if row < ns['size']]
+                fresh = (ns['matrix'][live] @ query).tolist() if live else []
+                ranked = sorted(zip(fresh, live), reverse=True)
+                top_scores, top_rows = [score for score, _ in ranked], [row for _, row in ranked]
+            matches = []
+            for row, score in zip(top_rows, top_scores):
+                match = {'id': ns['ids'][row], 'score': score}
+                if include_metadata:
+                    match['metadata'] = dict(ns['metadata'][row])
+                if include_values:
+                    match['values'] = ns['matrix'][row].tolist()
+                matches.append(match)
+        return {'matches': matches, 'namespace': namespace}
+
+    def fetch(self, ids: List[str], namespace: str = ""):
+        vectors = {}
+        with self._lock:
+            ns = self._namespace(namespace)
+            if ns is not None:
+                for vector_id in ids:
+                    row = ns['rows'].get(vector_id)
+                    if row is not None:
+                        vectors[vector_id] = {
+                            'id': vector_id,
+                            'values': ns['matrix'][row].tolist(),
+                            'metadata': dict(ns['metadata'][row])
+                        }
+        return {'vectors': vectors, 'namespace': namespace}
+
+    def delete(self, ids: Optional[List[str]] = None, delete_all: bool = False, namespace: str = ""):
+        with self._lock:
+            if delete_all:
+                self._namespaces.pop(namespace, None)
+                return {}
+
+            ns = self._namespace(namespace)
+            if ns is None:
+                return {}
+            self._make_private(ns)
+            for vector_id in ids or []:
+                row = ns['rows'].pop(vector_id, None)
+                if row is None:
+                    continue
+                if ns['ivf'] is not None:
+                    ns['ivf'].remove(row)
+                # Swap-remove keeps the matrix dense
+                last = ns['size'] - 1
+                if row != last:
+                    if ns['ivf'] is not None:
+                        ns['ivf'].move(last, row)
+                    if ns['codes'] is not None:
+                        ns['codes'][row] = ns['codes'][last]
+                    moved_id = ns['ids'][last]
+                    ns['matrix'][row] = ns['matrix'][last]
+                    ns['ids'][row] = moved_id
+                    ns['metadata'][row] = ns['metadata'][last]
+                    ns['rows'][moved_id] = row
+                if ns['dirty'] is not None:
+                    ns['dirty'].update((row, last))
+                ns['ids'].pop()
+                ns['metadata'].pop()
+                ns['size'] -= 1
+            ns['version'] += 1
+        return {}
+
+    def describe_index_stats(self):
+        with self._lock:
+            namespaces = {
+                name: SimpleNamespace(vector_count=ns['size'])
+                for name, ns in self._namespaces.items()
+            }
+        return SimpleNamespace(
+            dimension=self.dimension,
+            namespaces=namespaces,
+            total_vector_count=sum(ns.vector_count for ns in namespaces.values())
+        )
+
+    def save(self, path):
+        """Persist to `<path>.npz` (vectors) and `<path>.json` (ids + metadata)"""
+        path = Path(path)
+        arrays = {}
+        manifest = {
+            'dimension': self.dimension,
+            'ann': {'method': self.ann, 'nlist': self.nlist, 'nprobe': self.nprobe,
+                    'ann_min_vectors': self.ann_min_vectors, 'retrain_growth': self.retrain_growth},
+            'storage': {'dtype': self.storage, 'pca_dimension': self.pca_dimension, 'rescore': self.rescore,
+                        'compress_min_vectors': self.compress_min_vectors},
+            'namespaces': {}
+        }
+        with self._lock:
+            for i, (name, ns) in enumerate(self._namespaces.items()):
+                arrays[f'ns{i}'] = ns['matrix'][:ns['size']]
+                manifest['namespaces'][name] = {
+                    'array': f'ns{i}',
+                    'ids': ns['ids'],
+                    'metadata': list(ns['metadata'])
+                }
+                if ns['ivf'] is not None:
+                    arrays[f'ns{i}_centroids'] = ns['ivf'].centroids
+                    arrays[f'ns{i}_assign'] = ns['ivf'].assign[:ns['size']]
+                    manifest['namespaces'][name]['ivf_trained_size'] = ns['ivf'].trained_size
+        # Write next to the targets and rename, so a crash mid-save leaves the previous copy intact
+        npz_path, json_path = path.with_suffix('.npz'), path.with_suffix('.json')
+        with open(f"{npz_path}.partial", 'wb') as f:
+            np.savez(f, **arrays)
+        with open(f"{json_path}.partial", 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(f"{npz_path}.partial", npz_path)
+        os.replace(f"{json_path}.partial", json_path)
+
+    @classmethod
+    def load(cls, path, **options):
+        """Load a saved index; `options` override the ANN and storage settings it was saved with
+
+        With compressed storage the float32 rows stay memory-mapped from the .npz (and are copied
+        into memory on the namespace's first write).
+        """
+        path = Path(path)
+        with open(path.with_suffix('.json'), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        saved = manifest.get('ann', {})
+        storage = manifest.get('storage', {})
+        settings = {'ann': saved.get('method'), 'nlist': saved.get('nlist'), 'nprobe': saved.get('nprobe', 16),
+                    'ann_min_vectors': saved.get('ann_min_vectors', 50000),
+                    'retrain_growth': saved.get('retrain_growth', 4.0),
+                    'storage': storage.get('dtype', "float32"), 'pca_dimension': storage.get('pca_dimension'),
+                    'rescore': storage.get('rescore', 10),
+                    'compress_min_vectors': storage.get('compress_min_vectors', 10000), **options}
+        index = cls(dimension=manifest['dimension'], **settings)
+        npz_path = path.with_suffix('.npz')
+        with np.load(npz_path) as arrays:
+            for name, ns_manifest in manifest['namespaces'].items():
+                matrix = _npz_memmap(npz_path, ns_manifest['array']) if index.compressed else None
+                shared = matrix is not None
+                if matrix is None:
+                    matrix = np.ascontiguousarray(arrays[ns_manifest['array']], dtype=np.float32)
+                index._namespaces[name] = {
+                    'ids': list(ns_manifest['ids']),
+                    'rows': {vector_id: row for row, vector_id in enumerate(ns_manifest['ids'])},
+                    'matrix': matrix,
+                    'size': matrix.shape[0],
+                    'metadata': list(ns_manifest['metadata']),
+                    'shared': shared,
+                    'ivf': None,
+                    'codec': None,
+                    'codes': None,
+                    'version': 0,
+                    'dirty': None,
+                    'rebuilding': False
+                }
+                centroids = ns_manifest['array'] + '_centroids'
+                if index.ann == "ivf" and centroids in arrays.files:
+                    index._namespaces[name]['ivf'] = IVFPartition(
+                        np.asarray(arrays[centroids], dtype=np.float32), arrays[ns_manifest['array'] + '_assign'],
+                        trained_size=ns_manifest['ivf_trained_size'])
+        return index
@@ -0,0 +1,102 @@
+import hashlib
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+_WORD = re.compile(r"\w+")
+
+
+def shingle_hashes(text: str, size: int = 3) -> np.ndarray:
+    """Distinct 64-bit hashes of the overlapping word n-grams of the lower-cased text"""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        features = [" ".join(words)] if words else []
+    else:
+        features = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(f.encode('utf-8'), digest_size=8).digest(), 'little') for f in features),
+        dtype=np.uint64, count=len(features)
+    )
+
+
+class NearDuplicateIndex:
+    """Near-duplicate page lookup: MinHash signatures with banded LSH for candidates
+
+    Each page's MinHash signature (num_perm values) is split into bands of `rows` values; pages
+    whose signatures agree exactly on a whole band share a bucket and become candidates. A pair
+    with shingle Jaccard similarity J collides in some band with probability 1 - (1 - J^rows)^bands,
+    so rows is the widest band that still catches 98% of pairs at `threshold`. Pages much less
+    similar than that almost never share a bucket, so a lookup touches only genuinely similar pages
+    rather than a fixed fraction of the index. A candidate is a duplicate when the MinHash estimate
+    of its Jaccard similarity reaches `threshold`.
+    """
+
+    def __init__(self, threshold: float = 0.9, shingle_size: int = 3, num_perm: int = 64, seed: int = 1,
+                 rows: Optional[int] = None):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.rows = rows or band_rows(threshold, num_perm)
+        if num_perm % self.rows:
+            raise ValueError(f"rows ({self.rows}) must divide num_perm ({num_perm})")
+        self._bands = [slice(start, start + self.rows) for start in range(0, num_perm, self.rows)]
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in self._bands]
+
+        # Multiply-shift hash family for MinHash (odd multipliers, arithmetic mod 2^64)
+        rng = np.random.default_rng(seed)
+        self._multipliers = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._offsets = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+        self._minhashes: List[np.ndarray] = []
+        self._keys: List[str] = []
+
+    def fingerprint(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature (uint32[num_perm]) of the text's word shingles; None for empty text"""
+        hashes = shingle_hashes(text, self.shingle_size)
+        if len(hashes) == 0:
+            return None
+        with np.errstate(over='ignore'):
+            permuted = hashes[:, None] * self._multipliers[None, :] + self._offsets[None, :]
+        return (permuted >> np.uint64(32)).astype(np.uint32).min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray):
+        return [signature[band].tobytes() for band in self._bands]
+
+    def candidates(self, signature: np.ndarray) -> set:
+        """Rows sharing at least one band with the signature"""
+        rows = set()
+        for band_key, buckets in zip(self._band_keys(signature), self._buckets):
+            rows.update(buckets.get(band_key, ()))
+        return rows
+
+    def find(self, signature: np.ndarray) -> Optional[Tuple[str, float]]:
+        """Most similar indexed key whose estimated Jaccard similarity reaches the threshold"""
+        best_row, best_similarity = None, self.threshold
+        for row in self.candidates(signature):
+            estimate = float(np.mean(signature == self._minhashes[row]))
+            if estimate >= best_similarity:
+                best_row, best_similarity = row, estimate
+        if best_row is None:
+            return None
+        return self._keys[best_row], best_similarity
+
+    def add(self, key: str, signature: np.ndarray):
+        row = len(self._keys)
+        self._minhashes.append(signature)
+        self._keys.append(key)
+        for band_key, buckets in zip(self._band_keys(signature), self._buckets):
+            buckets.setdefault(band_key, []).append(row)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def band_rows(threshold: float, num_perm: int, recall: float = 0.98) -> int:
+    """Widest band (rows, a divisor of num_perm) that pairs at `threshold` share with probability >= recall"""
+    best = 1
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows == 0 and 1 - (1 - threshold ** rows) ** (num_perm // rows) >= recall:
+            best = rows
+    return best
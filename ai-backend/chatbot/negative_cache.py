@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# Base time-to-live per failure class; each repeated failure doubles it, up to MAX_TTL
+FAILURE_TTLS = {
+    'not_found': 7 * 86400,        # 404 / 410
+    'client_error': 86400,         # other 4xx
+    'non_html': 30 * 86400,        # PDFs, images, redirects to downloads
+    'thin_content': 3 * 86400,     # "Insufficient content" pages
+    'server_error': 3600,          # 5xx
+    'network': 900,                # timeouts, connection errors
+}
+MAX_TTL = 90 * 86400
+
+# Requests a blocked URL would have cost: request errors are retried once, the others are not
+FETCHES_PER_FAILURE = {'server_error': 2, 'network': 2}
+
+
+class NegativeCache:
+    """Persistent record of URLs that recently failed, so re-crawls don't fetch them again
+
+    Entries expire after a per-class TTL that doubles with every consecutive failure. The JSON
+    file is rewritten atomically on save(); path=None keeps the cache in memory for one run.
+    """
+
+    def __init__(self, path=None, clock=time.time):
+        self.path = Path(path) if path else None
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._skipped: Dict[str, str] = {}  # url -> failure class, for this run's report
+        if self.path is not None and self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f).get('entries', {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable negative cache {self.path}: {e}")
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """The unexpired failure entry for url, if any"""
+        entry = self._entries.get(url)
+        if entry is None or entry['expires_at'] <= self.clock():
+            return None
+        return entry
+
+    def is_blocked(self, url: str) -> bool:
+        entry = self.lookup(url)
+        if entry is None:
+            return False
+        with self._lock:
+            self._skipped[url] = entry['failure_class']
+        return True
+
+    def record_failure(self, url: str, failure_class: str, detail: str = "") -> Dict:
+        if failure_class not in FAILURE_TTLS:
+            raise ValueError(f"Unknown failure class: {failure_class}")
+        now = self.clock()
+        with self._lock:
+            previous = self._entries.get(url)
+            # A different kind of failure starts a new backoff sequence
+            failures = previous['failures'] + 1 if previous and previous['failure_class'] == failure_class else 1
+            ttl = min(FAILURE_TTLS[failure_class] * 2 ** (failures - 1), MAX_TTL)
+            entry = {
+                'failure_class': failure_class,
+                'detail': detail[:200],
+                'failures': failures,
+                'first_failed_at': previous['first_failed_at'] if previous and failures > 1 else now,
+                'last_failed_at': now,
+                'expires_at': now + ttl,
+            }
+            self._entries[url] = entry
+        return entry
+
+    def record_success(self, url: str):
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def prune(self) -> int:
+        """Drop expired entries; returns how many were removed"""
+        now = self.clock()
+        with self._lock:
+            expired = [url for url, entry in self._entries.items() if entry['expires_at'] <= now]
+            for url in expired:
+                del self._entries[url]
+        return len(expired)
+
+    def save(self):
+        if self.path is None:
+            return
+        self.prune()
+        with self._lock:
+            data = {'saved_at': self.clock(), 'entries': self._entries}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+    def stats(self) -> Dict:
+        now = self.clock()
+        with self._lock:
+            active = [entry for entry in self._entries.values() if entry['expires_at'] > now]
+            by_class = {}
+            for entry in active:
+                by_class[entry['failure_class']] = by_class.get(entry['failure_class'], 0) + 1
+            skipped = list(self._skipped.values())
+        return {
+            'entries': len(active),
+            'entries_by_class': by_class,
+            'urls_skipped': len(skipped),
+            'fetches_avoided': sum(FETCHES_PER_FAILURE.get(failure_class, 1) for failure_class in skipped),
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
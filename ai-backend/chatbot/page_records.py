@@ -0,0 +1,59 @@
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Iterator
+
+
+class PageRecordWriter:
+    """Appends crawled page records to an NDJSON file, one JSON object per line
+
+    Each record is flushed as soon as it is written, so an interrupted crawl leaves every
+    finished page on disk and readers never need more than one line in memory.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def write(self, record: Dict):
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_page_records(path) -> Iterator[Dict]:
+    """Yield page records from an NDJSON file one at a time
+
+    A final line cut off mid-write (crawl killed while writing) is skipped with a warning;
+    a malformed line anywhere else is an error.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        pending_error = None
+        for line_number, line in enumerate(f, 1):
+            if pending_error is not None:
+                raise pending_error
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                pending_error = ValueError(f"{path}:{line_number}: invalid page record: {e}")
+        if pending_error is not None:
+            print(f"⚠️ Skipping truncated last record in {Path(path).name}: {pending_error}")
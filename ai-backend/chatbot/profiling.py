@@ -0,0 +1,264 @@
+"""On-demand sampling profiler and memory accounting for the debug endpoints
+
+Nothing here runs until a debug endpoint asks for it: there are no per-request hooks, and
+tracemalloc is only switched on for the length of a memory capture.
+
+sample_stacks() wakes every `interval` seconds for `duration` seconds, reads every thread's Python
+stack with sys._current_frames() and counts identical stacks. It returns folded stacks
+("thread;outer frame;...;leaf frame count" lines, the input format of flamegraph.pl and
+speedscope), the time spent per leaf category (torch, tokenization, JSON, network, lock waits, ...)
+and how late the sampler woke up: a thread holding the GIL delays the sampler, so a large lag
+points at GIL contention rather than at any one stack.
+
+component_memory() walks the object graph under each named component (model, caches, session
+store, index, ...) and adds up sys.getsizeof plus array and tensor buffers. Memory-mapped arrays
+are reported separately because their pages belong to the page cache, not the process.
+"""
+import gc
+import math
+import mmap
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import types
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from telemetry import REGISTRY
+
+PROFILES = REGISTRY.counter("unycompass_debug_profiles_total", "Debug profiler and memory captures by kind")
+
+# Only one capture at a time: two samplers would skew each other's timings
+_ACTIVE = threading.Lock()
+
+# Leaf frames are attributed to the first category whose path fragment or function name matches
+LEAF_CATEGORIES = (
+    ('tokenization', ('tokenizers', 'tokenization_', 'transformers/tokenization')),
+    ('torch', ('torch/', 'sentence_transformers/')),
+    ('json', ('json/',)),
+    ('network', ('socket.py', 'ssl.py', 'http/client.py', 'urllib3/', 'requests/', 'httpx/', 'httpcore/')),
+    ('numpy', ('numpy/',)),
+    ('openai', ('openai/', 'langchain')),
+    ('pinecone', ('pinecone',)),
+)
+# (file name, function) pairs where a thread sits blocked on a lock, condition, event or queue
+_WAIT_FRAMES = {
+    ('threading.py', 'wait'), ('threading.py', 'acquire'), ('threading.py', 'join'),
+    ('threading.py', '_wait_for_tstate_lock'), ('queue.py', 'get'), ('queue.py', 'put'),
+    ('selectors.py', 'select'), ('socketserver.py', 'serve_forever'),
+}
+
+
+class ProfilerBusy(RuntimeError):
+    """Another profile or memory capture is already running"""
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def leaf_category(filename: str, function: str = '') -> str:
+    path = filename.replace('\\', '/')
+    if (os.path.basename(path), function) in _WAIT_FRAMES:
+        return 'waiting'
+    for category, fragments in LEAF_CATEGORIES:
+        if any(fragment in path for fragment in fragments):
+            return category
+    return 'app' if '/chatbot/' in path or '/api/' in path else 'other'
+
+
+def sample_stacks(duration: float, interval: float = 0.005, include: Optional[str] = None) -> Dict:
+    """Sample all threads' stacks for `duration` seconds
+
+    `include` keeps only threads with a frame of that function on their stack, e.g.
+    "full_dispatch_request" for threads serving a Flask request.
+    """
+    if not (math.isfinite(duration) and math.isfinite(interval)) or interval <= 0:
+        raise ValueError("duration and interval must be finite, and interval positive")
+    if not _ACTIVE.acquire(blocking=False):
+        raise ProfilerBusy("A profile or memory capture is already running")
+    PROFILES.inc(kind='cpu')
+    try:
+        me = threading.get_ident()
+        stacks = Counter()
+        categories = Counter()
+        lags = []
+        samples = 0
+        started = time.perf_counter()
+        deadline = started + max(0.0, duration)
+        next_at = started
+        while True:
+            now = time.perf_counter()
+            if not now < deadline:
+                break
+            lags.append(max(0.0, now - next_at))
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                codes = []
+                while frame is not None:
+                    codes.append(frame.f_code)
+                    frame = frame.f_back
+                if include is not None and not any(code.co_name == include for code in codes):
+                    continue
+                labels = [names.get(ident, str(ident)).replace(';', ':')]
+                labels.extend(_frame_label(code).replace(';', ':') for code in reversed(codes))
+                stacks[';'.join(labels)] += 1
+                categories[leaf_category(codes[0].co_filename, codes[0].co_name) if codes else 'other'] += 1
+            samples += 1
+            next_at += interval
+            time.sleep(max(0.0, next_at - time.perf_counter()))
+        elapsed = time.perf_counter() - started
+    finally:
+        _ACTIVE.release()
+
+    thread_samples = sum(categories.values())
+    lags.sort()
+    return {
+        'seconds': round(elapsed, 3),
+        'interval_ms': interval * 1000,
+        'samples': samples,
+        'thread_samples': thread_samples,
+        'folded': '\n'.join(f"{stack} {count}" for stack, count in stacks.most_common()),
+        'leaf_categories': {category: round(count / thread_samples, 3)
+                            for category, count in categories.most_common()} if thread_samples else {},
+        'top_leaf_frames': _top_leaves(stacks, 20),
+        'sampler_lag_ms': {
+            'p50': round(lags[len(lags) // 2] * 1000, 2) if lags else None,
+            'p95': round(lags[int(len(lags) * 0.95)] * 1000, 2) if lags else None,
+            'max': round(lags[-1] * 1000, 2) if lags else None,
+        },
+    }
+
+
+def _top_leaves(stacks: Counter, limit: int) -> List[Dict]:
+    leaves = Counter()
+    for stack, count in stacks.items():
+        leaves[stack.rsplit(';', 1)[-1]] += count
+    total = sum(leaves.values()) or 1
+    return [{'frame': frame, 'samples': count, 'share': round(count / total, 3)}
+            for frame, count in leaves.most_common(limit)]
+
+
+def _buffer_bytes(obj):
+    """(resident, mapped) buffer bytes sys.getsizeof leaves out, None for other objects"""
+    if isinstance(obj, np.ndarray):
+        # getsizeof already includes an array's own buffer; views are counted at their base
+        base = obj
+        while isinstance(base, np.ndarray) and base.base is not None:
+            base = base.base
+        return 0, (obj.nbytes if isinstance(base, mmap.mmap) and obj.base is base else 0)
+    if hasattr(obj, 'element_size') and hasattr(obj, 'nelement') and hasattr(obj, 'is_leaf'):
+        return obj.element_size() * obj.nelement(), 0
+    return None
+
+
+_OPAQUE = (types.ModuleType, type, types.FunctionType, types.BuiltinFunctionType, types.CodeType,
+           types.FrameType, types.MethodType, threading.Thread)
+
+
+def deep_size(root, stop: Iterable = (), max_objects: int = 2_000_000) -> Dict:
+    """Approximate memory reachable from `root` without passing through the objects in `stop`
+
+    Modules, classes, functions and threads are not followed, so globals are not counted.
+    """
+    seen = {id(obj) for obj in stop}
+    seen.discard(id(root))
+    pending = [root]
+    resident = mapped = objects = 0
+    truncated = False
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        objects += 1
+        if objects > max_objects:
+            truncated = True
+            break
+        try:
+            resident += sys.getsizeof(obj)
+        except TypeError:
+            pass
+        buffer = _buffer_bytes(obj)
+        if buffer is not None:
+            resident += buffer[0]
+            mapped += buffer[1]
+        if obj is not root and isinstance(obj, _OPAQUE):
+            continue
+        pending.extend(gc.get_referents(obj))
+    return {'resident_mb': round(resident / 1e6, 2), 'mapped_mb': round(mapped / 1e6, 2), 'objects': objects,
+            'truncated': truncated}
+
+
+def component_memory(components: Dict[str, object], stop: Iterable = ()) -> Dict[str, Dict]:
+    """deep_size() of each named component; `stop` adds objects no component should be walked into
+    (e.g. the database and bot that own them, which cache keys refer back to)"""
+    roots = [obj for obj in components.values() if obj is not None]
+    report = {}
+    for name, obj in components.items():
+        if obj is None:
+            continue
+        others = [other for other in roots if other is not obj]
+        report[name] = deep_size(obj, stop=[*others, *stop])
+    return report
+
+
+def allocation_snapshot(duration: float = 0.0, top: int = 25, group_by: str = 'lineno',
+                        component_of: Optional[Callable[[str], str]] = None) -> Dict:
+    """tracemalloc's top allocation sites, traced for `duration` seconds if it isn't already running
+
+    Only memory allocated while tracing is seen, so with duration > 0 this shows what live
+    traffic allocates (and keeps) over that window.
+    """
+    if not math.isfinite(duration):
+        raise ValueError("duration must be finite")
+    if not _ACTIVE.acquire(blocking=False):
+        raise ProfilerBusy("A profile or memory capture is already running")
+    PROFILES.inc(kind='memory')
+    started_here = not tracemalloc.is_tracing()
+    try:
+        if started_here:
+            tracemalloc.start(25)
+            time.sleep(max(0.0, duration))
+        snapshot = tracemalloc.take_snapshot()
+        traced, peak = tracemalloc.get_traced_memory()
+    finally:
+        if started_here:
+            tracemalloc.stop()
+        _ACTIVE.release()
+
+    snapshot = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+    statistics = snapshot.statistics(group_by)
+    by_component = Counter()
+    for statistic in snapshot.statistics('filename'):
+        filename = statistic.traceback[0].filename
+        by_component[component_of(filename) if component_of else leaf_category(filename)] += statistic.size
+    return {
+        'traced_seconds': duration if started_here else None,
+        'traced_mb': round(traced / 1e6, 2),
+        'peak_mb': round(peak / 1e6, 2),
+        'by_component_mb': {name: round(size / 1e6, 2) for name, size in by_component.most_common()},
+        'top': [{'site': str(statistic.traceback[0]), 'size_kb': round(statistic.size / 1024, 1),
+                 'count': statistic.count} for statistic in statistics[:top]],
+    }
+
+
+def process_memory() -> Dict:
+    """Current and peak resident set size of this process"""
+    import resource
+
+    report = {}
+    try:
+        with open('/proc/self/statm') as f:
+            report['rss_mb'] = round(int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6, 1)
+    except (OSError, ValueError, IndexError):
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    report['peak_rss_mb'] = round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+    return report
@@ -0,0 +1,211 @@
+"""Sampled, asynchronous log of the questions students ask
+
+answer_question hands each sampled entry to record(), which only appends to an in-memory queue;
+a background thread writes the entries to an NDJSON file. When the queue is full entries are
+dropped rather than slowing requests down. top_questions() reads the log back for cache
+prewarming at startup.
+
+The writer thread starts on the first record() in each process, so a log created in the
+gunicorn master before fork (preload_app) works in every worker. Workers share the file: rotation
+and appends happen under an flock on a .lock file beside it (where fcntl exists), and each writer
+re-reads the first entry's timestamp whenever the file it sees has been replaced.
+
+Questions are stored verbatim, so logging is opt-in (QUERY_LOG=true) and samples 10% of requests
+by default. The file is rotated to a single .1 backup once it passes max_bytes or its first entry
+is older than rotate_after_s, so an entry is kept for at most twice that long.
+"""
+import atexit
+import contextlib
+import json
+import os
+import queue
+import random
+import threading
+import time
+from collections import Counter as Tally
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process dev servers only
+    fcntl = None
+
+from telemetry import REGISTRY
+
+QUERY_LOG_ENTRIES = REGISTRY.counter(
+    "unycompass_query_log_entries_total", "Query log entries by outcome (written, dropped)"
+)
+
+_STOP = object()
+
+
+class QueryLog:
+    """NDJSON query log with sampling, a bounded queue and size- and age-based rotation (one .1 backup)
+
+    path=None disables logging.
+    """
+
+    def __init__(self, path=None, sample_rate: float = 0.1, max_queue: int = 1000,
+                 max_bytes: int = 50 * 1024 * 1024, rotate_after_s: Optional[float] = 7 * 86400):
+        self.path = Path(path) if path else None
+        self.sample_rate = sample_rate
+        self.max_queue = max_queue
+        self.max_bytes = max_bytes
+        self.rotate_after_s = rotate_after_s
+        self._pid = None
+        self._queue = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._first_ts = None  # timestamp of the live file's first entry (writer thread only)
+        self._first_ino = None  # inode _first_ts was read from; another worker may have rotated since
+
+    @classmethod
+    def from_env(cls, default_path=None) -> "QueryLog":
+        """QUERY_LOG=true enables; QUERY_LOG_PATH, QUERY_LOG_SAMPLE_RATE and QUERY_LOG_ROTATE_DAYS configure"""
+        if os.getenv("QUERY_LOG", "false").lower() != "true":
+            return cls(None)
+        return cls(os.getenv("QUERY_LOG_PATH") or default_path,
+                   sample_rate=float(os.getenv("QUERY_LOG_SAMPLE_RATE", "0.1")),
+                   rotate_after_s=float(os.getenv("QUERY_LOG_ROTATE_DAYS", "7")) * 86400)
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None and self.sample_rate > 0
+
+    def sampled(self) -> bool:
+        """Whether to log this request; decide before building the entry"""
+        return self.enabled and (self.sample_rate >= 1.0 or random.random() < self.sample_rate)
+
+    def record(self, entry: Dict):
+        """Queue an entry for the writer thread; never blocks"""
+        if not self.enabled:
+            return
+        self._ensure_writer()
+        entry.setdefault('ts', round(time.time(), 3))
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            QUERY_LOG_ENTRIES.inc(outcome='dropped')
+
+    def _ensure_writer(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._start_lock:
+            if self._pid == pid:
+                return
+            # New process (first use, or forked from a parent that had a writer): start fresh
+            self._queue = queue.Queue(maxsize=self.max_queue)
+            self._thread = threading.Thread(target=self._write_loop, args=(self._queue,),
+                                            name="query-log-writer", daemon=True)
+            self._thread.start()
+            self._pid = pid
+            atexit.register(self.close)
+
+    def _write_loop(self, entries: queue.Queue):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            entry = entries.get()
+            if entry is _STOP:
+                return
+            batch = [entry]
+            # Write whatever else is already waiting in the same append
+            while True:
+                try:
+                    entry = entries.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    self._append(batch)
+                    return
+                batch.append(entry)
+            self._append(batch)
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """Exclusive across processes sharing the log, so only one of them rotates it"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.path.with_name(self.path.name + ".lock"), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _rotate_if_due(self):
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self._first_ts = self._first_ino = None
+            return
+        if self._first_ino != stat.st_ino:
+            self._first_ts = _first_timestamp(self.path)
+            self._first_ino = stat.st_ino
+        too_old = (self.rotate_after_s and self._first_ts is not None and
+                   time.time() - self._first_ts > self.rotate_after_s)
+        if too_old or stat.st_size > self.max_bytes:
+            os.replace(self.path, self.path.with_name(self.path.name + ".1"))
+            self._first_ts = self._first_ino = None
+
+    def _append(self, batch: List[Dict]):
+        try:
+            with self._file_lock():
+                self._rotate_if_due()
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in batch))
+            QUERY_LOG_ENTRIES.inc(len(batch), outcome='written')
+        except OSError as e:
+            print(f"⚠️ Query log write failed: {e}")
+            QUERY_LOG_ENTRIES.inc(len(batch), outcome='dropped')
+
+    def close(self, timeout: float = 5.0):
+        """Flush queued entries and stop this process's writer"""
+        if self._pid != os.getpid() or self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._pid = None
+        self._thread = None
+
+
+def _first_timestamp(path: Path) -> Optional[float]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.loads(f.readline())
+        return float(entry['ts'])
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+
+def top_questions(path, n: int = 50) -> List[Tuple[str, int]]:
+    """The n most frequent logged questions (with counts), from the log and its rotated backup
+
+    Entries are counted by their normalized 'key' (older entries: the question itself), and each is
+    returned in its most common wording, so replaying it hits the same cache keys as live traffic.
+    """
+    path = Path(path)
+    counts = Tally()
+    wordings: Dict[str, Tally] = {}
+    for log_file in (path.with_name(path.name + ".1"), path):
+        if not log_file.exists():
+            continue
+        with open(log_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn line from an interrupted write
+                if not isinstance(entry, dict):
+                    continue  # valid JSON, but not an entry of ours
+                question = entry.get('question')
+                if not question or not isinstance(question, str):
+                    continue
+                key = entry.get('key')
+                key = key if isinstance(key, str) and key else question
+                counts[key] += 1
+                wordings.setdefault(key, Tally())[question] += 1
+    return [(wordings[key].most_common(1)[0][0], count) for key, count in counts.most_common(n)]
+
@@ -0,0 +1,72 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Hashable, Tuple
+
+from telemetry import REGISTRY, span
+
+FANOUT = REGISTRY.histogram(
+    "unycompass_singleflight_fanout",
+    "Callers served by one in-flight execution (1 = no coalescing)",
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100)
+)
+SHARED = REGISTRY.counter(
+    "unycompass_singleflight_shared_total",
+    "Calls answered by joining an identical in-flight execution"
+)
+
+
+class _Flight:
+    def __init__(self):
+        self.future = Future()
+        self.callers = 1
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution
+
+    The first caller (leader) runs the function; callers arriving while it is still running
+    wait for and share its result or exception. Nothing is cached once the flight lands.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Tuple[object, bool]:
+        """Return (result, shared) where shared is True if another caller's execution was reused"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.callers += 1
+                leader = False
+            else:
+                flight = _Flight()
+                self._flights[key] = flight
+                leader = True
+
+        if not leader:
+            SHARED.inc(flight=self.name)
+            with span("coalesced_wait"):
+                return flight.future.result(), True
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._land(key, flight)
+            flight.future.set_exception(e)
+            raise
+        self._land(key, flight)
+        flight.future.set_result(result)
+        return result, False
+
+    def _land(self, key, flight):
+        # Remove before resolving so late arrivals start a fresh flight instead of joining a finished one
+        with self._lock:
+            self._flights.pop(key, None)
+            callers = flight.callers
+        FANOUT.observe(callers, flight=self.name)
@@ -0,0 +1,151 @@
+"""robots.txt and sitemap discovery for seeding the crawl frontier
+
+discover_site() reads robots.txt (crawl-delay, disallow rules, Sitemap: lines), falls back to
+/sitemap.xml, and walks sitemap indexes (plain or gzipped XML) into a flat list of page URLs with
+their <lastmod> dates. Fetching is injected, so the crawler can use its own requests settings.
+"""
+import gzip
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import Callable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin
+from urllib.robotparser import RobotFileParser
+
+# fetch(url) -> (HTTP status, body); status 0 for network errors
+Fetch = Callable[[str], Tuple[int, bytes]]
+
+
+class SitemapEntry(NamedTuple):
+    url: str
+    lastmod: Optional[datetime] = None
+    priority: Optional[float] = None
+
+
+class SiteDiscovery(NamedTuple):
+    robots: Optional[RobotFileParser]
+    crawl_delay: Optional[float]
+    entries: List[SitemapEntry]
+    sitemaps_fetched: int
+    requests: int
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """W3C datetime (2024-05-01, 2024-05-01T10:00:00+00:00, ...Z) as an aware UTC datetime"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def parse_crawl_delay(lines: List[str], user_agent: str = '*') -> Optional[float]:
+    """Crawl-delay for user_agent; unlike RobotFileParser.crawl_delay this accepts fractional seconds"""
+    agents, delay_for_agent, delay_for_any = [], None, None
+    in_rules = False
+    for line in lines:
+        field, _, value = line.split('#', 1)[0].partition(':')
+        field, value = field.strip().lower(), value.strip()
+        if field == 'user-agent':
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(value.lower())
+        elif field:
+            in_rules = True
+            if field == 'crawl-delay':
+                try:
+                    delay = float(value)
+                except ValueError:
+                    continue
+                if user_agent != '*' and any(a != '*' and a in user_agent.lower() for a in agents):
+                    delay_for_agent = delay
+                elif '*' in agents:
+                    delay_for_any = delay
+    return delay_for_agent if delay_for_agent is not None else delay_for_any
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _child_text(element, name: str) -> Optional[str]:
+    for child in element:
+        if _local_name(child.tag) == name:
+            return (child.text or '').strip() or None
+    return None
+
+
+def parse_sitemap(body: bytes) -> Tuple[List[SitemapEntry], List[SitemapEntry]]:
+    """Page entries of a <urlset>, or child sitemaps of a <sitemapindex>, as (pages, sitemaps)"""
+    if body[:2] == b'\x1f\x8b':
+        body = gzip.decompress(body)
+    root = ET.fromstring(body)
+    pages, sitemaps = [], []
+    kind = _local_name(root.tag)
+    for element in root:
+        name = _local_name(element.tag)
+        location = _child_text(element, 'loc')
+        if not location:
+            continue
+        lastmod = parse_lastmod(_child_text(element, 'lastmod'))
+        if kind == 'sitemapindex' and name == 'sitemap':
+            sitemaps.append(SitemapEntry(location, lastmod))
+        elif kind == 'urlset' and name == 'url':
+            priority = _child_text(element, 'priority')
+            try:
+                priority = float(priority) if priority else None
+            except ValueError:
+                priority = None
+            pages.append(SitemapEntry(location, lastmod, priority))
+    return pages, sitemaps
+
+
+def discover_site(base_url: str, fetch: Fetch, user_agent: str = '*', max_sitemaps: int = 50) -> SiteDiscovery:
+    requests_made = 0
+
+    robots = None
+    crawl_delay = None
+    sitemap_urls = []
+    status, body = fetch(urljoin(base_url, '/robots.txt'))
+    requests_made += 1
+    if status == 200:
+        lines = body.decode('utf-8', errors='replace').splitlines()
+        robots = RobotFileParser()
+        robots.parse(lines)
+        crawl_delay = parse_crawl_delay(lines, user_agent)
+        sitemap_urls = list(robots.site_maps() or [])
+    if not sitemap_urls:
+        sitemap_urls = [urljoin(base_url, '/sitemap.xml')]
+
+    entries = {}
+    queue = list(sitemap_urls)
+    seen = set()
+    sitemaps_fetched = 0
+    while queue and sitemaps_fetched < max_sitemaps:
+        sitemap_url = queue.pop(0)
+        if sitemap_url in seen:
+            continue
+        seen.add(sitemap_url)
+        status, body = fetch(sitemap_url)
+        requests_made += 1
+        if status != 200 or not body:
+            continue
+        try:
+            pages, children = parse_sitemap(body)
+        except (ET.ParseError, OSError, EOFError):
+            continue
+        sitemaps_fetched += 1
+        queue.extend(child.url for child in children)
+        for entry in pages:
+            # The same page listed twice keeps its most recent lastmod
+            known = entries.get(entry.url)
+            if known is None or (entry.lastmod and (known.lastmod is None or entry.lastmod > known.lastmod)):
+                entries[entry.url] = entry
+
+    return SiteDiscovery(robots, crawl_delay, list(entries.values()), sitemaps_fetched, requests_made)
@@ -0,0 +1,265 @@
+"""Prebuilt corpus snapshot: one versioned file holding chunk texts, metadata, embeddings and IDs
+
+Build offline (embeds the docs/ crawl outputs once):
+    python snapshot.py build --output ../docs/hunter.snapshot
+    python snapshot.py info ../docs/hunter.snapshot --check
+
+Serve with UNYCOMPASS_SNAPSHOT=../docs/hunter.snapshot: UNYCompassDatabase memory-maps the file
+read-only instead of connecting to Pinecone, so startup makes no network calls, hashes nothing and
+embeds nothing, and every worker process shares the same physical pages.
+
+Layout (little-endian):
+    8s   magic b"UNYSNAP\\0"
+    u32  format version
+    u32  reserved
+    u64  header length
+    ...  JSON header (model, dimension, count, namespace, sources, section table)
+    ...  sections, each 64-byte aligned, offsets relative to the first aligned byte after the header:
+         vectors       float32[count, dimension], L2-normalised
+         text_offsets  int64[count + 1] into `text`
+         text          UTF-8 chunk texts, concatenated
+         records       JSON [{"id": ..., "metadata": {...}}] (metadata without "text")
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+MAGIC = b"UNYSNAP\0"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sIIQ")
+
+
+class SnapshotError(ValueError):
+    """The snapshot is unreadable, or was built for another format version or embedding model"""
+
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_snapshot(path, ids: List[str], texts: List[str], metadata: List[Dict], vectors: np.ndarray,
+                   namespace: str, model_name: str, sources: Optional[Dict[str, str]] = None) -> Path:
+    """Write a snapshot atomically (temp file + rename, so serving processes never map a partial file)"""
+    path = Path(path)
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim != 2 or not (len(ids) == len(texts) == len(metadata) == vectors.shape[0]):
+        raise ValueError("ids, texts, metadata and vectors must describe the same number of chunks")
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors = np.ascontiguousarray(vectors / norms, dtype='<f4')
+
+    encoded = [text.encode('utf-8') for text in texts]
+    text_offsets = np.zeros(len(encoded) + 1, dtype='<i8')
+    np.cumsum([len(e) for e in encoded], out=text_offsets[1:])
+    records = json.dumps([{'id': vector_id, 'metadata': meta} for vector_id, meta in zip(ids, metadata)],
+                         ensure_ascii=False).encode('utf-8')
+
+    payloads = [
+        ('vectors', vectors.tobytes()),
+        ('text_offsets', text_offsets.tobytes()),
+        ('text', b''.join(encoded)),
+        ('records', records),
+    ]
+    section_table, offset = {}, 0
+    for name, payload in payloads:
+        offset = _aligned(offset)
+        section_table[name] = {'offset': offset, 'length': len(payload)}
+        offset += len(payload)
+
+    header = json.dumps({
+        'format_version': FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'model': model_name,
+        'dimension': int(vectors.shape[1]),
+        'count': len(ids),
+        'namespace': namespace,
+        'sources': sources or {},
+        'sections': section_table,
+    }).encode('utf-8')
+    data_start = _aligned(_PREAMBLE.size + len(header))
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0, len(header)))
+        f.write(header)
+        for name, payload in payloads:
+            f.seek(data_start + section_table[name]['offset'])
+            f.write(payload)
+    os.replace(tmp_path, path)
+    return path
+
+
+class _SnapshotMetadata(Sequence):
+    """Per-row metadata dicts with the chunk text decoded from the mapped file on access"""
+
+    def __init__(self, snapshot: "Snapshot"):
+        self._snapshot = snapshot
+
+    def __len__(self):
+        return self._snapshot.count
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        return self._snapshot.metadata(row)
+
+
+class Snapshot:
+    """Read-only, memory-mapped view of a snapshot file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        try:
+            with open(self.path, 'rb') as f:
+                magic, version, _, header_length = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+        except (OSError, struct.error) as e:
+            raise SnapshotError(f"Cannot read snapshot {self.path}: {e}") from e
+        if magic != MAGIC:
+            raise SnapshotError(f"{self.path} is not a UNYCompass snapshot")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"{self.path} has format version {version}, expected {FORMAT_VERSION} - rebuild it")
+
+        self._raw = np.memmap(self.path, dtype=np.uint8, mode='r')
+        self.header = json.loads(bytes(self._raw[_PREAMBLE.size:_PREAMBLE.size + header_length]))
+        self._data_start = _aligned(_PREAMBLE.size + header_length)
+
+        self.count = self.header['count']
+        self.dimension = self.header['dimension']
+        self.namespace = self.header['namespace']
+        self.model_name = self.header['model']
+        self.created_at = self.header['created_at']
+
+        self.vectors = self._section('vectors').view('<f4').reshape(self.count, self.dimension)
+        self._text_offsets = self._section('text_offsets').view('<i8')
+        self._text = self._section('text')
+        records = json.loads(bytes(self._section('records')))
+        self.ids = [record['id'] for record in records]
+        self._rows = {vector_id: row for row, vector_id in enumerate(self.ids)}
+        self._metadata = [record['metadata'] for record in records]
+
+    def _section(self, name: str) -> np.ndarray:
+        info = self.header['sections'][name]
+        start = self._data_start + info['offset']
+        return self._raw[start:start + info['length']]
+
+    def text(self, row: int) -> str:
+        return bytes(self._text[self._text_offsets[row]:self._text_offsets[row + 1]]).decode('utf-8')
+
+    def get_many(self, chunk_ids) -> Dict[str, str]:
+        """Chunk texts by ID - the same interface as docstore.ChunkStore"""
+        rows = ((chunk_id, self._rows.get(chunk_id)) for chunk_id in chunk_ids)
+        return {chunk_id: self.text(row) for chunk_id, row in rows if row is not None}
+
+    def metadata(self, row: int) -> Dict:
+        metadata = dict(self._metadata[row])
+        metadata['text'] = self.text(row)
+        return metadata
+
+    def check_compatible(self, model_name: str, dimension: int):
+        if self.model_name != model_name or self.dimension != dimension:
+            raise SnapshotError(
+                f"Snapshot {self.path} was built with {self.model_name} ({self.dimension}d), "
+                f"but the server embeds queries with {model_name} ({dimension}d) - rebuild it"
+            )
+
+    def stale_sources(self) -> List[str]:
+        """Source files whose current hash differs from the one recorded at build time"""
+        from hunter_ai import UNYCompassDatabase
+
+        stale = []
+        for file_path, recorded_hash in self.header['sources'].items():
+            if not Path(file_path).exists() or UNYCompassDatabase.get_file_hash(Path(file_path)) != recorded_hash:
+                stale.append(file_path)
+        return stale
+
+    def to_index(self, **options):
+        """LocalVectorIndex serving this snapshot's vectors in place (no copy); `options` set its ANN mode"""
+        from local_index import LocalVectorIndex
+
+        index = LocalVectorIndex(dimension=self.dimension, **options)
+        index.attach(self.namespace, self.ids, self.vectors, _SnapshotMetadata(self))
+        return index
+
+
+def build_snapshot(output, docs_dir=None, model=None, model_name: Optional[str] = None,
+                   namespace: str = "hunter-intermediate", batch_size: int = 64) -> Path:
+    """Chunk and embed the docs/ crawl outputs exactly like UNYCompassDatabase's upload path"""
+    from hunter_ai import UNYCompassDatabase
+
+    model_name = model_name or UNYCompassDatabase.MODEL_NAME
+    if model is None:
+        from sentence_transformers import SentenceTransformer
+        print(f"📦 Loading {model_name}...")
+        model = SentenceTransformer(model_name)
+    db = UNYCompassDatabase.from_components(model, index=None, namespace=namespace)
+
+    ids, chunks, texts, metadata, sources = [], [], [], [], {}
+    for file_path in UNYCompassDatabase.corpus_files(docs_dir):
+        if not file_path.exists():
+            continue
+        records = db.file_records(file_path)
+        sources[str(file_path.resolve())] = UNYCompassDatabase.get_file_hash(file_path)
+        for vector_id, chunk, chunk_metadata in records:
+            chunk_metadata = dict(chunk_metadata)
+            texts.append(chunk_metadata.pop('text'))
+            chunks.append(chunk)
+            ids.append(vector_id)
+            metadata.append(chunk_metadata)
+        print(f"✂️ {len(records)} chunks from {file_path.name}")
+    if not ids:
+        raise SnapshotError(f"No corpus files found in {docs_dir or 'docs/'}")
+
+    # Embed the full chunk (as upsert_records does), batched instead of one encode() per chunk
+    embed_start = time.time()
+    vectors = np.asarray(model.encode(chunks, batch_size=batch_size), dtype=np.float32)
+    print(f"🧮 Embedded {len(chunks)} chunks in {time.time() - embed_start:.2f}s")
+
+    return write_snapshot(output, ids, texts, metadata, vectors, namespace, model_name, sources)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect a UNYCompass corpus snapshot")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help='Chunk and embed docs/ into a snapshot file')
+    build.add_argument('--output', required=True)
+    build.add_argument('--docs', help='Directory with the crawl outputs (default: ../docs)')
+    build.add_argument('--model', help='SentenceTransformer model (default: the server\'s model)')
+    build.add_argument('--namespace', default='hunter-intermediate')
+    build.add_argument('--batch-size', type=int, default=64)
+
+    info = commands.add_parser('info', help='Show a snapshot\'s header')
+    info.add_argument('path')
+    info.add_argument('--check', action='store_true', help='Exit 1 if any source file changed since the build')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        started = time.time()
+        path = build_snapshot(args.output, docs_dir=args.docs, model_name=args.model,
+                              namespace=args.namespace, batch_size=args.batch_size)
+        print(f"✅ Snapshot written to {path} ({path.stat().st_size / 1e6:.1f} MB) in {time.time() - started:.1f}s")
+        return 0
+
+    snapshot = Snapshot(args.path)
+    header = {key: value for key, value in snapshot.header.items() if key != 'sections'}
+    print(json.dumps(header, indent=2))
+    if args.check:
+        stale = snapshot.stale_sources()
+        for file_path in stale:
+            print(f"⚠️ Changed since build: {file_path}")
+        return 1 if stale else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Latency buckets (seconds) tuned for a RAG pipeline: sub-ms cache hits up to slow LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = []
+    for name, value in pairs:
+        value = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    """Value that can go up and down (in-flight requests, queue depth, ...)"""
+
+    metric_type = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus semantics)"""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label key -> [bucket_counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [[0] * len(self.buckets), 0.0, 0]
+                self._series[key] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels) -> int:
+        series = self._series.get(_label_key(labels))
+        return series[2] if series else 0
+
+    def total(self, **labels) -> float:
+        series = self._series.get(_label_key(labels))
+        return series[1] if series else 0.0
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """Estimate a quantile from bucket counts (same interpolation as histogram_quantile)"""
+        with self._lock:
+            series = self._series.get(_label_key(labels))
+            if not series or series[2] == 0:
+                return None
+            bucket_counts, _, total = list(series[0]), series[1], series[2]
+        rank = q * total
+        cumulative = 0
+        lower = 0.0
+        for bound, bucket_count in zip(self.buckets, bucket_counts):
+            if cumulative + bucket_count >= rank and bucket_count > 0:
+                return lower + (bound - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+            lower = bound
+        return self.buckets[-1]
+
+    def samples(self):
+        out = []
+        with self._lock:
+            for key, (bucket_counts, total_sum, total_count) in self._series.items():
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    cumulative += bucket_count
+                    out.append((f"{self.name}_bucket", key, cumulative, ("le", _format_value(bound))))
+                out.append((f"{self.name}_bucket", key, total_count, ("le", "+Inf")))
+                out.append((f"{self.name}_sum", key, total_sum, None))
+                out.append((f"{self.name}_count", key, total_count, None))
+        return out
+
+
+class MetricsRegistry:
+    """Process-wide metric registry rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, help_text, **kwargs)
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def register_collector(self, collector: Callable[[], List[Tuple[str, str, str, Dict[str, str], float]]]):
+        """Register a callback producing (name, type, help, labels, value) samples at scrape time"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def register_cache(self, cache_name: str, cached_function):
+        """Export hit/miss counters and hit ratio for an lru_cache-wrapped function"""
+        def collect():
+            info = cached_function.cache_info()
+            lookups = info.hits + info.misses
+            labels = {'cache': cache_name}
+            return [
+                ("unycompass_cache_hits_total", "counter", "Cache hits", labels, info.hits),
+                ("unycompass_cache_misses_total", "counter", "Cache misses", labels, info.misses),
+                ("unycompass_cache_hit_ratio", "gauge", "Cache hit ratio since start", labels,
+                 info.hits / lookups if lookups else 0.0),
+                ("unycompass_cache_entries", "gauge", "Entries currently cached", labels, info.currsize),
+            ]
+        self.register_collector(collect)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            for sample in metric.samples():
+                name, key, value = sample[0], sample[1], sample[2]
+                extra = sample[3] if len(sample) > 3 else None
+                lines.append(f"{name}{_format_labels(key, extra)} {_format_value(value)}")
+
+        # Dynamic samples grouped by metric name so HELP/TYPE appear once
+        grouped = {}
+        for collector in collectors:
+            try:
+                for name, metric_type, help_text, labels, value in collector():
+                    grouped.setdefault(name, (metric_type, help_text, []))[2].append((labels, value))
+            except Exception as e:
+                lines.append(f"# collector error: {e}")
+        for name, (metric_type, help_text, samples) in grouped.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(_label_key(labels))} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_LATENCY = REGISTRY.histogram(
+    "unycompass_stage_duration_seconds",
+    "Time spent in each answer pipeline stage (analyze, embed, vector_query, context_build, llm, ...)"
+)
+
+
+class RequestTrace:
+    """Spans recorded for one request, keyed by a propagated request ID"""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.start = time.perf_counter()
+        self.spans = []  # (name, start_offset_s, duration_s)
+        self._lock = threading.Lock()
+
+    def add_span(self, name: str, started_at: float, duration: float):
+        with self._lock:
+            self.spans.append((name, started_at - self.start, duration))
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def stage_totals(self) -> Dict[str, float]:
+        """Total seconds per stage name, in first-seen order"""
+        totals = {}
+        with self._lock:
+            for name, _, duration in self.spans:
+                totals[name] = totals.get(name, 0.0) + duration
+        return totals
+
+    def server_timing_header(self, total: Optional[float] = None) -> str:
+        parts = [f"{name};dur={duration * 1000:.1f}" for name, duration in self.stage_totals().items()]
+        parts.append(f"total;dur={(self.elapsed() if total is None else total) * 1000:.1f}")
+        return ", ".join(parts)
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            spans = [
+                {'name': name, 'start_ms': round(offset * 1000, 2), 'duration_ms': round(duration * 1000, 2)}
+                for name, offset, duration in self.spans
+            ]
+        return {
+            'request_id': self.request_id,
+            'total_ms': round(self.elapsed() * 1000, 2),
+            'spans': spans
+        }
+
+
+_current_trace = contextvars.ContextVar("unycompass_trace", default=None)
+
+
+def start_trace(request_id: str) -> RequestTrace:
+    """Begin a trace for the current request/thread; spans opened later attach to it"""
+    trace = RequestTrace(request_id)
+    trace._token = _current_trace.set(trace)
+    return trace
+
+
+def end_trace(trace: Optional[RequestTrace]):
+    if trace is None:
+        return
+    try:
+        _current_trace.reset(trace._token)
+    except (ValueError, AttributeError):
+        # Trace ended from a different context; just detach it
+        _current_trace.set(None)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str):
+    """Time a pipeline stage: feeds the stage histogram and the active request trace"""
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - started_at
+        STAGE_LATENCY.observe(duration, stage=name)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add_span(name, started_at, duration)